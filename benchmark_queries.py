@@ -0,0 +1,276 @@
+"""
+AX5-SECT Query Benchmark
+Mesure les endpoints fournisseurs et dashboard sur un volume synthétique
+
+Usage :
+    python benchmark_queries.py --suppliers 100000
+    python benchmark_queries.py --suppliers 1000000 --repeat 3 --keep
+    python benchmark_queries.py --suppliers 100000 --only dashboard
+
+Les fournisseurs synthétiques (external_id BENCH-*) sont insérés dans la base
+configurée (.env), puis supprimés en fin de mesure sauf avec --keep. Chaque
+mesure affiche la médiane des temps de réponse et le nombre de requêtes SQL.
+
+Sections :
+    dashboard    : /dashboard/stats, agrégat unique contre l'ancien calcul
+                   en 13 COUNT + 1 SUM
+    stats        : /suppliers/stats, deux GROUP BY contre l'ancien calcul
+                   (6 COUNT + chargement de tous les fournisseurs), mémoire comprise
+    pagination   : GET /suppliers page 1 et page --page, offset contre curseur
+    recherche    : recherche de /suppliers (contains, fuzzy)
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# Ajouter le dossier parent au path pour les imports
+sys.path.insert(0, '.')
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, text
+
+from src.api import app
+from src.api_dashboard import _stats_statement
+from src.api_suppliers import get_suppliers_stats
+from src.cache import dashboard_cache
+from src.database import get_db_session, get_engine
+from src.db_models import Campaign, IMDSSubmission, PCFObject, PCFProfile, Supplier
+
+PREFIX = "BENCH-"
+
+# Syllabes des noms synthétiques : noms distincts, préfixes partagés
+SYLLABLES = ["ba", "cor", "den", "fa", "gal", "her", "lin", "mar", "nor", "pel",
+             "ros", "sel", "tan", "val", "wer", "zen", "kor", "lum", "tri", "vo"]
+
+
+def seed(count: int) -> None:
+    """Fournisseurs BENCH-* (noms, tiers, régions, profils PCF) en SQL ensembliste"""
+    with get_db_session() as db:
+        db.execute(text("""
+            INSERT INTO suppliers (external_id, name, country_code, region, supplier_type, supply_chain_level)
+            SELECT :prefix || lpad(n::TEXT, 7, '0'),
+                   initcap(s[1 + n % 20] || s[1 + (n / 20) % 20] || s[1 + (n / 400) % 20])
+                       || ' ' || initcap(s[1 + (n / 8000) % 20] || s[1 + n % 7]) || ' ' || (n % 997),
+                   (ARRAY['DE', 'FR', 'IT', 'ES', 'US', 'CN', 'JP'])[1 + n % 7],
+                   (ARRAY['Europe', 'Europe', 'Europe', 'Europe', 'North America', 'Asia', 'Asia'])[1 + n % 7],
+                   (ARRAY['component', 'assembly', 'material'])[1 + n % 3],
+                   (ARRAY['tier1', 'tier2', 'tier3'])[1 + n % 3]
+            FROM generate_series(1, :count) AS n, (SELECT CAST(:syllables AS TEXT[]) AS s) AS syllables
+            ON CONFLICT (external_id) DO NOTHING
+        """), {"prefix": PREFIX, "count": count, "syllables": SYLLABLES})
+        db.execute(text("""
+            INSERT INTO pcf_profiles (supplier_id, pcf_maturity)
+            SELECT id, (ARRAY['advanced', 'intermediate', 'beginner'])[1 + id % 3]
+            FROM suppliers WHERE external_id LIKE :pattern AND id % 2 = 0
+            ON CONFLICT (supplier_id) DO NOTHING
+        """), {"pattern": PREFIX + "%"})
+    with get_engine().connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE suppliers, pcf_profiles"))
+
+
+def cleanup() -> None:
+    with get_db_session() as db:
+        db.execute(text("DELETE FROM suppliers WHERE external_id LIKE :pattern"), {"pattern": PREFIX + "%"})
+
+
+def has_trigram_search() -> bool:
+    with get_db_session() as db:
+        return db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+
+
+def peak_memory(call: Callable[[], object]) -> float:
+    """Pic d'allocations Python d'un appel (tracemalloc), en Mo"""
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(label: str, call: Callable[[], object], repeat: int, memory: bool = False) -> None:
+    """
+    Médiane des temps et requêtes SQL par appel (cache dashboard vidé à chaque
+    appel) ; avec memory, pic mémoire d'un appel supplémentaire, hors chronométrage
+    """
+    statements: List[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", count)
+    timings = []
+    try:
+        call()  # préchauffage (pool, plans)
+        statements.clear()
+        for _ in range(repeat):
+            dashboard_cache.clear()
+            start = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    line = f"  {label:<52} {statistics.median(timings):>9.1f} ms  {len(statements) / repeat:>5.1f} requêtes"
+    if memory:
+        line += f"  {peak_memory(call):>7.1f} Mo"
+    print(line)
+
+
+def stats_without_snapshot() -> Dict[str, Any]:
+    """Repli de /dashboard/stats quand le snapshot (migration 003) est vide"""
+    with get_db_session() as db:
+        return dict(db.execute(_stats_statement()).one()._mapping)
+
+
+def stats_per_count() -> Dict[str, Any]:
+    """
+    Référence : calcul de /dashboard/stats avant l'agrégat unique, un aller-retour
+    par compteur (13 COUNT + 1 SUM), aux clés de _stats_statement
+    """
+    with get_db_session() as db:
+        return {
+            "suppliers_total": db.query(Supplier).count(),
+            "suppliers_tier1": db.query(Supplier).filter(Supplier.supply_chain_level == "tier1").count(),
+            "suppliers_tier2": db.query(Supplier).filter(Supplier.supply_chain_level == "tier2").count(),
+            "campaigns_total": db.query(Campaign).count(),
+            "campaigns_active": db.query(Campaign).filter(Campaign.status == "active").count(),
+            "imds_total": db.query(IMDSSubmission).count(),
+            "imds_validated": db.query(IMDSSubmission).filter(IMDSSubmission.status == "validated").count(),
+            "imds_pending": db.query(IMDSSubmission).filter(
+                IMDSSubmission.status.in_(["submitted", "draft", "pending"])
+            ).count(),
+            "imds_rejected": db.query(IMDSSubmission).filter(IMDSSubmission.status == "rejected").count(),
+            "pcf_total": db.query(PCFObject).count(),
+            "pcf_validated": db.query(PCFObject).filter(PCFObject.validation_status == "validated").count(),
+            "pcf_pending": db.query(PCFObject).filter(PCFObject.validation_status == "pending").count(),
+            "total_emissions": db.query(func.sum(PCFObject.total_emissions_kgco2e)).scalar() or 0,
+            "suppliers_with_pcf": db.query(PCFProfile).filter(PCFProfile.pcf_count > 0).count(),
+        }
+
+
+def supplier_stats_grouped() -> Dict[str, Any]:
+    """/suppliers/stats actuel : deux GROUP BY"""
+    with get_db_session() as db:
+        return get_suppliers_stats(db)
+
+
+def supplier_stats_hydrated() -> Dict[str, Any]:
+    """
+    Référence : /suppliers/stats avant les GROUP BY, 6 COUNT et tous les
+    fournisseurs chargés en objets ORM pour la répartition par région
+    """
+    with get_db_session() as db:
+        regions: Dict[str, int] = {}
+        for supplier in db.query(Supplier).all():
+            region = supplier.region or "Unknown"
+            regions[region] = regions.get(region, 0) + 1
+        return {
+            "total": db.query(Supplier).count(),
+            "by_level": {
+                "tier1": db.query(Supplier).filter(Supplier.supply_chain_level == "tier1").count(),
+                "tier2": db.query(Supplier).filter(Supplier.supply_chain_level == "tier2").count(),
+            },
+            "by_region": regions,
+            "pcf_maturity": {
+                level: db.query(PCFProfile).filter(PCFProfile.pcf_maturity == level).count()
+                for level in ("advanced", "intermediate", "beginner")
+            },
+        }
+
+
+def deepest_cursor(client: TestClient, pages: int, limit: int) -> Optional[str]:
+    """Curseur de la page demandée, obtenu en parcourant les pages précédentes"""
+    cursor = None
+    for _ in range(pages - 1):
+        body = client.get("/suppliers", params={"paginate": "cursor", "limit": limit,
+                                                **({"cursor": cursor} if cursor else {})}).json()
+        cursor = body["next_cursor"]
+    return cursor
+
+
+def bench_dashboard(client: TestClient, args: argparse.Namespace) -> None:
+    print("\nDashboard")
+    if stats_per_count() != stats_without_snapshot():
+        print("  ⚠️  L'ancien calcul et la requête agrégée divergent")
+    measure("GET /dashboard/stats", lambda: client.get("/dashboard/stats"), args.repeat)
+    measure("Statistiques : ancien calcul (13 COUNT + SUM)", stats_per_count, args.repeat)
+    measure("Statistiques : requête agrégée (_stats_statement)", stats_without_snapshot, args.repeat)
+
+
+def bench_supplier_stats(client: TestClient, args: argparse.Namespace) -> None:
+    print("\nStatistiques fournisseurs (mémoire : pic tracemalloc d'un appel)")
+    if supplier_stats_hydrated()["by_region"] != supplier_stats_grouped()["by_region"]:
+        print("  ⚠️  L'ancien calcul et les GROUP BY divergent")
+    measure("GET /suppliers/stats", lambda: client.get("/suppliers/stats"), args.repeat, memory=True)
+    measure("Ancien calcul (6 COUNT + fournisseurs chargés)", supplier_stats_hydrated, args.repeat, memory=True)
+    measure("Deux GROUP BY (get_suppliers_stats)", supplier_stats_grouped, args.repeat, memory=True)
+
+
+def bench_pagination(client: TestClient, args: argparse.Namespace) -> None:
+    limit = 100
+    deep_skip = (args.page - 1) * limit
+    cursor = deepest_cursor(client, args.page, limit)
+
+    print(f"\nPagination ({limit} fournisseurs par page)")
+    measure("GET /suppliers page 1 (offset)",
+            lambda: client.get("/suppliers", params={"limit": limit}), args.repeat)
+    measure("GET /suppliers page 1 (curseur)",
+            lambda: client.get("/suppliers", params={"limit": limit, "paginate": "cursor"}), args.repeat)
+    measure(f"GET /suppliers page {args.page} (offset)",
+            lambda: client.get("/suppliers", params={"limit": limit, "skip": deep_skip}), args.repeat)
+    measure(f"GET /suppliers page {args.page} (curseur)",
+            lambda: client.get("/suppliers", params={"limit": limit, "paginate": "cursor",
+                                                     "cursor": cursor}), args.repeat)
+
+
+def bench_search(client: TestClient, args: argparse.Namespace) -> None:
+    print("\nRecherche fournisseurs")
+    measure("GET /suppliers?search=corden (contains)",
+            lambda: client.get("/suppliers", params={"search": "corden", "limit": 20}), args.repeat)
+    if has_trigram_search():
+        measure("GET /suppliers?search=cordenn (fuzzy)",
+                lambda: client.get("/suppliers", params={"search": "cordenn", "search_mode": "fuzzy",
+                                                         "limit": 20}), args.repeat)
+    else:
+        print("  search_mode=fuzzy : extension pg_trgm absente (migration 009), non mesuré")
+
+
+SECTIONS = {
+    "dashboard": bench_dashboard,
+    "stats": bench_supplier_stats,
+    "pagination": bench_pagination,
+    "recherche": bench_search,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des requêtes fournisseurs et dashboard")
+    parser.add_argument("--suppliers", type=int, default=100000, help="Fournisseurs synthétiques à insérer")
+    parser.add_argument("--repeat", type=int, default=5, help="Appels mesurés par endpoint")
+    parser.add_argument("--page", type=int, default=1000, help="Page profonde mesurée (pagination)")
+    parser.add_argument("--keep", action="store_true", help="Conserver les fournisseurs synthétiques")
+    parser.add_argument("--only", choices=sorted(SECTIONS), nargs="+", help="Sections à mesurer (toutes par défaut)")
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    print(f"Insertion de {args.suppliers} fournisseurs synthétiques...")
+    start = time.perf_counter()
+    seed(args.suppliers)
+    print(f"  {time.perf_counter() - start:.1f} s")
+
+    try:
+        for name in args.only or SECTIONS:
+            SECTIONS[name](client, args)
+    finally:
+        if not args.keep:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -155,14 +155,24 @@ export async function getDashboardOverview() {
   return fetchAPI<{ stats: DashboardStats; active_campaigns: Campaign[] }>('/dashboard/overview');
 }
 
-export async function getRecentActivity(limit: number = 10) {
-  return fetchAPI<Array<{
-    type: string;
-    title: string;
-    description: string;
-    status: string;
-    timestamp: string;
-  }>>(`/dashboard/activity?limit=${limit}`);
+export interface ActivityItem {
+  id: number;
+  type: 'imds_submission' | 'pcf_submission' | 'campaign_status' | 'event';
+  title: string;
+  description: string;
+  status: string | null;
+  supplier_id: number | null;
+  campaign_id: number | null;
+  timestamp: string;
+}
+
+export async function getRecentActivity(limit: number = 10, cursor?: string) {
+  const searchParams = new URLSearchParams({ limit: String(limit) });
+  if (cursor) searchParams.append('cursor', cursor);
+
+  return fetchAPI<{ items: ActivityItem[]; next_cursor: string | null }>(
+    `/dashboard/activity?${searchParams.toString()}`
+  );
 }
 
 export async function getEmissionsTrend(months: number = 6) {
@@ -171,6 +181,26 @@ export async function getEmissionsTrend(months: number = 6) {
   );
 }
 
+// ============================================================================
+// SEARCH API
+// ============================================================================
+
+export interface TypeaheadItem {
+  type: 'supplier' | 'campaign';
+  id: number;
+  label: string;
+  detail: string | null;
+}
+
+export async function searchTypeahead(q: string, types?: Array<'supplier' | 'campaign'>, limit: number = 10) {
+  const searchParams = new URLSearchParams({ q, limit: String(limit) });
+  if (types?.length) searchParams.append('types', types.join(','));
+
+  return fetchAPI<{ query: string; items: TypeaheadItem[] }>(
+    `/search/typeahead?${searchParams.toString()}`
+  );
+}
+
 // ============================================================================
 // UTILS
 // ============================================================================
@@ -130,6 +130,106 @@ async def interactive_chat():
             print(f"\n❌ Erreur: {e}")
 
 
+def rebuild_snapshot():
+    """Reconstruit le snapshot des compteurs du dashboard"""
+    from src.database import get_db_session
+    from src.crud import DashboardSnapshotService
+    
+    with get_db_session() as db:
+        DashboardSnapshotService.rebuild(db)
+    print("✅ Snapshot du dashboard reconstruit")
+
+
+def rebuild_rollup():
+    """Reconstruit les agrégats mensuels des émissions PCF"""
+    from src.database import get_db_session
+    from src.crud import PCFObjectService
+    
+    with get_db_session() as db:
+        PCFObjectService.rebuild_monthly_rollup(db)
+    print("✅ Agrégats mensuels PCF reconstruits")
+
+
+def refresh_views():
+    """Rafraîchit la vue matérialisée v_supplier_full"""
+    from src.supplier_view import refresh_supplier_view
+    
+    refresh_supplier_view(force=True)
+    print("✅ v_supplier_full rafraîchie")
+
+
+def import_suppliers(path: str, fmt: str = None, batch_size: int = 5000):
+    """Importe un fichier CSV ou NDJSON de fournisseurs"""
+    from src.database import get_db_session
+    from src.supplier_import import import_suppliers as run_import
+    
+    fmt = fmt or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv")
+    with get_db_session() as db, open(path, encoding="utf-8-sig", newline="") as stream:
+        result = run_import(db, stream, fmt, batch_size=batch_size)
+    
+    print(
+        f"✅ {result.processed} lignes : {result.inserted} créées, {result.updated} mises à jour, "
+        f"{result.duplicates} doublons, {result.failed} en erreur"
+    )
+    for error in result.errors:
+        print(f"  ❌ ligne {error['line']} ({error['external_id'] or '-'}) : {error['error']}")
+    if result.failed > len(result.errors):
+        print(f"  … {result.failed - len(result.errors)} autres erreurs")
+
+
+def compute_priorities():
+    """Recalcule les scores de priorisation de tous les fournisseurs"""
+    from src.database import get_db_session
+    from src.prioritization import compute_priority_scores
+    
+    with get_db_session() as db:
+        result = compute_priority_scores(db, swap=True)
+    
+    timings = result.to_dict()["timings_ms"]
+    print(
+        f"✅ {result.suppliers} fournisseurs classés, {result.updated} scores modifiés "
+        f"(lecture {timings['load']} ms, calcul {timings['compute']} ms, écriture {timings['write']} ms)"
+    )
+
+
+def dedup_suppliers(min_score: float = None, workers: int = None):
+    """Détecte les doublons fournisseurs potentiels"""
+    from src.database import get_db_session
+    from src.dedup import DEFAULT_MIN_SCORE, run_dedup
+    
+    with get_db_session() as db:
+        result = run_dedup(db, min_score=min_score or DEFAULT_MIN_SCORE, workers=workers)
+    
+    timings = result.to_dict()["timings_ms"]
+    print(
+        f"✅ {result.suppliers} fournisseurs, {result.comparisons} comparaisons ({result.workers} processus) : "
+        f"{result.candidates} paires candidates ({result.inserted} nouvelles, {result.removed} retirées) "
+        f"(lecture {timings['load']} ms, comparaison {timings['compare']} ms, écriture {timings['write']} ms)"
+    )
+
+
+def reminder_worker(once: bool = False, batch_size: int = None):
+    """Planifie et envoie les relances fournisseurs"""
+    from src.config import settings
+    from src.reminders import ReminderWorker, run_reminders
+    
+    if once:
+        result = run_reminders(batch_size=batch_size)
+        print(
+            f"✅ {result.enqueued} relances planifiées, {result.sent} envoyées, "
+            f"{result.failed} en échec"
+        )
+        return
+    
+    worker = ReminderWorker(settings.reminder_poll_seconds, batch_size=batch_size)
+    print(f"🔔 Worker de relances démarré (cycle toutes les {settings.reminder_poll_seconds} s)")
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+        print("\n👋 Worker de relances arrêté")
+
+
 def main():
     """Point d'entrée principal"""
     parser = argparse.ArgumentParser(
@@ -150,6 +250,34 @@ def main():
     # Commande: chat
     subparsers.add_parser("chat", help="Lance un chat interactif")
     
+    # Commande: rebuild-snapshot
+    subparsers.add_parser("rebuild-snapshot", help="Reconstruit le snapshot du dashboard")
+    
+    # Commande: rebuild-rollup
+    subparsers.add_parser("rebuild-rollup", help="Reconstruit les agrégats mensuels PCF")
+    
+    # Commande: refresh-views
+    subparsers.add_parser("refresh-views", help="Rafraîchit la vue matérialisée v_supplier_full")
+    
+    # Commande: import-suppliers
+    import_parser = subparsers.add_parser("import-suppliers", help="Importe des fournisseurs (CSV / NDJSON)")
+    import_parser.add_argument("path", help="Fichier .csv, .ndjson ou .jsonl")
+    import_parser.add_argument("--format", choices=["csv", "ndjson"], help="Format (défaut: selon l'extension)")
+    import_parser.add_argument("--batch-size", type=int, default=5000, help="Lignes par lot (défaut: 5000)")
+    
+    # Commande: compute-priorities
+    subparsers.add_parser("compute-priorities", help="Recalcule les scores de priorisation fournisseurs")
+    
+    # Commande: dedup-suppliers
+    dedup_parser = subparsers.add_parser("dedup-suppliers", help="Détecte les doublons fournisseurs potentiels")
+    dedup_parser.add_argument("--min-score", type=float, help="Score minimal d'une paire (défaut: 0.85)")
+    dedup_parser.add_argument("--workers", type=int, help="Processus de comparaison (défaut: nombre de CPU)")
+    
+    # Commande: reminder-worker
+    reminder_parser = subparsers.add_parser("reminder-worker", help="Planifie et envoie les relances fournisseurs")
+    reminder_parser.add_argument("--once", action="store_true", help="Un seul cycle puis arrêt (cron)")
+    reminder_parser.add_argument("--batch-size", type=int, help="Relances prises par lot (défaut: REMINDER_BATCH_SIZE)")
+    
     # Commande: version
     subparsers.add_parser("version", help="Affiche la version")
     
@@ -164,6 +292,27 @@ def main():
     elif args.command == "chat":
         asyncio.run(interactive_chat())
     
+    elif args.command == "rebuild-snapshot":
+        rebuild_snapshot()
+    
+    elif args.command == "rebuild-rollup":
+        rebuild_rollup()
+    
+    elif args.command == "refresh-views":
+        refresh_views()
+    
+    elif args.command == "import-suppliers":
+        import_suppliers(args.path, fmt=args.format, batch_size=args.batch_size)
+    
+    elif args.command == "compute-priorities":
+        compute_priorities()
+    
+    elif args.command == "dedup-suppliers":
+        dedup_suppliers(min_score=args.min_score, workers=args.workers)
+    
+    elif args.command == "reminder-worker":
+        reminder_worker(once=args.once, batch_size=args.batch_size)
+    
     elif args.command == "version":
         print("AX5-SECT v1.0.0")
     
@@ -0,0 +1,166 @@
+-- =====================================================
+-- AX5-SECT : Snapshot des compteurs du dashboard
+-- =====================================================
+
+-- Compteurs maintenus par triggers : une ligne par (scope, bucket)
+-- scope  : 'suppliers' (par tier), 'campaigns' (par statut), 'imds' (par statut),
+--          'pcf' (par statut de validation), 'pcf_coverage', 'emissions'
+-- bucket : valeur de la dimension ('unknown' si NULL)
+CREATE TABLE IF NOT EXISTS dashboard_snapshot (
+  scope VARCHAR(50) NOT NULL,
+  bucket VARCHAR(50) NOT NULL,
+  value NUMERIC(20,4) NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (scope, bucket)
+);
+
+-- Incrémente (ou décrémente) un compteur
+CREATE OR REPLACE FUNCTION dashboard_snapshot_bump(p_scope TEXT, p_bucket TEXT, p_delta NUMERIC)
+RETURNS VOID AS $$
+BEGIN
+  IF p_delta = 0 THEN
+    RETURN;
+  END IF;
+  INSERT INTO dashboard_snapshot (scope, bucket, value, updated_at)
+  VALUES (p_scope, COALESCE(p_bucket, 'unknown'), p_delta, NOW())
+  ON CONFLICT (scope, bucket)
+  DO UPDATE SET value = dashboard_snapshot.value + EXCLUDED.value, updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger générique : compte les lignes par valeur d'une colonne
+-- TG_ARGV[0] = scope, TG_ARGV[1] = colonne
+CREATE OR REPLACE FUNCTION dashboard_snapshot_count()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'UPDATE' AND (to_jsonb(OLD) ->> TG_ARGV[1]) IS NOT DISTINCT FROM (to_jsonb(NEW) ->> TG_ARGV[1]) THEN
+    RETURN NULL;
+  END IF;
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM dashboard_snapshot_bump(TG_ARGV[0], to_jsonb(OLD) ->> TG_ARGV[1], -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM dashboard_snapshot_bump(TG_ARGV[0], to_jsonb(NEW) ->> TG_ARGV[1], 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger PCF : somme des émissions
+CREATE OR REPLACE FUNCTION dashboard_snapshot_emissions()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM dashboard_snapshot_bump('emissions', 'total_kgco2e', -COALESCE(OLD.total_emissions_kgco2e, 0));
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM dashboard_snapshot_bump('emissions', 'total_kgco2e', COALESCE(NEW.total_emissions_kgco2e, 0));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger profils PCF : fournisseurs couverts (pcf_count > 0)
+CREATE OR REPLACE FUNCTION dashboard_snapshot_pcf_coverage()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND COALESCE(OLD.pcf_count, 0) > 0 THEN
+    PERFORM dashboard_snapshot_bump('pcf_coverage', 'covered', -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND COALESCE(NEW.pcf_count, 0) > 0 THEN
+    PERFORM dashboard_snapshot_bump('pcf_coverage', 'covered', 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Reconstruction complète (récupération après dérive ou TRUNCATE)
+CREATE OR REPLACE FUNCTION rebuild_dashboard_snapshot()
+RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE dashboard_snapshot IN EXCLUSIVE MODE;
+  DELETE FROM dashboard_snapshot;
+
+  INSERT INTO dashboard_snapshot (scope, bucket, value)
+  SELECT 'suppliers', COALESCE(supply_chain_level, 'unknown'), COUNT(*)
+  FROM suppliers GROUP BY 1, 2;
+
+  INSERT INTO dashboard_snapshot (scope, bucket, value)
+  SELECT 'campaigns', COALESCE(status, 'unknown'), COUNT(*)
+  FROM campaigns GROUP BY 1, 2;
+
+  INSERT INTO dashboard_snapshot (scope, bucket, value)
+  SELECT 'imds', COALESCE(status, 'unknown'), COUNT(*)
+  FROM imds_submissions GROUP BY 1, 2;
+
+  INSERT INTO dashboard_snapshot (scope, bucket, value)
+  SELECT 'pcf', COALESCE(validation_status, 'unknown'), COUNT(*)
+  FROM pcf_objects GROUP BY 1, 2;
+
+  INSERT INTO dashboard_snapshot (scope, bucket, value)
+  SELECT 'pcf_coverage', 'covered', COUNT(*)
+  FROM pcf_profiles WHERE pcf_count > 0;
+
+  INSERT INTO dashboard_snapshot (scope, bucket, value)
+  SELECT 'emissions', 'total_kgco2e', COALESCE(SUM(total_emissions_kgco2e), 0)
+  FROM pcf_objects;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION dashboard_snapshot_on_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM rebuild_dashboard_snapshot();
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Triggers
+DROP TRIGGER IF EXISTS trigger_snapshot_suppliers ON suppliers;
+CREATE TRIGGER trigger_snapshot_suppliers
+AFTER INSERT OR DELETE OR UPDATE OF supply_chain_level ON suppliers
+FOR EACH ROW EXECUTE FUNCTION dashboard_snapshot_count('suppliers', 'supply_chain_level');
+
+DROP TRIGGER IF EXISTS trigger_snapshot_campaigns ON campaigns;
+CREATE TRIGGER trigger_snapshot_campaigns
+AFTER INSERT OR DELETE OR UPDATE OF status ON campaigns
+FOR EACH ROW EXECUTE FUNCTION dashboard_snapshot_count('campaigns', 'status');
+
+DROP TRIGGER IF EXISTS trigger_snapshot_imds ON imds_submissions;
+CREATE TRIGGER trigger_snapshot_imds
+AFTER INSERT OR DELETE OR UPDATE OF status ON imds_submissions
+FOR EACH ROW EXECUTE FUNCTION dashboard_snapshot_count('imds', 'status');
+
+DROP TRIGGER IF EXISTS trigger_snapshot_pcf ON pcf_objects;
+CREATE TRIGGER trigger_snapshot_pcf
+AFTER INSERT OR DELETE OR UPDATE OF validation_status ON pcf_objects
+FOR EACH ROW EXECUTE FUNCTION dashboard_snapshot_count('pcf', 'validation_status');
+
+DROP TRIGGER IF EXISTS trigger_snapshot_emissions ON pcf_objects;
+CREATE TRIGGER trigger_snapshot_emissions
+AFTER INSERT OR DELETE OR UPDATE OF total_emissions_kgco2e ON pcf_objects
+FOR EACH ROW EXECUTE FUNCTION dashboard_snapshot_emissions();
+
+DROP TRIGGER IF EXISTS trigger_snapshot_pcf_coverage ON pcf_profiles;
+CREATE TRIGGER trigger_snapshot_pcf_coverage
+AFTER INSERT OR DELETE OR UPDATE OF pcf_count ON pcf_profiles
+FOR EACH ROW EXECUTE FUNCTION dashboard_snapshot_pcf_coverage();
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['suppliers', 'campaigns', 'imds_submissions', 'pcf_objects', 'pcf_profiles']
+  LOOP
+    EXECUTE format('
+      DROP TRIGGER IF EXISTS trigger_snapshot_%I_truncate ON %I;
+      CREATE TRIGGER trigger_snapshot_%I_truncate
+      AFTER TRUNCATE ON %I
+      FOR EACH STATEMENT EXECUTE FUNCTION dashboard_snapshot_on_truncate();
+    ', t, t, t, t);
+  END LOOP;
+END;
+$$;
+
+-- Initialisation
+SELECT rebuild_dashboard_snapshot();
@@ -0,0 +1,17 @@
+-- =====================================================
+-- AX5-SECT : Index du fil d'activité (keyset sur timestamp, id)
+-- =====================================================
+
+-- Chaque branche du UNION ALL de /dashboard/activity lit ces index
+-- en ordre décroissant et s'arrête après limit + 1 lignes
+CREATE INDEX IF NOT EXISTS idx_imds_submissions_activity
+  ON imds_submissions(updated_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_pcf_objects_activity
+  ON pcf_objects(updated_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_campaign_status_activity
+  ON campaign_supplier_status(updated_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_events_activity
+  ON events(created_at DESC, id DESC);
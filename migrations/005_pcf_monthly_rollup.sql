@@ -0,0 +1,53 @@
+-- =====================================================
+-- AX5-SECT : Agrégats mensuels des émissions PCF
+-- =====================================================
+
+-- Date de collecte des objets PCF (mois de rattachement du rollup)
+ALTER TABLE pcf_objects ADD COLUMN IF NOT EXISTS created_at TIMESTAMP;
+UPDATE pcf_objects SET created_at = COALESCE(updated_at, NOW()) WHERE created_at IS NULL;
+ALTER TABLE pcf_objects ALTER COLUMN created_at SET DEFAULT NOW();
+
+-- Rollup par mois de collecte, campagne, tier et région
+-- (0 / 'unknown' / 'Unknown' remplacent NULL pour que la clé primaire reste utilisable)
+CREATE TABLE IF NOT EXISTS pcf_monthly_rollup (
+  month DATE NOT NULL,
+  campaign_id INTEGER NOT NULL DEFAULT 0,
+  supply_chain_level TEXT NOT NULL DEFAULT 'unknown',
+  region TEXT NOT NULL DEFAULT 'Unknown',
+  pcf_count INTEGER NOT NULL DEFAULT 0,
+  validated_count INTEGER NOT NULL DEFAULT 0,
+  collected_kgco2e NUMERIC(16,4) NOT NULL DEFAULT 0,
+  validated_kgco2e NUMERIC(16,4) NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (month, campaign_id, supply_chain_level, region)
+);
+
+-- Reconstruction complète depuis pcf_objects
+CREATE OR REPLACE FUNCTION rebuild_pcf_monthly_rollup()
+RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE pcf_monthly_rollup IN EXCLUSIVE MODE;
+  DELETE FROM pcf_monthly_rollup;
+
+  INSERT INTO pcf_monthly_rollup (
+    month, campaign_id, supply_chain_level, region,
+    pcf_count, validated_count, collected_kgco2e, validated_kgco2e
+  )
+  SELECT
+    date_trunc('month', p.created_at)::DATE,
+    COALESCE(p.campaign_id, 0),
+    COALESCE(s.supply_chain_level, 'unknown'),
+    COALESCE(s.region, 'Unknown'),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE p.validation_status = 'validated'),
+    COALESCE(SUM(p.total_emissions_kgco2e), 0),
+    COALESCE(SUM(p.total_emissions_kgco2e) FILTER (WHERE p.validation_status = 'validated'), 0)
+  FROM pcf_objects p
+  JOIN suppliers s ON s.id = p.supplier_id
+  WHERE p.created_at IS NOT NULL
+  GROUP BY 1, 2, 3, 4;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Initialisation
+SELECT rebuild_pcf_monthly_rollup();
@@ -0,0 +1,69 @@
+-- =====================================================
+-- AX5-SECT : Notifications temps réel du dashboard (LISTEN/NOTIFY)
+-- =====================================================
+
+-- Publie un delta sur le canal 'dashboard_changes' ; écouté par un seul
+-- listener par worker API qui le diffuse aux clients SSE (/dashboard/stream)
+CREATE OR REPLACE FUNCTION notify_dashboard_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  new_row JSONB;
+  old_row JSONB;
+  status_column TEXT := TG_ARGV[0];
+BEGIN
+  IF TG_OP <> 'DELETE' THEN
+    new_row := to_jsonb(NEW);
+  END IF;
+  IF TG_OP <> 'INSERT' THEN
+    old_row := to_jsonb(OLD);
+  END IF;
+
+  PERFORM pg_notify('dashboard_changes', json_build_object(
+    'table', TG_TABLE_NAME,
+    'op', lower(TG_OP),
+    'id', COALESCE(new_row, old_row) ->> 'id',
+    'supplier_id', COALESCE(new_row, old_row) ->> 'supplier_id',
+    'campaign_id', COALESCE(new_row, old_row) ->> 'campaign_id',
+    'status', new_row ->> status_column,
+    'old_status', old_row ->> status_column
+  )::TEXT);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Mises à jour notifiées uniquement si le statut change
+DROP TRIGGER IF EXISTS trigger_notify_campaign_status ON campaign_supplier_status;
+CREATE TRIGGER trigger_notify_campaign_status
+AFTER INSERT OR DELETE ON campaign_supplier_status
+FOR EACH ROW EXECUTE FUNCTION notify_dashboard_change('status');
+
+DROP TRIGGER IF EXISTS trigger_notify_campaign_status_update ON campaign_supplier_status;
+CREATE TRIGGER trigger_notify_campaign_status_update
+AFTER UPDATE ON campaign_supplier_status
+FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+EXECUTE FUNCTION notify_dashboard_change('status');
+
+DROP TRIGGER IF EXISTS trigger_notify_imds ON imds_submissions;
+CREATE TRIGGER trigger_notify_imds
+AFTER INSERT OR DELETE ON imds_submissions
+FOR EACH ROW EXECUTE FUNCTION notify_dashboard_change('status');
+
+DROP TRIGGER IF EXISTS trigger_notify_imds_update ON imds_submissions;
+CREATE TRIGGER trigger_notify_imds_update
+AFTER UPDATE ON imds_submissions
+FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+EXECUTE FUNCTION notify_dashboard_change('status');
+
+DROP TRIGGER IF EXISTS trigger_notify_pcf ON pcf_objects;
+CREATE TRIGGER trigger_notify_pcf
+AFTER INSERT OR DELETE ON pcf_objects
+FOR EACH ROW EXECUTE FUNCTION notify_dashboard_change('validation_status');
+
+DROP TRIGGER IF EXISTS trigger_notify_pcf_update ON pcf_objects;
+CREATE TRIGGER trigger_notify_pcf_update
+AFTER UPDATE ON pcf_objects
+FOR EACH ROW WHEN (
+  OLD.validation_status IS DISTINCT FROM NEW.validation_status
+  OR OLD.total_emissions_kgco2e IS DISTINCT FROM NEW.total_emissions_kgco2e
+)
+EXECUTE FUNCTION notify_dashboard_change('validation_status');
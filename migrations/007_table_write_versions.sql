@@ -0,0 +1,48 @@
+-- =====================================================
+-- AX5-SECT : Versions d'écriture par table (ETag)
+-- =====================================================
+
+-- Un compteur par table, incrémenté une fois par instruction d'écriture.
+-- Les endpoints en lecture dérivent leur ETag de ces versions : une seule
+-- lecture par clé primaire suffit pour répondre 304 sans exécuter la requête
+-- principale. Le compteur est transactionnel : une version n'est visible
+-- qu'une fois les données correspondantes commitées.
+CREATE TABLE IF NOT EXISTS table_write_versions (
+  table_name VARCHAR(100) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION bump_table_write_version()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO table_write_versions (table_name, version, updated_at)
+  VALUES (TG_TABLE_NAME, 1, NOW())
+  ON CONFLICT (table_name)
+  DO UPDATE SET version = table_write_versions.version + 1, updated_at = NOW();
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Triggers par instruction (un import massif ne produit qu'un incrément)
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY[
+    'suppliers', 'supplier_contacts', 'imds_profiles', 'pcf_profiles', 'supplier_hub_metadata',
+    'campaigns', 'campaign_supplier_status', 'imds_submissions', 'pcf_objects', 'events'
+  ]
+  LOOP
+    EXECUTE format('
+      DROP TRIGGER IF EXISTS trigger_write_version_%I ON %I;
+      CREATE TRIGGER trigger_write_version_%I
+      AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_table_write_version();
+    ', t, t, t, t);
+
+    INSERT INTO table_write_versions (table_name) VALUES (t)
+    ON CONFLICT (table_name) DO NOTHING;
+  END LOOP;
+END;
+$$;
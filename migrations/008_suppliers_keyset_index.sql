@@ -0,0 +1,9 @@
+-- =====================================================
+-- AX5-SECT : Index de pagination par clé des fournisseurs
+-- =====================================================
+
+-- GET /suppliers?paginate=cursor ordonne sur (name, id) et reprend après
+-- (name, id) > (:name, :id) : chaque page est un parcours d'index borné,
+-- quelle que soit la profondeur
+CREATE INDEX IF NOT EXISTS idx_suppliers_name_id
+  ON suppliers(name, id);
@@ -0,0 +1,13 @@
+-- =====================================================
+-- AX5-SECT : Recherche fournisseurs par trigrammes (pg_trgm)
+-- =====================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Servent à la fois ILIKE '%terme%' (search_mode=contains) et les
+-- opérateurs de similarité %> (search_mode=fuzzy) de GET /suppliers
+CREATE INDEX IF NOT EXISTS idx_suppliers_name_trgm
+  ON suppliers USING GIN (name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_suppliers_external_id_trgm
+  ON suppliers USING GIN (external_id gin_trgm_ops);
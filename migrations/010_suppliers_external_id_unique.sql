@@ -0,0 +1,9 @@
+-- =====================================================
+-- AX5-SECT : Unicité de suppliers.external_id (import massif)
+-- =====================================================
+
+-- Cible de ON CONFLICT (external_id) pour l'import CSV / NDJSON.
+-- Le modèle ORM déclare déjà la colonne unique ; les NULL restent autorisés.
+-- Dédoublonner les external_id existants avant d'appliquer cette migration.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_suppliers_external_id
+  ON suppliers(external_id);
@@ -0,0 +1,88 @@
+-- =====================================================
+-- AX5-SECT : v_supplier_full matérialisée (rafraîchissement CONCURRENTLY)
+-- =====================================================
+
+-- Remplace la vue du schéma initial (jointure de 4 tables à chaque lecture)
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'v_supplier_full' AND relkind = 'v') THEN
+    DROP VIEW v_supplier_full;
+  END IF;
+END;
+$$;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS v_supplier_full AS
+SELECT
+    s.*,
+    ip.imds_id,
+    ip.on_time_submission_rate,
+    ip.oem_rejection_rate,
+    ip.support_level as imds_support_level,
+    pp.pcf_maturity,
+    pp.pcf_count,
+    pp.data_quality_score as pcf_quality_score,
+    hm.priority,
+    hm.regulatory_risk,
+    hm.climate_risk,
+    hm.program_status
+FROM suppliers s
+LEFT JOIN imds_profiles ip ON s.id = ip.supplier_id
+LEFT JOIN pcf_profiles pp ON s.id = pp.supplier_id
+LEFT JOIN supplier_hub_metadata hm ON s.id = hm.supplier_id;
+
+-- Requis par REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS uq_v_supplier_full_id ON v_supplier_full(id);
+
+-- Filtres de GET /suppliers et /suppliers/export
+CREATE INDEX IF NOT EXISTS idx_v_supplier_full_priority ON v_supplier_full(priority);
+CREATE INDEX IF NOT EXISTS idx_v_supplier_full_pcf_maturity ON v_supplier_full(pcf_maturity);
+
+-- Dernier rafraîchissement : somme des versions d'écriture des tables sources
+-- (migration 007) au moment du rafraîchissement
+CREATE TABLE IF NOT EXISTS materialized_view_state (
+  view_name VARCHAR(100) PRIMARY KEY,
+  source_version BIGINT NOT NULL DEFAULT 0,
+  refreshed_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Rafraîchit si les tables sources ont changé (ou si p_force).
+-- Un seul rafraîchissement à la fois, tous workers confondus (verrou consultatif).
+-- Incrémente la version d'écriture de v_supplier_full pour les ETag.
+CREATE OR REPLACE FUNCTION refresh_v_supplier_full(p_force BOOLEAN DEFAULT FALSE)
+RETURNS BOOLEAN AS $$
+DECLARE
+  v_current BIGINT;
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('v_supplier_full')) THEN
+    RETURN FALSE;
+  END IF;
+
+  SELECT COALESCE(SUM(version), 0) INTO v_current
+  FROM table_write_versions
+  WHERE table_name IN ('suppliers', 'imds_profiles', 'pcf_profiles', 'supplier_hub_metadata');
+
+  IF NOT p_force AND EXISTS (
+    SELECT 1 FROM materialized_view_state
+    WHERE view_name = 'v_supplier_full' AND source_version = v_current
+  ) THEN
+    RETURN FALSE;
+  END IF;
+
+  REFRESH MATERIALIZED VIEW CONCURRENTLY v_supplier_full;
+
+  INSERT INTO materialized_view_state (view_name, source_version, refreshed_at)
+  VALUES ('v_supplier_full', v_current, NOW())
+  ON CONFLICT (view_name)
+  DO UPDATE SET source_version = EXCLUDED.source_version, refreshed_at = NOW();
+
+  INSERT INTO table_write_versions (table_name, version, updated_at)
+  VALUES ('v_supplier_full', 1, NOW())
+  ON CONFLICT (table_name)
+  DO UPDATE SET version = table_write_versions.version + 1, updated_at = NOW();
+
+  RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Initialisation
+SELECT refresh_v_supplier_full(TRUE);
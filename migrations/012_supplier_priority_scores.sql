@@ -0,0 +1,29 @@
+-- =====================================================
+-- AX5-SECT : Scores de priorisation calculés (moteur prioritization)
+-- =====================================================
+
+-- Un score par fournisseur, recalculé en masse par src/prioritization.py.
+-- La priorité manuelle (supplier_hub_metadata.priority) n'est pas modifiée :
+-- suggested_priority est la classe A / B / C déduite du score.
+-- Table dérivée sans clé étrangère (réécriture massive sans contrôle par
+-- ligne) : les lectures joignent suppliers et chaque calcul retire les
+-- scores des fournisseurs supprimés.
+CREATE TABLE IF NOT EXISTS supplier_priority_scores (
+  supplier_id INTEGER PRIMARY KEY,
+  score NUMERIC(5,2) NOT NULL,            -- 0 à 100 (100 = à traiter en premier)
+  suggested_priority CHAR(1) CHECK (suggested_priority IN ('A', 'B', 'C')),
+  updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- GET /suppliers/ranking : parcours par (score, supplier_id) décroissants
+CREATE INDEX IF NOT EXISTS idx_supplier_priority_scores_rank
+  ON supplier_priority_scores(score DESC, supplier_id DESC);
+
+-- Version d'écriture (migration 007) pour les ETag
+DROP TRIGGER IF EXISTS trigger_write_version_supplier_priority_scores ON supplier_priority_scores;
+CREATE TRIGGER trigger_write_version_supplier_priority_scores
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON supplier_priority_scores
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_write_version();
+
+INSERT INTO table_write_versions (table_name) VALUES ('supplier_priority_scores')
+ON CONFLICT (table_name) DO NOTHING;
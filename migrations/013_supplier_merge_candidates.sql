@@ -0,0 +1,38 @@
+-- =====================================================
+-- AX5-SECT : Doublons fournisseurs potentiels (job dedup)
+-- =====================================================
+
+-- Paires de fournisseurs à examiner, produites par src/dedup.py
+-- (supplier_id_a < supplier_id_b). Une paire revue (merged / rejected)
+-- n'est plus modifiée par les exécutions suivantes ; une paire en attente
+-- qui n'est plus détectée est retirée.
+CREATE TABLE IF NOT EXISTS supplier_merge_candidates (
+  id SERIAL PRIMARY KEY,
+  supplier_id_a INTEGER NOT NULL REFERENCES suppliers(id) ON DELETE CASCADE,
+  supplier_id_b INTEGER NOT NULL REFERENCES suppliers(id) ON DELETE CASCADE,
+  score NUMERIC(4,3) NOT NULL,              -- 0 à 1
+  name_similarity NUMERIC(4,3) NOT NULL,    -- 0 à 1
+  blocking_key TEXT,                        -- bloc où la paire a été comparée
+  status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'merged', 'rejected')),
+  reviewed_by TEXT,
+  reviewed_at TIMESTAMP,
+  created_at TIMESTAMP DEFAULT NOW(),
+  updated_at TIMESTAMP DEFAULT NOW(),
+  CHECK (supplier_id_a < supplier_id_b),
+  UNIQUE (supplier_id_a, supplier_id_b)
+);
+
+-- File de revue : paires en attente par score décroissant
+CREATE INDEX IF NOT EXISTS idx_merge_candidates_review
+  ON supplier_merge_candidates(status, score DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_merge_candidates_supplier_b
+  ON supplier_merge_candidates(supplier_id_b);
+
+-- Version d'écriture (migration 007) pour les ETag
+DROP TRIGGER IF EXISTS trigger_write_version_supplier_merge_candidates ON supplier_merge_candidates;
+CREATE TRIGGER trigger_write_version_supplier_merge_candidates
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON supplier_merge_candidates
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_write_version();
+
+INSERT INTO table_write_versions (table_name) VALUES ('supplier_merge_candidates')
+ON CONFLICT (table_name) DO NOTHING;
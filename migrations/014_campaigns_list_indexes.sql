@@ -0,0 +1,13 @@
+-- =====================================================
+-- AX5-SECT : Index de la liste paginée des campagnes
+-- =====================================================
+
+-- GET /campaigns (tri par défaut) : (created_at, id) décroissants, NULL en
+-- dernier, reprise après le curseur par un parcours d'index borné
+CREATE INDEX IF NOT EXISTS idx_campaigns_created_id
+  ON campaigns(created_at DESC NULLS LAST, id DESC);
+
+-- Compteurs par campagne (jointure externe groupée sur la page) : lus
+-- depuis l'index seul, sans visiter les lignes de statut
+CREATE INDEX IF NOT EXISTS idx_campaign_status_campaign_status
+  ON campaign_supplier_status(campaign_id, status);
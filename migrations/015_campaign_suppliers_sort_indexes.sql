@@ -0,0 +1,12 @@
+-- =====================================================
+-- AX5-SECT : Index de tri des fournisseurs d'une campagne
+-- =====================================================
+
+-- GET /campaigns/{id}/suppliers?sort=last_contact_at|reminders_sent :
+-- parcours ordonné dans la campagne et reprise après (valeur, supplier_id).
+-- Le tri par défaut (supplier_id) utilise UNIQUE (campaign_id, supplier_id).
+CREATE INDEX IF NOT EXISTS idx_campaign_status_last_contact
+  ON campaign_supplier_status(campaign_id, last_contact_at, supplier_id);
+
+CREATE INDEX IF NOT EXISTS idx_campaign_status_reminders
+  ON campaign_supplier_status(campaign_id, reminders_sent, supplier_id);
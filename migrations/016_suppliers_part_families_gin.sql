@@ -0,0 +1,9 @@
+-- =====================================================
+-- AX5-SECT : Index GIN sur suppliers.main_part_families
+-- =====================================================
+
+-- Ciblage de campagne (POST /campaigns/{id}/targeting) : le filtre
+-- main_part_families && ARRAY[...] (chevauchement) est servi par l'index
+-- au lieu d'un parcours complet de suppliers
+CREATE INDEX IF NOT EXISTS idx_suppliers_part_families
+  ON suppliers USING GIN (main_part_families);
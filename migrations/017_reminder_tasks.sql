@@ -0,0 +1,22 @@
+-- =====================================================
+-- AX5-SECT : Relances fournisseurs via la table tasks (src/reminders.py)
+-- =====================================================
+
+-- Une seule relance ouverte (pending / in_progress) par fournisseur et
+-- campagne : cible de ON CONFLICT DO NOTHING pour la planification, sûre
+-- même si plusieurs planificateurs tournent en parallèle
+CREATE UNIQUE INDEX IF NOT EXISTS uq_tasks_open_reminder
+  ON tasks (((payload->>'campaign_id')::INTEGER), ((payload->>'supplier_id')::INTEGER))
+  WHERE type = 'reminder' AND status IN ('pending', 'in_progress');
+
+-- Relances récemment en échec (pas de nouvelle tentative avant l'intervalle)
+CREATE INDEX IF NOT EXISTS idx_tasks_reminder_target
+  ON tasks (((payload->>'campaign_id')::INTEGER), ((payload->>'supplier_id')::INTEGER), updated_at)
+  WHERE type = 'reminder';
+
+-- Prise de tâches par les workers (FOR UPDATE SKIP LOCKED) : tâches dues
+-- par date de planification, et tâches en cours dont le bail a expiré
+CREATE INDEX IF NOT EXISTS idx_tasks_pending_due
+  ON tasks(type, scheduled_at, id) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_tasks_in_progress
+  ON tasks(type, updated_at) WHERE status = 'in_progress';
@@ -0,0 +1,13 @@
+-- =====================================================
+-- AX5-SECT : Version d'écriture de pcf_monthly_rollup
+-- =====================================================
+
+-- GET /dashboard/emissions/trend lit le rollup : sa reconstruction
+-- (python main.py rebuild-rollup) doit changer l'ETag et la clé de cache
+DROP TRIGGER IF EXISTS trigger_write_version_pcf_monthly_rollup ON pcf_monthly_rollup;
+CREATE TRIGGER trigger_write_version_pcf_monthly_rollup
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON pcf_monthly_rollup
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_write_version();
+
+INSERT INTO table_write_versions (table_name) VALUES ('pcf_monthly_rollup')
+ON CONFLICT (table_name) DO NOTHING;
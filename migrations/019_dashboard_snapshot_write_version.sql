@@ -0,0 +1,13 @@
+-- =====================================================
+-- AX5-SECT : Version d'écriture de dashboard_snapshot
+-- =====================================================
+
+-- GET /dashboard/stats lit le snapshot : sa reconstruction
+-- (python main.py rebuild-snapshot) doit changer l'ETag et la clé de cache
+DROP TRIGGER IF EXISTS trigger_write_version_dashboard_snapshot ON dashboard_snapshot;
+CREATE TRIGGER trigger_write_version_dashboard_snapshot
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON dashboard_snapshot
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_write_version();
+
+INSERT INTO table_write_versions (table_name) VALUES ('dashboard_snapshot')
+ON CONFLICT (table_name) DO NOTHING;
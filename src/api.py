@@ -20,6 +20,10 @@ from .state import BusinessContext
 from .api_suppliers import router as suppliers_router
 from .api_campaigns import router as campaigns_router
 from .api_dashboard import router as dashboard_router
+from .api_search import router as search_router
+from .dashboard_stream import broadcaster as dashboard_broadcaster
+from .supplier_view import supplier_view_refresher
+from .typeahead import typeahead_index
 
 
 # ============================================================================
@@ -37,8 +41,14 @@ async def lifespan(app: FastAPI):
     print("🚀 Démarrage d'AX5-SECT Control Tower...")
     ax5sect_app = create_ax5sect_app(checkpointer=memory_saver)
     print("✅ Graphe LangGraph initialisé")
+    dashboard_broadcaster.start()
+    typeahead_index.start()
+    supplier_view_refresher.start()
     yield
     print("👋 Arrêt d'AX5-SECT Control Tower...")
+    dashboard_broadcaster.stop()
+    typeahead_index.stop()
+    supplier_view_refresher.stop()
 
 
 # ============================================================================
@@ -85,6 +95,7 @@ app.add_middleware(
 app.include_router(suppliers_router)
 app.include_router(campaigns_router)
 app.include_router(dashboard_router)
+app.include_router(search_router)
 
 
 # ============================================================================
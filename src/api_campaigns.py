@@ -1,17 +1,40 @@
 """
 AX5-SECT API - Campaigns Endpoints
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import Float, and_, cast, func, or_
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 from .database import get_db
 from .db_models import Campaign, CampaignSupplierStatus, Supplier
+from .cache import etag_guard, table_versions
+from .crud import CampaignService
+from .pagination import decode_cursor, encode_cursor, parse_cursor_datetime
 
 router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
 
+CAMPAIGN_TABLES = ("campaigns", "campaign_supplier_status")
+ENROLL_MAX_IDS = 50000
+RESPONDED_STATUSES = ("submitted", "validated")
+
+# Tris disponibles pour GET /campaigns (toujours départagés par id)
+CAMPAIGN_SORT_COLUMNS = {
+    "created_at": Campaign.created_at,
+    "name": Campaign.name,
+    "start_date": Campaign.start_date,
+    "end_date": Campaign.end_date,
+}
+
+# Tris disponibles pour GET /campaigns/{id}/suppliers (départagés par supplier_id)
+CAMPAIGN_SUPPLIER_SORT_COLUMNS = {
+    "supplier_id": CampaignSupplierStatus.supplier_id,
+    "last_contact_at": CampaignSupplierStatus.last_contact_at,
+    "reminders_sent": CampaignSupplierStatus.reminders_sent,
+}
+
 
 class CampaignSchema(BaseModel):
     id: int
@@ -33,6 +56,67 @@ class CampaignWithStatsSchema(CampaignSchema):
     progress: float = 0
 
 
+class CampaignPageSchema(BaseModel):
+    items: List[CampaignWithStatsSchema]
+    next_cursor: Optional[str] = None
+
+
+class CampaignSupplierSchema(BaseModel):
+    supplier_id: int
+    supplier_name: str
+    country_code: Optional[str]
+    region: Optional[str]
+    tier: Optional[str]
+    status: Optional[str]
+    last_contact_at: Optional[datetime]
+    reminders_sent: Optional[int]
+    progression_score: Optional[float]
+
+
+class CampaignSupplierPageSchema(BaseModel):
+    items: List[CampaignSupplierSchema]
+    next_cursor: Optional[str] = None
+
+
+class CampaignSupplierColumnsSchema(BaseModel):
+    columns: Dict[str, List[Any]]
+    next_cursor: Optional[str] = None
+
+
+class CampaignEnrollSchema(BaseModel):
+    supplier_ids: List[int]
+
+
+class CampaignEnrollResultSchema(BaseModel):
+    added: int
+    skipped: int
+    missing: int
+    missing_ids: List[int]
+
+
+class CampaignTargetingSchema(BaseModel):
+    tiers: Optional[List[str]] = None
+    regions: Optional[List[str]] = None
+    country_codes: Optional[List[str]] = None
+    supplier_types: Optional[List[str]] = None
+    part_families: Optional[List[str]] = None
+    match_campaign_part_families: bool = False
+    pcf_maturity: Optional[List[str]] = None
+    priority: Optional[List[str]] = None
+    regulatory_risk_min: Optional[float] = Field(None, ge=0, le=100)
+    regulatory_risk_max: Optional[float] = Field(None, ge=0, le=100)
+    climate_risk_min: Optional[float] = Field(None, ge=0, le=100)
+    climate_risk_max: Optional[float] = Field(None, ge=0, le=100)
+    dry_run: bool = False
+
+
+class CampaignTargetingResultSchema(BaseModel):
+    matched: int
+    added: int
+    skipped: int
+    dry_run: bool
+
+
 class CampaignCreateSchema(BaseModel):
     name: str
     type: str
@@ -41,51 +125,126 @@ class CampaignCreateSchema(BaseModel):
     end_date: Optional[datetime] = None
 
 
-@router.get("", response_model=List[CampaignWithStatsSchema])
+def _campaigns_page(db: Session):
+    """Colonnes des campagnes reprises dans la page (avant agrégation)"""
+    return db.query(
+        Campaign.id,
+        Campaign.name,
+        Campaign.type,
+        Campaign.status,
+        Campaign.objective,
+        Campaign.start_date,
+        Campaign.end_date,
+        Campaign.created_at
+    )
+
+
+def _with_stats(db: Session, page):
+    """
+    Campagnes de la sous-requête page et compteurs de statuts en une
+    jointure externe groupée : seuls les statuts de la page sont lus.
+    """
+    return db.query(
+        *page.c,
+        func.count(CampaignSupplierStatus.campaign_id).label("suppliers_total"),
+        func.count(CampaignSupplierStatus.campaign_id).filter(
+            CampaignSupplierStatus.status.in_(RESPONDED_STATUSES)
+        ).label("suppliers_responded"),
+        func.count(CampaignSupplierStatus.campaign_id).filter(
+            CampaignSupplierStatus.status == "validated"
+        ).label("suppliers_validated")
+    ).outerjoin(
+        CampaignSupplierStatus, CampaignSupplierStatus.campaign_id == page.c.id
+    ).group_by(*page.c)
+
+
+def _campaign_stats(row) -> dict:
+    item = row._asdict()
+    total = item["suppliers_total"]
+    item["progress"] = round((item["suppliers_responded"] / total * 100), 1) if total > 0 else 0
+    return item
+
+
+def _after_cursor(column, id_column, value, last_id, descending: bool):
+    """Lignes après (value, last_id) dans l'ordre column puis id, NULL en dernier"""
+    id_beyond = id_column < last_id if descending else id_column > last_id
+    if value is None:
+        return and_(column.is_(None), id_beyond)
+    beyond = column < value if descending else column > value
+    return or_(beyond, and_(column == value, id_beyond), column.is_(None))
+
+
+def _ordering(column, id_column, descending: bool):
+    if descending:
+        return column.desc().nulls_last(), id_column.desc()
+    return column.asc().nulls_last(), id_column.asc()
+
+
+@router.get(
+    "",
+    response_model=Union[List[CampaignWithStatsSchema], CampaignPageSchema],
+    dependencies=[Depends(etag_guard(*CAMPAIGN_TABLES))]
+)
 def list_campaigns(
     type: Optional[str] = None,
     status: Optional[str] = None,
+    sort: str = Query("created_at", pattern="^(created_at|name|start_date|end_date)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    paginate: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Liste toutes les campagnes avec statistiques"""
-    query = db.query(Campaign)
+    """
+    Liste les campagnes avec statistiques, en une requête : la page de
+    campagnes est sélectionnée puis jointe aux statuts et groupée.
+
+    sort / order : tri sur created_at (défaut), name, start_date ou end_date,
+    départagé par id ; les valeurs NULL sont placées en dernier.
+
+    paginate=cursor : pagination par clé sur (sort, id) ; la réponse devient
+    {items, next_cursor} et next_cursor est à repasser dans cursor pour la
+    page suivante (skip est ignoré).
+    """
+    query = _campaigns_page(db)
 
     if type:
         query = query.filter(Campaign.type == type)
     if status:
         query = query.filter(Campaign.status == status)
 
-    campaigns = query.order_by(Campaign.created_at.desc()).all()
-
-    result = []
-    for campaign in campaigns:
-        statuses = db.query(CampaignSupplierStatus).filter(
-            CampaignSupplierStatus.campaign_id == campaign.id
-        ).all()
-
-        total = len(statuses)
-        responded = sum(1 for s in statuses if s.status in ["submitted", "validated"])
-        validated = sum(1 for s in statuses if s.status == "validated")
-        progress = round((responded / total * 100), 1) if total > 0 else 0
-
-        result.append(CampaignWithStatsSchema(
-            id=campaign.id,
-            name=campaign.name,
-            type=campaign.type,
-            status=campaign.status,
-            objective=campaign.objective,
-            start_date=campaign.start_date,
-            end_date=campaign.end_date,
-            suppliers_total=total,
-            suppliers_responded=responded,
-            suppliers_validated=validated,
-            progress=progress
-        ))
+    sort_column = CAMPAIGN_SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    if paginate == "cursor" and cursor:
+        cursor_value, cursor_id = decode_cursor(cursor, 2)
+        if not isinstance(cursor_id, int) or not (cursor_value is None or isinstance(cursor_value, str)):
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+        if sort != "name":
+            cursor_value = parse_cursor_datetime(cursor_value)
+        query = query.filter(_after_cursor(sort_column, Campaign.id, cursor_value, cursor_id, descending))
+
+    query = query.order_by(*_ordering(sort_column, Campaign.id, descending))
+    if paginate == "offset":
+        page = query.offset(skip).limit(limit).subquery("page")
+    else:
+        page = query.limit(limit + 1).subquery("page")
+
+    rows = _with_stats(db, page).order_by(*_ordering(page.c[sort], page.c.id, descending)).all()
+    items = [_campaign_stats(row) for row in rows]
 
-    return result
+    if paginate == "offset":
+        return items
 
+    next_cursor = None
+    if len(items) > limit:
+        last = items[limit - 1]
+        next_cursor = encode_cursor(last[sort], last["id"])
+    return {"items": items[:limit], "next_cursor": next_cursor}
 
-@router.get("/stats")
+
+@router.get("/stats", dependencies=[Depends(etag_guard(*CAMPAIGN_TABLES))])
 def get_campaigns_stats(db: Session = Depends(get_db)):
     """Statistiques globales sur les campagnes"""
     total = db.query(Campaign).count()
@@ -106,59 +265,160 @@ def get_campaigns_stats(db: Session = Depends(get_db)):
     }
 
 
-@router.get("/{campaign_id}", response_model=CampaignWithStatsSchema)
+@router.get(
+    "/{campaign_id}",
+    response_model=CampaignWithStatsSchema,
+    dependencies=[Depends(etag_guard(*CAMPAIGN_TABLES))]
+)
 def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
     """Récupère une campagne avec ses statistiques"""
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if not campaign:
+    page = _campaigns_page(db).filter(Campaign.id == campaign_id).subquery("page")
+    row = _with_stats(db, page).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Campaign not found")
+    return _campaign_stats(row)
 
-    statuses = db.query(CampaignSupplierStatus).filter(
-        CampaignSupplierStatus.campaign_id == campaign_id
-    ).all()
-
-    total = len(statuses)
-    responded = sum(1 for s in statuses if s.status in ["submitted", "validated"])
-    validated = sum(1 for s in statuses if s.status == "validated")
-
-    return CampaignWithStatsSchema(
-        id=campaign.id,
-        name=campaign.name,
-        type=campaign.type,
-        status=campaign.status,
-        objective=campaign.objective,
-        start_date=campaign.start_date,
-        end_date=campaign.end_date,
-        suppliers_total=total,
-        suppliers_responded=responded,
-        suppliers_validated=validated,
-        progress=round((responded / total * 100), 1) if total > 0 else 0
-    )
 
+@router.get(
+    "/{campaign_id}/suppliers",
+    response_model=Union[List[CampaignSupplierSchema], CampaignSupplierPageSchema, CampaignSupplierColumnsSchema],
+    dependencies=[Depends(etag_guard(*CAMPAIGN_TABLES, "suppliers"))]
+)
+def get_campaign_suppliers(
+    campaign_id: int,
+    status: Optional[str] = None,
+    tier: Optional[str] = None,
+    region: Optional[str] = None,
+    sort: str = Query("supplier_id", pattern="^(supplier_id|last_contact_at|reminders_sent)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    paginate: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    format: str = Query("rows", pattern="^(rows|columns)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Liste les fournisseurs d'une campagne (statuts joints aux fournisseurs
+    en une requête).
+
+    status, tier (supply_chain_level), region : filtres optionnels.
+    sort / order : tri sur supplier_id (défaut), last_contact_at ou
+    reminders_sent, départagé par supplier_id ; NULL en dernier.
+
+    paginate=cursor : pagination par clé sur (sort, supplier_id) ; la réponse
+    devient {items, next_cursor} (skip est ignoré).
+
+    format=columns : réponse compacte {columns, next_cursor}, une liste de
+    valeurs par colonne (grilles volumineuses).
+    """
+    query = db.query(
+        CampaignSupplierStatus.supplier_id,
+        func.coalesce(Supplier.name, "Unknown").label("supplier_name"),
+        Supplier.country_code,
+        Supplier.region,
+        Supplier.supply_chain_level.label("tier"),
+        CampaignSupplierStatus.status,
+        CampaignSupplierStatus.last_contact_at,
+        CampaignSupplierStatus.reminders_sent,
+        cast(CampaignSupplierStatus.progression_score, Float).label("progression_score")
+    ).outerjoin(
+        Supplier, Supplier.id == CampaignSupplierStatus.supplier_id
+    ).filter(CampaignSupplierStatus.campaign_id == campaign_id)
 
-@router.get("/{campaign_id}/suppliers")
-def get_campaign_suppliers(campaign_id: int, db: Session = Depends(get_db)):
-    """Liste les fournisseurs d'une campagne"""
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if not campaign:
+    if status:
+        query = query.filter(CampaignSupplierStatus.status == status)
+    if tier:
+        query = query.filter(Supplier.supply_chain_level == tier)
+    if region:
+        query = query.filter(Supplier.region == region)
+
+    sort_column = CAMPAIGN_SUPPLIER_SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    if paginate == "cursor" and cursor:
+        cursor_value, cursor_id = decode_cursor(cursor, 2)
+        if not isinstance(cursor_id, int):
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+        if sort == "last_contact_at":
+            if not (cursor_value is None or isinstance(cursor_value, str)):
+                raise HTTPException(status_code=400, detail="Curseur invalide")
+            cursor_value = parse_cursor_datetime(cursor_value)
+        elif not (cursor_value is None or isinstance(cursor_value, int)):
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+        query = query.filter(_after_cursor(
+            sort_column, CampaignSupplierStatus.supplier_id, cursor_value, cursor_id, descending
+        ))
+
+    query = query.order_by(*_ordering(sort_column, CampaignSupplierStatus.supplier_id, descending))
+    if paginate == "offset":
+        rows = query.offset(skip).limit(limit).all()
+    else:
+        rows = query.limit(limit + 1).all()
+
+    # Page vide : la campagne n'est vérifiée qu'à ce moment
+    if not rows and not db.query(Campaign.id).filter(Campaign.id == campaign_id).first():
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    statuses = db.query(CampaignSupplierStatus).filter(
-        CampaignSupplierStatus.campaign_id == campaign_id
-    ).all()
+    next_cursor = None
+    if paginate == "cursor" and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort), last.supplier_id)
+
+    if format == "columns":
+        keys = query.statement.selected_columns.keys()
+        return {
+            "columns": {key: [row[index] for row in rows] for index, key in enumerate(keys)},
+            "next_cursor": next_cursor
+        }
+
+    items = [row._asdict() for row in rows]
+    if paginate == "offset":
+        return items
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("/{campaign_id}/suppliers", response_model=CampaignEnrollResultSchema)
+def enroll_campaign_suppliers(campaign_id: int, data: CampaignEnrollSchema, db: Session = Depends(get_db)):
+    """
+    Inscrit des fournisseurs à la campagne (statut not_started) en une
+    requête : added (inscrits), skipped (déjà inscrits), missing
+    (identifiants inconnus, listés dans missing_ids).
+    """
+    if not data.supplier_ids:
+        raise HTTPException(status_code=400, detail="Aucun fournisseur à inscrire")
+    if len(data.supplier_ids) > ENROLL_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"Maximum {ENROLL_MAX_IDS} fournisseurs par requête")
+    if not CampaignService.get_by_id(db, campaign_id):
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return CampaignService.add_suppliers(db, campaign_id, data.supplier_ids)
 
-    result = []
-    for status in statuses:
-        supplier = db.query(Supplier).filter(Supplier.id == status.supplier_id).first()
-        result.append({
-            "supplier_id": status.supplier_id,
-            "supplier_name": supplier.name if supplier else "Unknown",
-            "status": status.status,
-            "last_contact_at": status.last_contact_at,
-            "reminders_sent": status.reminders_sent
-        })
 
-    return result
+@router.post("/{campaign_id}/targeting", response_model=CampaignTargetingResultSchema)
+def target_campaign_suppliers(campaign_id: int, data: CampaignTargetingSchema, db: Session = Depends(get_db)):
+    """
+    Inscrit à la campagne tous les fournisseurs correspondant aux critères
+    (listes de valeurs acceptées, combinées par ET) en une requête
+    INSERT ... SELECT. dry_run=true : mêmes compteurs, sans inscription.
+
+    part_families / match_campaign_part_families : au moins une famille de
+    pièces en commun avec la liste fournie / avec target_part_families.
+
+    regulatory_risk_min / _max, climate_risk_min / _max : bornes incluses
+    (0 à 100) sur les risques des métadonnées Hub.
+    """
+    campaign = CampaignService.get_by_id(db, campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    if data.match_campaign_part_families and not campaign.target_part_families:
+        raise HTTPException(status_code=400, detail="La campagne n'a pas de familles de pièces cibles")
+
+    criteria = data.model_dump(exclude={"dry_run"})
+    conditions = CampaignService.targeting_filters(db, campaign_id, criteria)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Aucun critère de ciblage")
+    return CampaignService.enroll_matching(db, campaign_id, conditions, dry_run=data.dry_run)
 
 
 @router.post("", response_model=CampaignSchema)
@@ -174,5 +434,6 @@ def create_campaign(data: CampaignCreateSchema, db: Session = Depends(get_db)):
     )
     db.add(campaign)
     db.commit()
+    table_versions.bump("campaigns")
     db.refresh(campaign)
     return campaign
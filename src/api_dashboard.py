@@ -1,74 +1,162 @@
 """
 AX5-SECT API - Dashboard Endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta
-
-from .database import get_db
+from sqlalchemy import String, func, literal, select, true, tuple_, union_all
+from datetime import date, datetime
+
+from .database import get_db, get_db_session
+from .crud import CampaignService, DashboardSnapshotService
+from .cache import cached_route, dashboard_cache, etag_guard
+from .dashboard_stream import broadcaster
+from .pagination import decode_cursor, encode_cursor, parse_cursor_datetime
 from .db_models import (
     Supplier, Campaign, CampaignSupplierStatus,
-    IMDSSubmission, PCFObject, PCFProfile
+    IMDSSubmission, PCFObject, PCFProfile, PCFMonthlyRollup, Event
 )
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+STATS_TABLES = ("suppliers", "campaigns", "imds_submissions", "pcf_objects", "pcf_profiles", "dashboard_snapshot")
+OVERVIEW_TABLES = STATS_TABLES + ("campaign_supplier_status",)
+TREND_TABLES = ("pcf_objects", "pcf_monthly_rollup")
+ACTIVITY_TABLES = (
+    "imds_submissions", "pcf_objects", "campaign_supplier_status", "events", "suppliers", "campaigns"
+)
+# Le bundle dépend des tables de toutes ses sections (dont le rollup de la tendance)
+BUNDLE_TABLES = tuple(dict.fromkeys(OVERVIEW_TABLES + ACTIVITY_TABLES + TREND_TABLES))
+
+# Exécuteur partagé du bundle : borne le nombre de connexions prises au pool
+_bundle_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard-bundle")
+
+
+def _stats_statement():
+    """Construit l'agrégat unique (un CTE par table) des statistiques globales"""
+    suppliers = select(
+        func.count().label("total"),
+        func.count().filter(Supplier.supply_chain_level == "tier1").label("tier1"),
+        func.count().filter(Supplier.supply_chain_level == "tier2").label("tier2"),
+    ).select_from(Supplier).cte("supplier_stats")
+
+    campaigns = select(
+        func.count().label("total"),
+        func.count().filter(Campaign.status == "active").label("active"),
+    ).select_from(Campaign).cte("campaign_stats")
+
+    imds = select(
+        func.count().label("total"),
+        func.count().filter(IMDSSubmission.status == "validated").label("validated"),
+        func.count().filter(
+            IMDSSubmission.status.in_(["submitted", "draft", "pending"])
+        ).label("pending"),
+        func.count().filter(IMDSSubmission.status == "rejected").label("rejected"),
+    ).select_from(IMDSSubmission).cte("imds_stats")
+
+    pcf = select(
+        func.count().label("total"),
+        func.count().filter(PCFObject.validation_status == "validated").label("validated"),
+        func.count().filter(PCFObject.validation_status == "pending").label("pending"),
+        func.coalesce(func.sum(PCFObject.total_emissions_kgco2e), 0).label("emissions"),
+    ).select_from(PCFObject).cte("pcf_stats")
+
+    coverage = select(
+        func.count().filter(PCFProfile.pcf_count > 0).label("covered"),
+    ).select_from(PCFProfile).cte("pcf_coverage")
+
+    # Chaque CTE retourne exactement une ligne : le produit cartésien en donne une seule
+    return select(
+        suppliers.c.total.label("suppliers_total"),
+        suppliers.c.tier1.label("suppliers_tier1"),
+        suppliers.c.tier2.label("suppliers_tier2"),
+        campaigns.c.total.label("campaigns_total"),
+        campaigns.c.active.label("campaigns_active"),
+        imds.c.total.label("imds_total"),
+        imds.c.validated.label("imds_validated"),
+        imds.c.pending.label("imds_pending"),
+        imds.c.rejected.label("imds_rejected"),
+        pcf.c.total.label("pcf_total"),
+        pcf.c.validated.label("pcf_validated"),
+        pcf.c.pending.label("pcf_pending"),
+        pcf.c.emissions.label("total_emissions"),
+        coverage.c.covered.label("suppliers_with_pcf"),
+    ).select_from(suppliers).join(campaigns, true()).join(imds, true()).join(
+        pcf, true()
+    ).join(coverage, true())
+
+
+def _stats_from_snapshot(counters: dict) -> dict:
+    """Convertit les compteurs du snapshot au format de _stats_statement"""
+    def bucket(scope: str, *names: str) -> int:
+        values = counters.get(scope, {})
+        return int(sum(values.get(name, 0) for name in names))
+
+    def total(scope: str) -> int:
+        return int(sum(counters.get(scope, {}).values()))
 
-@router.get("/stats")
+    return {
+        "suppliers_total": total("suppliers"),
+        "suppliers_tier1": bucket("suppliers", "tier1"),
+        "suppliers_tier2": bucket("suppliers", "tier2"),
+        "campaigns_total": total("campaigns"),
+        "campaigns_active": bucket("campaigns", "active"),
+        "imds_total": total("imds"),
+        "imds_validated": bucket("imds", "validated"),
+        "imds_pending": bucket("imds", "submitted", "draft", "pending"),
+        "imds_rejected": bucket("imds", "rejected"),
+        "pcf_total": total("pcf"),
+        "pcf_validated": bucket("pcf", "validated"),
+        "pcf_pending": bucket("pcf", "pending"),
+        "total_emissions": counters.get("emissions", {}).get("total_kgco2e", 0),
+        "suppliers_with_pcf": bucket("pcf_coverage", "covered"),
+    }
+
+
+@router.get("/stats", dependencies=[Depends(etag_guard(*STATS_TABLES))])
+@cached_route(dashboard_cache, *STATS_TABLES)
 def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Statistiques globales pour le dashboard"""
-
-    # Suppliers stats
-    total_suppliers = db.query(Supplier).count()
-    tier1_count = db.query(Supplier).filter(Supplier.supply_chain_level == "tier1").count()
-    tier2_count = db.query(Supplier).filter(Supplier.supply_chain_level == "tier2").count()
-
-    # Campaigns stats
-    total_campaigns = db.query(Campaign).count()
-    active_campaigns = db.query(Campaign).filter(Campaign.status == "active").count()
-
-    # IMDS submissions stats
-    imds_total = db.query(IMDSSubmission).count()
-    imds_validated = db.query(IMDSSubmission).filter(IMDSSubmission.status == "validated").count()
-    imds_pending = db.query(IMDSSubmission).filter(
-        IMDSSubmission.status.in_(["submitted", "draft", "pending"])
-    ).count()
-    imds_rejected = db.query(IMDSSubmission).filter(IMDSSubmission.status == "rejected").count()
-
-    # PCF stats
-    pcf_total = db.query(PCFObject).count()
-    pcf_validated = db.query(PCFObject).filter(PCFObject.validation_status == "validated").count()
-    pcf_pending = db.query(PCFObject).filter(PCFObject.validation_status == "pending").count()
-
-    # PCF coverage
-    suppliers_with_pcf = db.query(PCFProfile).filter(PCFProfile.pcf_count > 0).count()
+    """
+    Statistiques globales pour le dashboard
+
+    Lues dans le snapshot maintenu par triggers ; si celui-ci est vide
+    (migration 003 non initialisée), calculées en une seule requête agrégée.
+    """
+    counters = DashboardSnapshotService.read(db)
+    if counters is not None:
+        values = _stats_from_snapshot(counters)
+    else:
+        values = dict(db.execute(_stats_statement()).one()._mapping)
+
+    total_suppliers = values["suppliers_total"]
+    suppliers_with_pcf = values["suppliers_with_pcf"]
     pcf_coverage = round((suppliers_with_pcf / total_suppliers * 100), 1) if total_suppliers > 0 else 0
-
-    # Total emissions
-    total_emissions = db.query(func.sum(PCFObject.total_emissions_kgco2e)).scalar() or 0
+    total_emissions = values["total_emissions"] or 0
 
     return {
         "suppliers": {
             "total": total_suppliers,
-            "tier1": tier1_count,
-            "tier2": tier2_count
+            "tier1": values["suppliers_tier1"],
+            "tier2": values["suppliers_tier2"]
         },
         "campaigns": {
-            "total": total_campaigns,
-            "active": active_campaigns
+            "total": values["campaigns_total"],
+            "active": values["campaigns_active"]
         },
         "imds": {
-            "total": imds_total,
-            "validated": imds_validated,
-            "pending": imds_pending,
-            "rejected": imds_rejected
+            "total": values["imds_total"],
+            "validated": values["imds_validated"],
+            "pending": values["imds_pending"],
+            "rejected": values["imds_rejected"]
         },
         "pcf": {
-            "total": pcf_total,
-            "validated": pcf_validated,
-            "pending": pcf_pending,
+            "total": values["pcf_total"],
+            "validated": values["pcf_validated"],
+            "pending": values["pcf_pending"],
             "coverage": pcf_coverage,
             "suppliers_covered": suppliers_with_pcf
         },
@@ -79,25 +167,14 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
     }
 
 
-@router.get("/overview")
-def get_dashboard_overview(db: Session = Depends(get_db)):
-    """Vue d'ensemble pour le dashboard principal"""
-    stats = get_dashboard_stats(db)
-
-    # Campagnes actives avec progression
-    active_campaigns = db.query(Campaign).filter(Campaign.status == "active").all()
-    campaigns_data = []
-
-    for campaign in active_campaigns:
-        statuses = db.query(CampaignSupplierStatus).filter(
-            CampaignSupplierStatus.campaign_id == campaign.id
-        ).all()
+def _active_campaigns_progress(db: Session) -> List[dict]:
+    """Campagnes actives avec progression (une seule requête groupée)"""
+    rows = CampaignService.with_progress(db).filter(
+        Campaign.status == "active"
+    ).order_by(Campaign.id).all()
 
-        total = len(statuses)
-        responded = sum(1 for s in statuses if s.status in ["submitted", "validated"])
-        validated = sum(1 for s in statuses if s.status == "validated")
-
-        campaigns_data.append({
+    return [
+        {
             "id": campaign.id,
             "name": campaign.name,
             "type": campaign.type,
@@ -105,7 +182,21 @@ def get_dashboard_overview(db: Session = Depends(get_db)):
             "end_date": campaign.end_date,
             "suppliers_total": total,
             "suppliers_responded": responded,
-            "suppliers_validated": validated,
+            "suppliers_validated": validated
+        }
+        for campaign, total, responded, validated in rows
+    ]
+
+
+def _build_overview(stats: dict, active_campaigns: list) -> dict:
+    """Assemble la vue d'ensemble à partir des statistiques et de la progression des campagnes"""
+    campaigns_data = []
+
+    for campaign in active_campaigns:
+        total = campaign["suppliers_total"]
+        responded = campaign["suppliers_responded"]
+        campaigns_data.append({
+            **campaign,
             "progress": round((responded / total * 100), 1) if total > 0 else 0
         })
 
@@ -115,77 +206,188 @@ def get_dashboard_overview(db: Session = Depends(get_db)):
     }
 
 
-@router.get("/activity")
-def get_recent_activity(limit: int = 10, db: Session = Depends(get_db)):
-    """Activité récente"""
-    activities = []
-
-    # Dernières soumissions IMDS
-    recent_imds = db.query(IMDSSubmission).order_by(
-        IMDSSubmission.updated_at.desc()
-    ).limit(5).all()
-
-    for imds in recent_imds:
-        supplier = db.query(Supplier).filter(Supplier.id == imds.supplier_id).first()
-        activities.append({
-            "type": "imds_submission",
-            "title": f"IMDS {'validé' if imds.status == 'validated' else 'soumis'}",
-            "description": f"{supplier.name if supplier else 'Unknown'} - {imds.mds_id or imds.internal_ref}",
-            "status": imds.status,
-            "timestamp": imds.updated_at
-        })
-
-    # Derniers objets PCF
-    recent_pcf = db.query(PCFObject).order_by(
-        PCFObject.updated_at.desc()
-    ).limit(5).all()
-
-    for pcf in recent_pcf:
-        supplier = db.query(Supplier).filter(Supplier.id == pcf.supplier_id).first()
-        activities.append({
-            "type": "pcf_submission",
-            "title": f"PCF {'validé' if pcf.validation_status == 'validated' else 'soumis'}",
-            "description": f"{supplier.name if supplier else 'Unknown'} - {pcf.product_ref}",
-            "status": pcf.validation_status,
-            "timestamp": pcf.updated_at
-        })
-
-    # Trier par date
-    activities.sort(key=lambda x: x["timestamp"] or datetime.min, reverse=True)
-
-    return activities[:limit]
-
+@router.get("/overview", dependencies=[Depends(etag_guard(*OVERVIEW_TABLES))])
+@cached_route(dashboard_cache, *OVERVIEW_TABLES)
+def get_dashboard_overview(db: Session = Depends(get_db)):
+    """Vue d'ensemble pour le dashboard principal"""
+    return _build_overview(get_dashboard_stats(db), _active_campaigns_progress(db))
+
+
+# Sources du fil d'activité : (type, rang de départage)
+ACTIVITY_SOURCES = {
+    "imds_submission": 4,
+    "pcf_submission": 3,
+    "campaign_status": 2,
+    "event": 1,
+}
+
+
+def _activity_branch(kind: str, model, timestamp_col, status_col, reference_col, campaign_col,
+                     limit: int, cursor: Optional[list], extra_joins=()):
+    """Une branche du UNION ALL, triée et limitée pour utiliser l'index (timestamp, id)"""
+    rank = ACTIVITY_SOURCES[kind]
+    query = select(
+        literal(kind).label("type"),
+        literal(rank).label("source_rank"),
+        model.id.label("id"),
+        timestamp_col.label("timestamp"),
+        status_col.label("status"),
+        reference_col.label("reference"),
+        campaign_col.label("campaign_id"),
+        model.supplier_id.label("supplier_id"),
+        Supplier.name.label("supplier_name"),
+    ).select_from(model).outerjoin(Supplier, Supplier.id == model.supplier_id)
+
+    for target, onclause in extra_joins:
+        query = query.outerjoin(target, onclause)
+
+    query = query.where(timestamp_col.isnot(None))
+    if cursor is not None:
+        cursor_ts, cursor_rank, cursor_id = cursor
+        # Ordre global : (timestamp, source_rank, id) décroissant
+        if rank < cursor_rank:
+            query = query.where(timestamp_col <= cursor_ts)
+        elif rank > cursor_rank:
+            query = query.where(timestamp_col < cursor_ts)
+        else:
+            query = query.where(tuple_(timestamp_col, model.id) < tuple_(cursor_ts, cursor_id))
+
+    return query.order_by(timestamp_col.desc(), model.id.desc()).limit(limit)
+
+
+def _activity_title(item) -> str:
+    if item.type == "imds_submission":
+        return f"IMDS {'validé' if item.status == 'validated' else 'soumis'}"
+    if item.type == "pcf_submission":
+        return f"PCF {'validé' if item.status == 'validated' else 'soumis'}"
+    if item.type == "campaign_status":
+        return f"Campagne : statut {item.status}"
+    return item.reference or "Événement"
+
+
+@router.get("/activity", dependencies=[Depends(etag_guard(*ACTIVITY_TABLES))])
+@cached_route(dashboard_cache, *ACTIVITY_TABLES)
+def get_recent_activity(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Fil d'activité (IMDS, PCF, statuts de campagne, événements) en une requête UNION ALL.
+    Pagination par clé sur (timestamp, id) : passer next_cursor pour la page suivante.
+    """
+    position = None
+    if cursor:
+        cursor_ts, cursor_rank, cursor_id = decode_cursor(cursor, 3)
+        try:
+            position = [parse_cursor_datetime(cursor_ts), int(cursor_rank), int(cursor_id)]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+
+    page_size = limit + 1
+    branches = [
+        _activity_branch(
+            "imds_submission", IMDSSubmission, IMDSSubmission.updated_at, IMDSSubmission.status,
+            func.coalesce(IMDSSubmission.mds_id, IMDSSubmission.internal_ref),
+            IMDSSubmission.campaign_id, page_size, position
+        ),
+        _activity_branch(
+            "pcf_submission", PCFObject, PCFObject.updated_at, PCFObject.validation_status,
+            PCFObject.product_ref, PCFObject.campaign_id, page_size, position
+        ),
+        _activity_branch(
+            "campaign_status", CampaignSupplierStatus, CampaignSupplierStatus.updated_at,
+            CampaignSupplierStatus.status, Campaign.name, CampaignSupplierStatus.campaign_id,
+            page_size, position,
+            extra_joins=[(Campaign, Campaign.id == CampaignSupplierStatus.campaign_id)]
+        ),
+        _activity_branch(
+            "event", Event, Event.created_at, literal(None, String), Event.event_type,
+            Event.campaign_id, page_size, position
+        ),
+    ]
+    feed = union_all(*branches).subquery("activity")
+    rows = db.execute(
+        select(feed).order_by(
+            feed.c.timestamp.desc(), feed.c.source_rank.desc(), feed.c.id.desc()
+        ).limit(page_size)
+    ).all()
+
+    items = [
+        {
+            "id": row.id,
+            "type": row.type,
+            "title": _activity_title(row),
+            "description": f"{row.supplier_name or 'Unknown'} - {row.reference or ''}",
+            "status": row.status,
+            "supplier_id": row.supplier_id,
+            "campaign_id": row.campaign_id,
+            "timestamp": row.timestamp
+        }
+        for row in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.timestamp, last.source_rank, last.id)
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+MONTH_NAMES = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin", "Juil", "Août", "Sep", "Oct", "Nov", "Déc"]
+
+
+@router.get("/emissions/trend", dependencies=[Depends(etag_guard(*TREND_TABLES))])
+@cached_route(dashboard_cache, *TREND_TABLES)
+def get_emissions_trend(
+    months: int = Query(6, ge=1, le=120),
+    campaign_id: Optional[int] = None,
+    supply_chain_level: Optional[str] = None,
+    region: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Émissions collectées / validées (kg CO2e) par mois de collecte, lues dans pcf_monthly_rollup"""
+    today = datetime.utcnow().date()
+    month_index = today.year * 12 + today.month - 1 - (months - 1)
+    periods = [
+        date((month_index + i) // 12, (month_index + i) % 12 + 1, 1)
+        for i in range(months)
+    ]
+
+    query = db.query(
+        PCFMonthlyRollup.month,
+        func.sum(PCFMonthlyRollup.collected_kgco2e),
+        func.sum(PCFMonthlyRollup.validated_kgco2e),
+    ).filter(PCFMonthlyRollup.month >= periods[0])
+
+    if campaign_id is not None:
+        query = query.filter(PCFMonthlyRollup.campaign_id == campaign_id)
+    if supply_chain_level:
+        query = query.filter(PCFMonthlyRollup.supply_chain_level == supply_chain_level)
+    if region:
+        query = query.filter(PCFMonthlyRollup.region == region)
+
+    totals = {
+        month: (float(collected or 0), float(validated or 0))
+        for month, collected, validated in query.group_by(PCFMonthlyRollup.month).all()
+    }
 
-@router.get("/emissions/trend")
-def get_emissions_trend(months: int = 6, db: Session = Depends(get_db)):
-    """Tendance des émissions sur les derniers mois"""
     trend_data = []
-    now = datetime.utcnow()
-
-    month_names = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin", "Juil", "Août", "Sep", "Oct", "Nov", "Déc"]
-
-    for i in range(months - 1, -1, -1):
-        month_date = now - timedelta(days=30 * i)
-        month_name = month_names[month_date.month - 1]
-
-        # Données simulées pour la démo
-        base_collected = 1200 + (months - i) * 400
-        base_validated = int(base_collected * 0.85)
-
+    for period in periods:
+        collected, validated = totals.get(period, (0.0, 0.0))
         trend_data.append({
-            "month": month_name,
-            "collected": base_collected,
-            "validated": base_validated
+            "month": MONTH_NAMES[period.month - 1],
+            "period": period.strftime("%Y-%m"),
+            "collected": round(collected, 2),
+            "validated": round(validated, 2)
         })
 
     return trend_data
 
 
-@router.get("/kpis")
-def get_kpis(db: Session = Depends(get_db)):
-    """KPIs clés pour le dashboard"""
-    stats = get_dashboard_stats(db)
-
+def _build_kpis(stats: dict, active_campaigns: list) -> dict:
+    """Calcule les KPIs à partir des statistiques et de la progression des campagnes"""
     # Taux de validation IMDS
     imds_validation_rate = 0
     if stats["imds"]["total"] > 0:
@@ -201,16 +403,11 @@ def get_kpis(db: Session = Depends(get_db)):
         )
 
     # Taux de réponse moyen des campagnes
-    active_campaigns = db.query(Campaign).filter(Campaign.status == "active").all()
-    response_rates = []
-
-    for campaign in active_campaigns:
-        statuses = db.query(CampaignSupplierStatus).filter(
-            CampaignSupplierStatus.campaign_id == campaign.id
-        ).all()
-        if statuses:
-            responded = sum(1 for s in statuses if s.status in ["submitted", "validated"])
-            response_rates.append(responded / len(statuses) * 100)
+    response_rates = [
+        campaign["suppliers_responded"] / campaign["suppliers_total"] * 100
+        for campaign in active_campaigns
+        if campaign["suppliers_total"] > 0
+    ]
 
     avg_response_rate = round(sum(response_rates) / len(response_rates), 1) if response_rates else 0
 
@@ -238,3 +435,86 @@ def get_kpis(db: Session = Depends(get_db)):
             "trend": -5.2
         }
     }
+
+
+@router.get("/kpis", dependencies=[Depends(etag_guard(*OVERVIEW_TABLES))])
+@cached_route(dashboard_cache, *OVERVIEW_TABLES)
+def get_kpis(db: Session = Depends(get_db)):
+    """KPIs clés pour le dashboard"""
+    return _build_kpis(get_dashboard_stats(db), _active_campaigns_progress(db))
+
+
+def _run_in_session(func: Callable, *args, **kwargs):
+    """Exécute une sous-requête du bundle sur sa propre connexion du pool"""
+    with get_db_session() as db:
+        return func(*args, db=db, **kwargs)
+
+
+@router.get("/bundle", dependencies=[Depends(etag_guard(*BUNDLE_TABLES))])
+def get_dashboard_bundle(
+    activity_limit: int = Query(10, ge=1, le=100),
+    months: int = Query(6, ge=1, le=120),
+    db: Session = Depends(get_db)
+):
+    """
+    Toutes les sections du dashboard en une réponse.
+    Les requêtes indépendantes s'exécutent en parallèle : stats sur la session
+    de la requête (celle de etag_guard), les trois autres sur leur connexion ;
+    stats et progression des campagnes sont calculées une fois puis partagées
+    entre overview et kpis.
+
+    Connexions du pool : au plus 4 par requête (la sienne + 3 sections), et
+    jamais plus de 4 pour l'ensemble des sections en parallèle du processus
+    (_bundle_executor) : N bundles simultanés prennent au plus N + 4 connexions.
+    """
+    progress = _bundle_executor.submit(_run_in_session, _active_campaigns_progress)
+    activity = _bundle_executor.submit(
+        _run_in_session, get_recent_activity, limit=activity_limit, cursor=None
+    )
+    trend = _bundle_executor.submit(_run_in_session, get_emissions_trend, months=months)
+
+    stats_data = get_dashboard_stats(db)
+    progress_data = progress.result()
+
+    return {
+        "stats": stats_data,
+        "overview": _build_overview(stats_data, progress_data),
+        "kpis": _build_kpis(stats_data, progress_data),
+        "activity": activity.result(),
+        "emissions_trend": trend.result()
+    }
+
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """Compteurs du cache des endpoints dashboard (hits, misses, évictions)"""
+    return dashboard_cache.stats()
+
+
+@router.get("/stream")
+async def stream_dashboard(request: Request):
+    """
+    Flux SSE des changements (statuts de campagne, soumissions IMDS, objets PCF).
+    Alimenté par LISTEN/NOTIFY via un listener unique par worker.
+    Un événement 'resync' signale au client de recharger /dashboard/bundle.
+    """
+    queue = broadcaster.subscribe()
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
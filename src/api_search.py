@@ -0,0 +1,41 @@
+"""
+AX5-SECT API - Search Endpoints
+"""
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+
+from .typeahead import typeahead_index
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+SEARCH_TYPES = ("supplier", "campaign")
+
+
+@router.get("/typeahead")
+def typeahead(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    types: Optional[str] = Query(None, description="supplier,campaign"),
+):
+    """
+    Suggestions pour les sélecteurs de fournisseurs et de campagnes.
+    Servies depuis l'index en mémoire (noms, external_id, groupe parent),
+    sans requête SQL.
+    """
+    kinds: Optional[List[str]] = None
+    if types:
+        kinds = [kind.strip() for kind in types.split(",") if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in SEARCH_TYPES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Type inconnu : {', '.join(unknown)}")
+
+    if not typeahead_index.ready:
+        raise HTTPException(status_code=503, detail="Index de recherche en cours de construction")
+
+    return {"query": q, "items": typeahead_index.search(q, limit=limit, kinds=kinds)}
+
+
+@router.get("/typeahead/stats")
+def typeahead_stats():
+    """Taille de l'index typeahead"""
+    return typeahead_index.stats()
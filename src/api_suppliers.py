@@ -1,17 +1,44 @@
 """
 AX5-SECT API - Suppliers Endpoints
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+import io
+import tempfile
+from typing import Dict, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session, aliased
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 
 from .database import get_db
-from .db_models import Supplier, SupplierContact, IMDSProfile, PCFProfile
+from .db_models import (
+    Supplier, IMDSProfile, PCFProfile, SupplierHubMetadata, SupplierPriorityScore, SupplierMergeCandidate
+)
+from .cache import etag_guard, table_versions
+from .crud import SUPPLIER_CASCADE_TABLES, SupplierService
+from .exports import (
+    EXPORT_MEDIA_TYPES, stream_query, supplier_full, supplier_full_filters, supplier_full_query
+)
+from .pagination import decode_cursor, encode_cursor
+from .prioritization import compute_priority_scores
+from .supplier_import import import_suppliers
 
 router = APIRouter(prefix="/suppliers", tags=["Suppliers"])
 
+PROFILE_TABLES = (
+    "suppliers", "supplier_contacts", "imds_profiles", "pcf_profiles", "supplier_hub_metadata"
+)
+RANKING_TABLES = ("supplier_priority_scores", "suppliers", "supplier_hub_metadata")
+MERGE_CANDIDATE_TABLES = ("supplier_merge_candidates", "suppliers")
+BATCH_MAX_IDS = 200
+BULK_UPDATE_MAX_ITEMS = 10000
+
+# Au-delà, le corps d'un import est stocké sur disque plutôt qu'en mémoire
+IMPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
 
 # ============================================================================
 # SCHEMAS
@@ -70,6 +97,58 @@ class SupplierSchema(BaseModel):
         from_attributes = True
 
 
+class SupplierPageSchema(BaseModel):
+    items: List[SupplierSchema]
+    next_cursor: Optional[str] = None
+
+
+class SupplierRankingItemSchema(BaseModel):
+    supplier_id: int
+    external_id: Optional[str]
+    name: str
+    country_code: Optional[str]
+    supply_chain_level: Optional[str]
+    score: float
+    suggested_priority: Optional[str]
+    priority: Optional[str]
+    scored_at: Optional[datetime]
+
+
+class SupplierRankingPageSchema(BaseModel):
+    items: List[SupplierRankingItemSchema]
+    next_cursor: Optional[str] = None
+
+
+class PriorityComputeSchema(BaseModel):
+    weights: Optional[Dict[str, float]] = None
+
+
+class MergeCandidateSchema(BaseModel):
+    id: int
+    supplier_id_a: int
+    name_a: str
+    country_code_a: Optional[str]
+    supplier_id_b: int
+    name_b: str
+    country_code_b: Optional[str]
+    score: float
+    name_similarity: float
+    blocking_key: Optional[str]
+    status: str
+    reviewed_by: Optional[str]
+    reviewed_at: Optional[datetime]
+
+
+class MergeCandidatePageSchema(BaseModel):
+    items: List[MergeCandidateSchema]
+    next_cursor: Optional[str] = None
+
+
+class MergeCandidateReviewSchema(BaseModel):
+    status: str = Field(..., pattern="^(pending|merged|rejected)$")
+    reviewed_by: Optional[str] = None
+
+
 class SupplierFullSchema(SupplierSchema):
     contacts: List[SupplierContactSchema] = []
     imds_profile: Optional[IMDSProfileSchema] = None
@@ -96,12 +175,52 @@ class SupplierUpdateSchema(BaseModel):
     supply_chain_level: Optional[str] = None
     main_part_families: Optional[List[str]] = None
 
+    @field_validator("name")
+    @classmethod
+    def name_not_null(cls, value: Optional[str]) -> str:
+        # Champ absent : inchangé ; null explicite : refusé (colonne NOT NULL)
+        if value is None:
+            raise ValueError("name ne peut pas être null")
+        return value
+
+
+class SupplierBulkChangesSchema(SupplierUpdateSchema):
+    priority: Optional[str] = Field(None, pattern="^[ABC]$")
+    regulatory_risk: Optional[float] = Field(None, ge=0, le=100)
+    climate_risk: Optional[float] = Field(None, ge=0, le=100)
+    program_status: Optional[str] = None
+    strategic_notes: Optional[str] = None
+
+
+class SupplierBulkItemSchema(BaseModel):
+    id: int
+    changes: SupplierBulkChangesSchema
+
+
+class SupplierBulkFilterSchema(BaseModel):
+    ids: Optional[List[int]] = None
+    country_code: Optional[str] = None
+    region: Optional[str] = None
+    supplier_type: Optional[str] = None
+    supply_chain_level: Optional[str] = None
+    priority: Optional[str] = Field(None, pattern="^[ABC]$")
+
+
+class SupplierBulkUpdateSchema(BaseModel):
+    items: Optional[List[SupplierBulkItemSchema]] = None
+    filter: Optional[SupplierBulkFilterSchema] = None
+    changes: Optional[SupplierBulkChangesSchema] = None
+
 
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
 
-@router.get("", response_model=List[SupplierSchema])
+@router.get(
+    "",
+    response_model=Union[List[SupplierSchema], SupplierPageSchema],
+    dependencies=[Depends(etag_guard("suppliers", "v_supplier_full"))]
+)
 def list_suppliers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
@@ -109,69 +228,132 @@ def list_suppliers(
     supplier_type: Optional[str] = None,
     supply_chain_level: Optional[str] = None,
     search: Optional[str] = None,
+    priority: Optional[str] = None,
+    pcf_maturity: Optional[str] = None,
+    regulatory_risk_min: Optional[float] = Query(None, ge=0, le=100),
+    regulatory_risk_max: Optional[float] = Query(None, ge=0, le=100),
+    climate_risk_min: Optional[float] = Query(None, ge=0, le=100),
+    climate_risk_max: Optional[float] = Query(None, ge=0, le=100),
+    search_mode: str = Query("contains", pattern="^(contains|fuzzy)$"),
+    paginate: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Liste tous les fournisseurs avec filtres optionnels"""
+    """
+    Liste tous les fournisseurs avec filtres optionnels
+
+    paginate=cursor : pagination par clé sur (name, id), indépendante de la
+    profondeur ; la réponse devient {items, next_cursor} et next_cursor est
+    à repasser dans cursor pour la page suivante (skip est ignoré).
+
+    search_mode=fuzzy : recherche approximative (pg_trgm, migration 009),
+    tolérante aux fautes de frappe, triée par similarité décroissante.
+
+    priority, pcf_maturity, regulatory_risk_min / _max, climate_risk_min / _max
+    (bornes incluses) : filtrés via la vue matérialisée v_supplier_full
+    (semi-jointure sur id, sans joindre les profils).
+    """
     query = db.query(Supplier)
 
+    profile_filters = supplier_full_filters(
+        priority, pcf_maturity, regulatory_risk_min, regulatory_risk_max, climate_risk_min, climate_risk_max
+    )
+    if profile_filters:
+        query = query.filter(Supplier.id.in_(select(supplier_full.c.id).where(*profile_filters)))
+
     if country_code:
         query = query.filter(Supplier.country_code == country_code)
     if supplier_type:
         query = query.filter(Supplier.supplier_type == supplier_type)
     if supply_chain_level:
         query = query.filter(Supplier.supply_chain_level == supply_chain_level)
+
+    if search and search_mode == "fuzzy":
+        if paginate == "cursor":
+            raise HTTPException(
+                status_code=400,
+                detail="Pagination par curseur indisponible en recherche approximative"
+            )
+        # %> : word_similarity(search, colonne) au-dessus du seuil pg_trgm,
+        # évalué via les index GIN trigrammes
+        score = func.greatest(
+            func.word_similarity(search, Supplier.name),
+            func.word_similarity(search, Supplier.external_id)
+        )
+        query = query.filter(
+            (Supplier.name.op("%>")(search)) |
+            (Supplier.external_id.op("%>")(search))
+        )
+        return query.order_by(score.desc(), Supplier.name, Supplier.id).offset(skip).limit(limit).all()
+
     if search:
+        # ILIKE '%...%' : servi par les mêmes index GIN trigrammes
         search_filter = f"%{search}%"
         query = query.filter(
             (Supplier.name.ilike(search_filter)) |
             (Supplier.external_id.ilike(search_filter))
         )
 
-    suppliers = query.order_by(Supplier.name).offset(skip).limit(limit).all()
-    return suppliers
+    query = query.order_by(Supplier.name, Supplier.id)
 
+    if paginate == "offset":
+        return query.offset(skip).limit(limit).all()
 
-@router.get("/stats")
-def get_suppliers_stats(db: Session = Depends(get_db)):
-    """Statistiques sur les fournisseurs"""
-    total = db.query(Supplier).count()
-    tier1 = db.query(Supplier).filter(Supplier.supply_chain_level == "tier1").count()
-    tier2 = db.query(Supplier).filter(Supplier.supply_chain_level == "tier2").count()
+    if cursor:
+        cursor_name, cursor_id = decode_cursor(cursor, 2)
+        if not isinstance(cursor_name, str) or not isinstance(cursor_id, int):
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+        query = query.filter(tuple_(Supplier.name, Supplier.id) > tuple_(cursor_name, cursor_id))
 
-    # Par région
-    regions = {}
-    for supplier in db.query(Supplier).all():
-        region = supplier.region or "Unknown"
-        regions[region] = regions.get(region, 0) + 1
+    suppliers = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(suppliers) > limit:
+        last = suppliers[limit - 1]
+        next_cursor = encode_cursor(last.name, last.id)
 
-    # PCF maturity stats
-    pcf_advanced = db.query(PCFProfile).filter(PCFProfile.pcf_maturity == "advanced").count()
-    pcf_intermediate = db.query(PCFProfile).filter(PCFProfile.pcf_maturity == "intermediate").count()
-    pcf_beginner = db.query(PCFProfile).filter(PCFProfile.pcf_maturity == "beginner").count()
+    return {"items": suppliers[:limit], "next_cursor": next_cursor}
+
+
+@router.get("/stats", dependencies=[Depends(etag_guard("suppliers", "pcf_profiles"))])
+def get_suppliers_stats(db: Session = Depends(get_db)):
+    """
+    Statistiques sur les fournisseurs
+
+    Deux requêtes GROUP BY : (tier, région) sur suppliers, puis maturité
+    sur pcf_profiles. Tous les tiers présents en base sont retournés.
+    """
+    total = 0
+    levels = {"tier1": 0, "tier2": 0}
+    regions = {}
+    rows = db.query(
+        Supplier.supply_chain_level, Supplier.region, func.count()
+    ).group_by(Supplier.supply_chain_level, Supplier.region).all()
+    for level, region, count in rows:
+        total += count
+        levels[level or "unknown"] = levels.get(level or "unknown", 0) + count
+        regions[region or "Unknown"] = regions.get(region or "Unknown", 0) + count
+
+    maturity = {"advanced": 0, "intermediate": 0, "beginner": 0}
+    rows = db.query(PCFProfile.pcf_maturity, func.count()).filter(
+        PCFProfile.pcf_maturity.isnot(None)
+    ).group_by(PCFProfile.pcf_maturity).all()
+    for level, count in rows:
+        maturity[level] = count
 
     return {
         "total": total,
-        "by_level": {"tier1": tier1, "tier2": tier2},
+        "by_level": levels,
         "by_region": regions,
-        "pcf_maturity": {
-            "advanced": pcf_advanced,
-            "intermediate": pcf_intermediate,
-            "beginner": pcf_beginner
-        }
+        "pcf_maturity": maturity
     }
 
 
-@router.get("/{supplier_id}")
-def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
-    """Récupère un fournisseur avec tous ses profils"""
-    supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
-    if not supplier:
-        raise HTTPException(status_code=404, detail="Fournisseur non trouvé")
-
-    # Récupérer les profils associés
-    imds_profile = db.query(IMDSProfile).filter(IMDSProfile.supplier_id == supplier_id).first()
-    pcf_profile = db.query(PCFProfile).filter(PCFProfile.supplier_id == supplier_id).first()
-    contacts = db.query(SupplierContact).filter(SupplierContact.supplier_id == supplier_id).all()
+def _supplier_profile(supplier: Supplier) -> dict:
+    """Profil complet d'un fournisseur chargé avec ses relations"""
+    imds_profile = supplier.imds_profile
+    pcf_profile = supplier.pcf_profile
+    hub_metadata = supplier.hub_metadata
+    contacts = supplier.contacts
 
     return {
         "id": supplier.id,
@@ -200,10 +382,254 @@ def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
             "tools_used": pcf_profile.tools_used,
             "frameworks": pcf_profile.frameworks,
             "data_quality_score": pcf_profile.data_quality_score
-        } if pcf_profile else None
+        } if pcf_profile else None,
+        "hub_metadata": {
+            "id": hub_metadata.id,
+            "priority": hub_metadata.priority,
+            "regulatory_risk": hub_metadata.regulatory_risk,
+            "climate_risk": hub_metadata.climate_risk,
+            "program_status": hub_metadata.program_status
+        } if hub_metadata else None
     }
 
 
+@router.get("/export")
+def export_suppliers(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    country_code: Optional[str] = None,
+    supplier_type: Optional[str] = None,
+    supply_chain_level: Optional[str] = None,
+    priority: Optional[str] = None,
+    pcf_maturity: Optional[str] = None,
+    regulatory_risk_min: Optional[float] = Query(None, ge=0, le=100),
+    regulatory_risk_max: Optional[float] = Query(None, ge=0, le=100),
+    climate_risk_min: Optional[float] = Query(None, ge=0, le=100),
+    climate_risk_max: Optional[float] = Query(None, ge=0, le=100)
+):
+    """
+    Export complet des fournisseurs avec profils IMDS / PCF et métadonnées Hub
+    (vue matérialisée v_supplier_full), en flux NDJSON ou CSV, sans pagination.
+    """
+    query = supplier_full_query().where(
+        *supplier_full_filters(
+            priority, pcf_maturity, regulatory_risk_min, regulatory_risk_max, climate_risk_min, climate_risk_max
+        )
+    )
+    if country_code:
+        query = query.where(supplier_full.c.country_code == country_code)
+    if supplier_type:
+        query = query.where(supplier_full.c.supplier_type == supplier_type)
+    if supply_chain_level:
+        query = query.where(supplier_full.c.supply_chain_level == supply_chain_level)
+
+    return StreamingResponse(
+        stream_query(query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="suppliers.{format}"'}
+    )
+
+
+@router.get("/batch", dependencies=[Depends(etag_guard(*PROFILE_TABLES))])
+def get_suppliers_batch(
+    ids: str = Query(..., description="Identifiants séparés par des virgules"),
+    db: Session = Depends(get_db)
+):
+    """
+    Profils complets de plusieurs fournisseurs en deux requêtes.
+    L'ordre des identifiants est conservé ; les absents sont listés dans missing_ids.
+    """
+    try:
+        requested = list(dict.fromkeys(int(value) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Identifiants invalides")
+    if not requested:
+        raise HTTPException(status_code=400, detail="Identifiants invalides")
+    if len(requested) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"Maximum {BATCH_MAX_IDS} identifiants par requête")
+
+    suppliers = {s.id: s for s in SupplierService.get_many_with_profiles(db, requested)}
+
+    return {
+        "items": [_supplier_profile(suppliers[i]) for i in requested if i in suppliers],
+        "missing_ids": [i for i in requested if i not in suppliers]
+    }
+
+
+@router.get(
+    "/ranking",
+    response_model=SupplierRankingPageSchema,
+    dependencies=[Depends(etag_guard(*RANKING_TABLES))]
+)
+def get_suppliers_ranking(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    suggested_priority: Optional[str] = Query(None, pattern="^[ABC]$"),
+    country_code: Optional[str] = None,
+    supplier_type: Optional[str] = None,
+    supply_chain_level: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Fournisseurs classés par score de priorité décroissant (dernier calcul
+    de POST /suppliers/ranking/compute), pagination par curseur.
+    """
+    query = db.query(
+        SupplierPriorityScore.supplier_id,
+        Supplier.external_id,
+        Supplier.name,
+        Supplier.country_code,
+        Supplier.supply_chain_level,
+        SupplierPriorityScore.score,
+        SupplierPriorityScore.suggested_priority,
+        SupplierHubMetadata.priority,
+        SupplierPriorityScore.updated_at.label("scored_at")
+    ).join(
+        Supplier, Supplier.id == SupplierPriorityScore.supplier_id
+    ).outerjoin(
+        SupplierHubMetadata, SupplierHubMetadata.supplier_id == SupplierPriorityScore.supplier_id
+    )
+
+    if suggested_priority:
+        query = query.filter(SupplierPriorityScore.suggested_priority == suggested_priority)
+    if country_code:
+        query = query.filter(Supplier.country_code == country_code)
+    if supplier_type:
+        query = query.filter(Supplier.supplier_type == supplier_type)
+    if supply_chain_level:
+        query = query.filter(Supplier.supply_chain_level == supply_chain_level)
+
+    if cursor:
+        cursor_score, cursor_id = decode_cursor(cursor, 2)
+        if not isinstance(cursor_score, str) or not isinstance(cursor_id, int):
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+        try:
+            cursor_score = Decimal(cursor_score)
+        except InvalidOperation:
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+        query = query.filter(
+            tuple_(SupplierPriorityScore.score, SupplierPriorityScore.supplier_id) <
+            tuple_(cursor_score, cursor_id)
+        )
+
+    rows = query.order_by(
+        SupplierPriorityScore.score.desc(), SupplierPriorityScore.supplier_id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(str(last.score), last.supplier_id)
+
+    return {"items": [row._asdict() for row in rows[:limit]], "next_cursor": next_cursor}
+
+
+@router.post("/ranking/compute")
+def compute_suppliers_ranking(data: PriorityComputeSchema = None, db: Session = Depends(get_db)):
+    """
+    Recalcule le score de priorité de tous les fournisseurs (une passe
+    vectorisée) avec les poids par défaut ou ceux fournis, et l'enregistre.
+    """
+    try:
+        result = compute_priority_scores(db, data.weights if data else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result.to_dict()
+
+
+def _merge_candidates_query(db: Session):
+    supplier_a = aliased(Supplier)
+    supplier_b = aliased(Supplier)
+    return db.query(
+        SupplierMergeCandidate.id,
+        SupplierMergeCandidate.supplier_id_a,
+        supplier_a.name.label("name_a"),
+        supplier_a.country_code.label("country_code_a"),
+        SupplierMergeCandidate.supplier_id_b,
+        supplier_b.name.label("name_b"),
+        supplier_b.country_code.label("country_code_b"),
+        SupplierMergeCandidate.score,
+        SupplierMergeCandidate.name_similarity,
+        SupplierMergeCandidate.blocking_key,
+        SupplierMergeCandidate.status,
+        SupplierMergeCandidate.reviewed_by,
+        SupplierMergeCandidate.reviewed_at
+    ).join(
+        supplier_a, supplier_a.id == SupplierMergeCandidate.supplier_id_a
+    ).join(
+        supplier_b, supplier_b.id == SupplierMergeCandidate.supplier_id_b
+    )
+
+
+@router.get(
+    "/merge-candidates",
+    response_model=MergeCandidatePageSchema,
+    dependencies=[Depends(etag_guard(*MERGE_CANDIDATE_TABLES))]
+)
+def list_merge_candidates(
+    status: str = Query("pending", pattern="^(pending|merged|rejected)$"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Doublons potentiels détectés par le job dedup-suppliers, par score
+    décroissant, pagination par curseur.
+    """
+    query = _merge_candidates_query(db).filter(SupplierMergeCandidate.status == status)
+
+    if cursor:
+        cursor_score, cursor_id = decode_cursor(cursor, 2)
+        if not isinstance(cursor_score, str) or not isinstance(cursor_id, int):
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+        try:
+            cursor_score = Decimal(cursor_score)
+        except InvalidOperation:
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+        query = query.filter(
+            tuple_(SupplierMergeCandidate.score, SupplierMergeCandidate.id) <
+            tuple_(cursor_score, cursor_id)
+        )
+
+    rows = query.order_by(
+        SupplierMergeCandidate.score.desc(), SupplierMergeCandidate.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(str(last.score), last.id)
+
+    return {"items": [row._asdict() for row in rows[:limit]], "next_cursor": next_cursor}
+
+
+@router.put("/merge-candidates/{candidate_id}", response_model=MergeCandidateSchema)
+def review_merge_candidate(candidate_id: int, data: MergeCandidateReviewSchema, db: Session = Depends(get_db)):
+    """
+    Revue d'une paire : merged ou rejected la retire de la file et la
+    protège des exécutions suivantes du job ; pending la remet en attente.
+    """
+    candidate = db.get(SupplierMergeCandidate, candidate_id)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Paire candidate non trouvée")
+
+    candidate.status = data.status
+    candidate.reviewed_by = data.reviewed_by if data.status != "pending" else None
+    candidate.reviewed_at = datetime.utcnow() if data.status != "pending" else None
+    db.commit()
+    table_versions.bump("supplier_merge_candidates")
+
+    return _merge_candidates_query(db).filter(SupplierMergeCandidate.id == candidate_id).one()._asdict()
+
+
+@router.get("/{supplier_id}", dependencies=[Depends(etag_guard(*PROFILE_TABLES))])
+def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
+    """Récupère un fournisseur avec tous ses profils"""
+    suppliers = SupplierService.get_many_with_profiles(db, [supplier_id])
+    if not suppliers:
+        raise HTTPException(status_code=404, detail="Fournisseur non trouvé")
+    return _supplier_profile(suppliers[0])
+
+
 @router.post("", response_model=SupplierSchema)
 def create_supplier(data: SupplierCreateSchema, db: Session = Depends(get_db)):
     """Crée un nouveau fournisseur"""
@@ -215,10 +641,77 @@ def create_supplier(data: SupplierCreateSchema, db: Session = Depends(get_db)):
     supplier = Supplier(**data.model_dump())
     db.add(supplier)
     db.commit()
+    table_versions.bump("suppliers")
     db.refresh(supplier)
     return supplier
 
 
+@router.post("/import")
+async def import_suppliers_file(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    batch_size: int = Query(5000, ge=1, le=50000),
+    db: Session = Depends(get_db)
+):
+    """
+    Import massif de fournisseurs (corps brut CSV ou NDJSON).
+
+    Crée ou met à jour les fournisseurs par external_id, ainsi que leur contact,
+    profils IMDS / PCF et métadonnées Hub. Le format est déduit du Content-Type
+    si le paramètre format est absent. Les lignes invalides sont reportées
+    une à une sans interrompre l'import.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "ndjson" if "json" in content_type else "csv"
+
+    spool = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_BYTES)
+    try:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        result = await run_in_threadpool(import_suppliers, db, stream, format, batch_size)
+    finally:
+        spool.close()
+
+    return result.to_dict()
+
+
+@router.patch("")
+def bulk_update_suppliers(data: SupplierBulkUpdateSchema, db: Session = Depends(get_db)):
+    """
+    Mise à jour groupée des fournisseurs et de leurs métadonnées Hub, en une transaction.
+
+    - items : liste de {id, changes}, modifications propres à chaque fournisseur
+    - filter + changes : mêmes modifications pour tous les fournisseurs filtrés
+
+    Seuls les champs présents dans changes sont modifiés (null efface la valeur).
+    """
+    if (data.items is None) == (data.filter is None):
+        raise HTTPException(status_code=400, detail="Fournir soit items, soit filter et changes")
+
+    if data.items is not None:
+        if not data.items:
+            raise HTTPException(status_code=400, detail="Liste items vide")
+        if len(data.items) > BULK_UPDATE_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400, detail=f"Maximum {BULK_UPDATE_MAX_ITEMS} fournisseurs par requête"
+            )
+        changes_by_id = {}
+        for item in data.items:
+            changes_by_id.setdefault(item.id, {}).update(item.changes.model_dump(exclude_unset=True))
+        return SupplierService.bulk_update(db, changes_by_id)
+
+    filters = {name: value for name, value in data.filter.model_dump().items() if value}
+    if not filters:
+        raise HTTPException(status_code=400, detail="Au moins un critère de filtre est requis")
+    changes = data.changes.model_dump(exclude_unset=True) if data.changes else {}
+    if not changes:
+        raise HTTPException(status_code=400, detail="Aucune modification fournie")
+    return SupplierService.bulk_update_where(db, filters, changes)
+
+
 @router.put("/{supplier_id}", response_model=SupplierSchema)
 def update_supplier(supplier_id: int, data: SupplierUpdateSchema, db: Session = Depends(get_db)):
     """Met à jour un fournisseur"""
@@ -231,6 +724,7 @@ def update_supplier(supplier_id: int, data: SupplierUpdateSchema, db: Session =
         setattr(supplier, key, value)
 
     db.commit()
+    table_versions.bump("suppliers")
     db.refresh(supplier)
     return supplier
 
@@ -244,6 +738,7 @@ def delete_supplier(supplier_id: int, db: Session = Depends(get_db)):
 
     db.delete(supplier)
     db.commit()
+    table_versions.bump(*SUPPLIER_CASCADE_TABLES)
     return {"message": "Fournisseur supprimé", "id": supplier_id}
 
 
@@ -0,0 +1,253 @@
+"""
+AX5-SECT Cache
+Cache de réponses en mémoire (TTL + LRU) invalidé par versions de tables
+"""
+
+import functools
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import get_db
+
+
+# ============================================================================
+# VERSIONS DE TABLES
+# ============================================================================
+
+class TableVersions:
+    """
+    Compteurs de version par table, incrémentés à chaque écriture.
+
+    Les services CRUD et les routers appellent bump() après commit : toute clé
+    de cache construite avec l'ancienne version devient inatteignable.
+    Les versions sont locales au processus ; entre workers, cached_route
+    s'appuie aussi sur les versions d'écriture de la base (table_write_versions).
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        """Incrémente la version des tables modifiées"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, *tables: str) -> Tuple[int, ...]:
+        """Retourne les versions courantes des tables demandées"""
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+
+table_versions = TableVersions()
+
+
+# ============================================================================
+# CACHE DE RÉPONSES
+# ============================================================================
+
+class ResponseCache:
+    """Cache LRU avec expiration (TTL) et compteurs hit/miss/eviction"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Retourne (trouvé, valeur) et met à jour les compteurs"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stocke une valeur et évince les entrées les moins récemment utilisées"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Retourne la valeur en cache ou la calcule (hors verrou)"""
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute()
+        self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs pour le dimensionnement du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0,
+            }
+
+
+dashboard_cache = ResponseCache(
+    max_entries=settings.dashboard_cache_max_entries,
+    ttl_seconds=settings.dashboard_cache_ttl_seconds,
+)
+
+
+def _cache_key_value(value: Any) -> Hashable:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _shared_versions(request: Optional[Request], arguments: Iterable[Any], tables: Tuple[str, ...]) -> Tuple[int, ...]:
+    """
+    Versions d'écriture de la base pour la clé de cache : celles déjà lues
+    par etag_guard pour cette requête, sinon lues sur la Session de la route
+    """
+    known = getattr(request.state, "write_versions", {}) if request is not None else {}
+    if all(table in known for table in tables):
+        return tuple(known[table] for table in tables)
+    db = next((value for value in arguments if isinstance(value, Session)), None)
+    return fetch_write_versions(db, *tables) if db is not None else ()
+
+
+def cached_route(cache: ResponseCache, *tables: str):
+    """
+    Décorateur pour les routes en lecture.
+    La clé combine le nom de la route, ses paramètres (hors Session) et les
+    versions des tables lues : versions locales (bump) et versions d'écriture
+    de la base, partagées entre workers. Une écriture d'un autre processus
+    invalide donc aussi la clé, et le corps servi correspond à l'ETag.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, request: Optional[Request] = None, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = tuple(
+                (name, _cache_key_value(value))
+                for name, value in bound.arguments.items()
+                if not isinstance(value, Session)
+            )
+            key = (
+                func.__qualname__,
+                params,
+                table_versions.get(*tables),
+                _shared_versions(request, bound.arguments.values(), tables),
+            )
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        # FastAPI injecte la Request (versions lues par etag_guard) ;
+        # les appels directs entre routes n'en passent pas
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Request),
+        ])
+        return wrapper
+
+    return decorator
+
+
+# ============================================================================
+# REQUÊTES CONDITIONNELLES (ETag)
+# ============================================================================
+
+def fetch_write_versions(db: Session, *tables: str) -> Tuple[int, ...]:
+    """Versions d'écriture partagées entre workers (migration 007), en une requête"""
+    rows = db.execute(
+        text("SELECT table_name, version FROM table_write_versions WHERE table_name = ANY(:tables)"),
+        {"tables": list(tables)},
+    ).all()
+    versions = dict(rows)
+    return tuple(versions.get(table, 0) for table in tables)
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Comparaison faible (RFC 9110) entre l'ETag courant et If-None-Match"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def etag_guard(*tables: str) -> Callable:
+    """
+    Dépendance FastAPI pour les GET conditionnels.
+
+    L'ETag combine l'URL, la date du jour (fenêtres glissantes) et les versions
+    d'écriture des tables lues. Si If-None-Match correspond, la route n'est pas
+    exécutée : la réponse est un 304 sans corps. Les versions sont lues avant
+    la requête principale et conservées dans request.state, où cached_route
+    les reprend pour sa clé : le corps renvoyé, calculé ou servi depuis le
+    cache, n'est jamais plus ancien que les versions décrites par l'ETag.
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)) -> str:
+        versions = fetch_write_versions(db, *tables)
+        request.state.write_versions = {
+            **getattr(request.state, "write_versions", {}), **dict(zip(tables, versions))
+        }
+        key = (
+            request.url.path,
+            sorted(request.query_params.multi_items()),
+            date.today().isoformat(),
+            versions,
+        )
+        etag = f'W/"{hashlib.sha1(repr(key).encode()).hexdigest()[:20]}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(etag, if_none_match):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return etag
+
+    return dependency
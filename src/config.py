@@ -5,7 +5,7 @@ Configuration centralisée pour l'application AgenticX5 Supplier Engagement Cont
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import Optional
+from typing import Dict, Optional
 import os
 
 
@@ -40,6 +40,27 @@ class Settings(BaseSettings):
     def postgres_async_url(self) -> str:
         return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
     
+    # Cache des endpoints dashboard
+    dashboard_cache_ttl_seconds: float = Field(default=30, env="DASHBOARD_CACHE_TTL_SECONDS")
+    dashboard_cache_max_entries: int = Field(default=256, env="DASHBOARD_CACHE_MAX_ENTRIES")
+
+    # Index typeahead (/search/typeahead)
+    typeahead_refresh_seconds: float = Field(default=5, env="TYPEAHEAD_REFRESH_SECONDS")
+    typeahead_max_entries: int = Field(default=500000, env="TYPEAHEAD_MAX_ENTRIES")
+
+    # Vue matérialisée v_supplier_full (intervalle de vérification / rafraîchissement)
+    supplier_view_refresh_seconds: float = Field(default=30, env="SUPPLIER_VIEW_REFRESH_SECONDS")
+
+    # Poids des facteurs de priorisation (JSON, surcharge de prioritization.DEFAULT_WEIGHTS)
+    priority_weights: Dict[str, float] = Field(default_factory=dict, env="PRIORITY_WEIGHTS")
+
+    # Relances fournisseurs (src/reminders.py)
+    reminder_interval_days: int = Field(default=7, env="REMINDER_INTERVAL_DAYS")
+    reminder_max_count: int = Field(default=3, env="REMINDER_MAX_COUNT")
+    reminder_batch_size: int = Field(default=200, env="REMINDER_BATCH_SIZE")
+    reminder_poll_seconds: float = Field(default=60, env="REMINDER_POLL_SECONDS")
+    reminder_lease_seconds: float = Field(default=900, env="REMINDER_LEASE_SECONDS")
+    
     # Neo4j (optionnel)
     neo4j_uri: Optional[str] = Field(default=None, env="NEO4J_URI")
     neo4j_user: Optional[str] = Field(default=None, env="NEO4J_USER")
@@ -5,16 +5,81 @@ Services pour les opérations CRUD sur la base de données
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import Numeric, Text, and_, exists, literal, or_, func, select, text, type_coerce
+from sqlalchemy.dialects.postgresql import array, insert
+from sqlalchemy.exc import ProgrammingError
+from psycopg2.errors import UndefinedTable
 
 from .db_models import (
     Supplier, SupplierContact, IMDSProfile, PCFProfile, SupplierHubMetadata,
     Campaign, CampaignSupplierStatus,
     IMDSSubmission, PCFObject,
     Task, Event,
-    KnowledgeDocument, KnowledgeChunk
+    KnowledgeDocument, KnowledgeChunk,
+    DashboardSnapshot
 )
+from .cache import table_versions
+
+# Tables touchées par la suppression en cascade d'un fournisseur
+SUPPLIER_CASCADE_TABLES = (
+    "suppliers", "supplier_contacts", "imds_profiles", "pcf_profiles",
+    "supplier_hub_metadata", "campaign_supplier_status", "imds_submissions", "pcf_objects"
+)
+
+# Champs modifiables par mise à jour groupée, par table
+SUPPLIER_BULK_FIELDS = (
+    "name", "parent_group", "country_code", "region", "supplier_type",
+    "supply_chain_level", "main_part_families"
+)
+HUB_BULK_FIELDS = ("priority", "regulatory_risk", "climate_risk", "program_status", "strategic_notes")
+
+# Lignes par instruction UPDATE ... FROM (VALUES ...)
+BULK_VALUES_CHUNK = 1000
+
+
+def _column_types(db: Session, table: str) -> Dict[str, str]:
+    """Types SQL réels des colonnes d'une table (catalogue PostgreSQL)"""
+    rows = db.execute(text("""
+        SELECT attname, format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 AND NOT attisdropped
+    """), {"table": table}).all()
+    return dict(rows)
+
+
+def _update_from_values(db: Session, table: str, key: str, rows: List[Dict[str, Any]]) -> int:
+    """
+    UPDATE table SET ... FROM (VALUES ...) : une instruction par groupe de
+    lignes modifiant les mêmes colonnes (et par BULK_VALUES_CHUNK lignes).
+    Chaque valeur est typée comme sa colonne cible. Retourne le nombre de
+    lignes modifiées.
+    """
+    types = _column_types(db, table)
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(k for k in row if k != key)), []).append(row)
+
+    updated = 0
+    for columns, group in groups.items():
+        names = (key,) + columns
+        assignments = ", ".join(f"{column} = v.{column}" for column in columns)
+        for start in range(0, len(group), BULK_VALUES_CHUNK):
+            chunk = group[start:start + BULK_VALUES_CHUNK]
+            params = {}
+            tuples = []
+            for i, row in enumerate(chunk):
+                placeholders = []
+                for j, name in enumerate(names):
+                    params[f"v{i}_{j}"] = row[name]
+                    placeholders.append(f"CAST(:v{i}_{j} AS {types[name]})")
+                tuples.append(f"({', '.join(placeholders)})")
+            updated += db.execute(text(f"""
+                UPDATE {table} t SET {assignments}, updated_at = NOW()
+                FROM (VALUES {", ".join(tuples)}) AS v({", ".join(names)})
+                WHERE t.{key} = v.{key}
+            """), params).rowcount
+    return updated
 
 
 # ============================================================================
@@ -30,6 +95,7 @@ class SupplierService:
         supplier = Supplier(**data)
         db.add(supplier)
         db.commit()
+        table_versions.bump("suppliers")
         db.refresh(supplier)
         return supplier
     
@@ -73,6 +139,7 @@ class SupplierService:
                 if hasattr(supplier, key):
                     setattr(supplier, key, value)
             db.commit()
+            table_versions.bump("suppliers")
             db.refresh(supplier)
         return supplier
     
@@ -83,6 +150,7 @@ class SupplierService:
         if supplier:
             db.delete(supplier)
             db.commit()
+            table_versions.bump(*SUPPLIER_CASCADE_TABLES)
             return True
         return False
     
@@ -91,12 +159,29 @@ class SupplierService:
         """Compte le nombre total de fournisseurs"""
         return db.query(func.count(Supplier.id)).scalar()
     
+    @staticmethod
+    def get_many_with_profiles(db: Session, supplier_ids: List[int]) -> List[Supplier]:
+        """
+        Charge des fournisseurs avec contacts, profils IMDS/PCF et métadonnées Hub
+        en deux requêtes, quel que soit leur nombre : jointures pour les relations
+        un-à-un, selectin pour les contacts
+        """
+        if not supplier_ids:
+            return []
+        return db.query(Supplier).options(
+            joinedload(Supplier.imds_profile),
+            joinedload(Supplier.pcf_profile),
+            joinedload(Supplier.hub_metadata),
+            selectinload(Supplier.contacts)
+        ).filter(Supplier.id.in_(supplier_ids)).all()
+
     @staticmethod
     def get_full_profile(db: Session, supplier_id: int) -> Optional[Dict[str, Any]]:
         """Récupère le profil complet d'un fournisseur (avec IMDS, PCF, contacts)"""
-        supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
-        if not supplier:
+        suppliers = SupplierService.get_many_with_profiles(db, [supplier_id])
+        if not suppliers:
             return None
+        supplier = suppliers[0]
         
         return {
             "supplier": supplier,
@@ -106,6 +191,99 @@ class SupplierService:
             "hub_metadata": supplier.hub_metadata
         }
 
+    @staticmethod
+    def bulk_update(db: Session, changes_by_id: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Applique des modifications propres à chaque fournisseur (id -> champs)
+        en une transaction : UPDATE ... FROM (VALUES ...) sur suppliers, création
+        des métadonnées Hub manquantes puis même mise à jour sur supplier_hub_metadata.
+        """
+        requested = list(changes_by_id)
+        existing = set(db.execute(
+            text("SELECT id FROM suppliers WHERE id = ANY(:ids)"), {"ids": requested}
+        ).scalars())
+
+        supplier_rows = []
+        hub_rows = []
+        for supplier_id in requested:
+            if supplier_id not in existing:
+                continue
+            changes = changes_by_id[supplier_id]
+            supplier_changes = {k: v for k, v in changes.items() if k in SUPPLIER_BULK_FIELDS}
+            hub_changes = {k: v for k, v in changes.items() if k in HUB_BULK_FIELDS}
+            if supplier_changes:
+                supplier_rows.append({"id": supplier_id, **supplier_changes})
+            if hub_changes:
+                hub_rows.append({"supplier_id": supplier_id, **hub_changes})
+
+        hub_created = SupplierService._create_missing_hub_metadata(db, [r["supplier_id"] for r in hub_rows])
+        result = {
+            "matched": len(existing),
+            "missing_ids": [i for i in requested if i not in existing],
+            "suppliers_updated": _update_from_values(db, "suppliers", "id", supplier_rows),
+            "hub_created": hub_created,
+            "hub_updated": _update_from_values(db, "supplier_hub_metadata", "supplier_id", hub_rows),
+        }
+        db.commit()
+        SupplierService._bump_bulk_versions(bool(supplier_rows), bool(hub_rows))
+        return result
+
+    @staticmethod
+    def bulk_update_where(db: Session, filters: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Applique les mêmes modifications à tous les fournisseurs correspondant
+        aux filtres (ids, country_code, region, supplier_type,
+        supply_chain_level, priority), en une transaction.
+        """
+        query = db.query(Supplier.id)
+        if filters.get("ids"):
+            query = query.filter(Supplier.id.in_(filters["ids"]))
+        for name in ("country_code", "region", "supplier_type", "supply_chain_level"):
+            if filters.get(name):
+                query = query.filter(getattr(Supplier, name) == filters[name])
+        if filters.get("priority"):
+            query = query.filter(Supplier.id.in_(
+                db.query(SupplierHubMetadata.supplier_id)
+                .filter(SupplierHubMetadata.priority == filters["priority"])
+            ))
+        # Identifiants figés avant écriture : les modifications peuvent porter
+        # sur les colonnes filtrées
+        ids = [supplier_id for supplier_id, in query.all()]
+
+        supplier_changes = {k: v for k, v in changes.items() if k in SUPPLIER_BULK_FIELDS}
+        hub_changes = {k: v for k, v in changes.items() if k in HUB_BULK_FIELDS}
+
+        result = {"matched": len(ids), "suppliers_updated": 0, "hub_created": 0, "hub_updated": 0}
+        if ids and supplier_changes:
+            result["suppliers_updated"] = db.query(Supplier).filter(Supplier.id.in_(ids)).update(
+                {**supplier_changes, "updated_at": func.now()}, synchronize_session=False
+            )
+        if ids and hub_changes:
+            result["hub_created"] = SupplierService._create_missing_hub_metadata(db, ids)
+            result["hub_updated"] = db.query(SupplierHubMetadata).filter(
+                SupplierHubMetadata.supplier_id.in_(ids)
+            ).update({**hub_changes, "updated_at": func.now()}, synchronize_session=False)
+        db.commit()
+        SupplierService._bump_bulk_versions(bool(result["suppliers_updated"]), bool(result["hub_updated"]))
+        return result
+
+    @staticmethod
+    def _create_missing_hub_metadata(db: Session, supplier_ids: List[int]) -> int:
+        """Crée les lignes supplier_hub_metadata absentes (valeurs par défaut)"""
+        if not supplier_ids:
+            return 0
+        return db.execute(text("""
+            INSERT INTO supplier_hub_metadata (supplier_id)
+            SELECT unnest(CAST(:ids AS INTEGER[]))
+            ON CONFLICT (supplier_id) DO NOTHING
+        """), {"ids": supplier_ids}).rowcount
+
+    @staticmethod
+    def _bump_bulk_versions(suppliers: bool, hub: bool) -> None:
+        tables = (("suppliers",) if suppliers else ()) + (("supplier_hub_metadata",) if hub else ())
+        if tables:
+            table_versions.bump(*tables)
+
 
 # ============================================================================
 # CAMPAIGN CRUD
@@ -120,6 +298,7 @@ class CampaignService:
         campaign = Campaign(**data)
         db.add(campaign)
         db.commit()
+        table_versions.bump("campaigns")
         db.refresh(campaign)
         return campaign
     
@@ -155,34 +334,155 @@ class CampaignService:
                 if hasattr(campaign, key):
                     setattr(campaign, key, value)
             db.commit()
+            table_versions.bump("campaigns")
             db.refresh(campaign)
         return campaign
     
     @staticmethod
-    def add_suppliers(db: Session, campaign_id: int, supplier_ids: List[int]) -> int:
-        """Ajoute des fournisseurs à une campagne"""
-        added = 0
-        for supplier_id in supplier_ids:
-            # Vérifier si le fournisseur existe
-            supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
-            if supplier:
-                # Vérifier si pas déjà dans la campagne
-                existing = db.query(CampaignSupplierStatus).filter(
-                    and_(
-                        CampaignSupplierStatus.campaign_id == campaign_id,
-                        CampaignSupplierStatus.supplier_id == supplier_id
-                    )
-                ).first()
-                if not existing:
-                    status = CampaignSupplierStatus(
-                        campaign_id=campaign_id,
-                        supplier_id=supplier_id,
-                        status="not_started"
-                    )
-                    db.add(status)
-                    added += 1
+    def with_progress(db: Session):
+        """
+        Requête groupée : (Campaign, suppliers_total, suppliers_responded, suppliers_validated)
+        Une seule requête quel que soit le nombre de campagnes (même forme que v_campaign_dashboard)
+        """
+        return db.query(
+            Campaign,
+            func.count(CampaignSupplierStatus.id).label("suppliers_total"),
+            func.count(CampaignSupplierStatus.id).filter(
+                CampaignSupplierStatus.status.in_(["submitted", "validated"])
+            ).label("suppliers_responded"),
+            func.count(CampaignSupplierStatus.id).filter(
+                CampaignSupplierStatus.status == "validated"
+            ).label("suppliers_validated"),
+        ).outerjoin(
+            CampaignSupplierStatus, CampaignSupplierStatus.campaign_id == Campaign.id
+        ).group_by(Campaign.id)
+    
+    @staticmethod
+    def add_suppliers(db: Session, campaign_id: int, supplier_ids: List[int]) -> Dict[str, Any]:
+        """
+        Inscrit des fournisseurs à une campagne en une requête ensembliste :
+        les identifiants inconnus sont ignorés (missing), ceux déjà inscrits
+        sont écartés par ON CONFLICT sur (campaign_id, supplier_id) (skipped).
+        """
+        row = db.execute(text("""
+            WITH requested AS (
+                SELECT DISTINCT unnest(CAST(:ids AS INTEGER[])) AS supplier_id
+            ), known AS (
+                SELECT r.supplier_id FROM requested r JOIN suppliers s ON s.id = r.supplier_id
+            ), inserted AS (
+                INSERT INTO campaign_supplier_status (campaign_id, supplier_id, status)
+                SELECT :campaign_id, supplier_id, 'not_started' FROM known
+                ON CONFLICT (campaign_id, supplier_id) DO NOTHING
+                RETURNING supplier_id
+            )
+            SELECT
+                (SELECT count(*) FROM inserted) AS added,
+                (SELECT count(*) FROM known) AS known,
+                ARRAY(
+                    SELECT supplier_id FROM requested
+                    EXCEPT SELECT supplier_id FROM known
+                    ORDER BY 1
+                ) AS missing_ids
+        """), {"campaign_id": campaign_id, "ids": list(supplier_ids)}).one()
         db.commit()
-        return added
+        if row.added:
+            table_versions.bump("campaign_supplier_status")
+        return {
+            "added": row.added,
+            "skipped": row.known - row.added,
+            "missing": len(row.missing_ids),
+            "missing_ids": row.missing_ids,
+        }
+    
+    @staticmethod
+    def targeting_filters(db: Session, campaign_id: int, criteria: Dict[str, Any]) -> List[Any]:
+        """
+        Conditions SQL sur les fournisseurs pour les critères de ciblage :
+        tiers, regions, country_codes, supplier_types, part_families
+        (chevauchement), match_campaign_part_families (chevauchement avec
+        Campaign.target_part_families), pcf_maturity, priority (listes de
+        valeurs acceptées), regulatory_risk_min / _max, climate_risk_min / _max
+        (bornes incluses).
+        """
+        conditions = []
+        for name, column in (
+            ("tiers", Supplier.supply_chain_level),
+            ("regions", Supplier.region),
+            ("country_codes", Supplier.country_code),
+            ("supplier_types", Supplier.supplier_type),
+        ):
+            if criteria.get(name):
+                conditions.append(column.in_(criteria[name]))
+
+        # && : servi par l'index GIN (migration 016)
+        if criteria.get("part_families"):
+            conditions.append(Supplier.main_part_families.op("&&")(array(criteria["part_families"], type_=Text)))
+        if criteria.get("match_campaign_part_families"):
+            conditions.append(Supplier.main_part_families.op("&&")(
+                select(Campaign.target_part_families).where(Campaign.id == campaign_id).scalar_subquery()
+            ))
+
+        if criteria.get("pcf_maturity"):
+            conditions.append(exists().where(
+                PCFProfile.supplier_id == Supplier.id,
+                PCFProfile.pcf_maturity.in_(criteria["pcf_maturity"])
+            ))
+
+        hub_conditions = []
+        if criteria.get("priority"):
+            hub_conditions.append(SupplierHubMetadata.priority.in_(criteria["priority"]))
+        # Risques NUMERIC(5,2) (schema.sql) comparés numériquement, sans CAST
+        for name in ("regulatory_risk", "climate_risk"):
+            risk = type_coerce(getattr(SupplierHubMetadata, name), Numeric)
+            if criteria.get(f"{name}_min") is not None:
+                hub_conditions.append(risk >= criteria[f"{name}_min"])
+            if criteria.get(f"{name}_max") is not None:
+                hub_conditions.append(risk <= criteria[f"{name}_max"])
+        if hub_conditions:
+            conditions.append(exists().where(SupplierHubMetadata.supplier_id == Supplier.id, *hub_conditions))
+
+        return conditions
+    
+    @staticmethod
+    def enroll_matching(db: Session, campaign_id: int, conditions: List[Any], dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Inscrit tous les fournisseurs satisfaisant les conditions en un
+        INSERT ... SELECT (ON CONFLICT DO NOTHING). dry_run : mêmes compteurs
+        sans écriture. Retourne matched, added (ou à ajouter), skipped (déjà
+        inscrits).
+        """
+        matched = select(Supplier.id).where(*conditions).cte("matched")
+
+        if dry_run:
+            # Jointure externe plutôt qu'un EXISTS corrélé : plan stable même
+            # si les statistiques de campaign_supplier_status sont en retard
+            row = db.execute(select(
+                func.count().label("matched"),
+                func.count(CampaignSupplierStatus.supplier_id).label("skipped")
+            ).select_from(matched).outerjoin(
+                CampaignSupplierStatus,
+                and_(
+                    CampaignSupplierStatus.campaign_id == campaign_id,
+                    CampaignSupplierStatus.supplier_id == matched.c.id
+                )
+            )).one()
+            return {"matched": row.matched, "added": row.matched - row.skipped, "skipped": row.skipped, "dry_run": True}
+
+        inserted = insert(CampaignSupplierStatus).from_select(
+            ["campaign_id", "supplier_id", "status"],
+            select(literal(campaign_id), matched.c.id, literal("not_started"))
+        ).on_conflict_do_nothing(
+            index_elements=["campaign_id", "supplier_id"]
+        ).returning(CampaignSupplierStatus.supplier_id).cte("inserted")
+
+        row = db.execute(select(
+            select(func.count()).select_from(matched).scalar_subquery().label("matched"),
+            select(func.count()).select_from(inserted).scalar_subquery().label("added")
+        )).one()
+        db.commit()
+        if row.added:
+            table_versions.bump("campaign_supplier_status")
+        return {"matched": row.matched, "added": row.added, "skipped": row.matched - row.added, "dry_run": False}
     
     @staticmethod
     def get_supplier_statuses(db: Session, campaign_id: int) -> List[CampaignSupplierStatus]:
@@ -212,6 +512,7 @@ class CampaignService:
                 css.notes = notes
             css.updated_at = datetime.utcnow()
             db.commit()
+            table_versions.bump("campaign_supplier_status")
             db.refresh(css)
         return css
     
@@ -251,6 +552,7 @@ class IMDSSubmissionService:
         submission = IMDSSubmission(**data)
         db.add(submission)
         db.commit()
+        table_versions.bump("imds_submissions")
         db.refresh(submission)
         return submission
     
@@ -289,6 +591,7 @@ class IMDSSubmissionService:
             if status == "rejected":
                 submission.iteration_count += 1
             db.commit()
+            table_versions.bump("imds_submissions")
             db.refresh(submission)
         return submission
 
@@ -300,12 +603,52 @@ class IMDSSubmissionService:
 class PCFObjectService:
     """Service CRUD pour les objets PCF"""
     
+    @staticmethod
+    def _update_monthly_rollup(
+        db: Session,
+        pcf_id: int,
+        count_delta: int = 0,
+        validated_delta: int = 0
+    ) -> None:
+        """Répercute une création / validation / rejet dans pcf_monthly_rollup (même transaction)"""
+        db.execute(text("""
+            INSERT INTO pcf_monthly_rollup (
+                month, campaign_id, supply_chain_level, region,
+                pcf_count, validated_count, collected_kgco2e, validated_kgco2e
+            )
+            SELECT
+                date_trunc('month', p.created_at)::DATE,
+                COALESCE(p.campaign_id, 0),
+                COALESCE(s.supply_chain_level, 'unknown'),
+                COALESCE(s.region, 'Unknown'),
+                :count_delta,
+                :validated_delta,
+                :count_delta * COALESCE(p.total_emissions_kgco2e, 0),
+                :validated_delta * COALESCE(p.total_emissions_kgco2e, 0)
+            FROM pcf_objects p
+            JOIN suppliers s ON s.id = p.supplier_id
+            WHERE p.id = :pcf_id AND p.created_at IS NOT NULL
+            ON CONFLICT (month, campaign_id, supply_chain_level, region) DO UPDATE SET
+                pcf_count = pcf_monthly_rollup.pcf_count + EXCLUDED.pcf_count,
+                validated_count = pcf_monthly_rollup.validated_count + EXCLUDED.validated_count,
+                collected_kgco2e = pcf_monthly_rollup.collected_kgco2e + EXCLUDED.collected_kgco2e,
+                validated_kgco2e = pcf_monthly_rollup.validated_kgco2e + EXCLUDED.validated_kgco2e,
+                updated_at = NOW()
+        """), {"pcf_id": pcf_id, "count_delta": count_delta, "validated_delta": validated_delta})
+    
     @staticmethod
     def create(db: Session, data: Dict[str, Any]) -> PCFObject:
         """Crée un nouvel objet PCF"""
         pcf = PCFObject(**data)
         db.add(pcf)
+        db.flush()
+        PCFObjectService._update_monthly_rollup(
+            db, pcf.id,
+            count_delta=1,
+            validated_delta=1 if pcf.validation_status == "validated" else 0
+        )
         db.commit()
+        table_versions.bump("pcf_objects")
         db.refresh(pcf)
         return pcf
     
@@ -327,26 +670,41 @@ class PCFObjectService:
     @staticmethod
     def validate(db: Session, pcf_id: int, notes: Optional[str] = None) -> Optional[PCFObject]:
         """Valide un objet PCF"""
-        pcf = db.query(PCFObject).filter(PCFObject.id == pcf_id).first()
+        pcf = db.query(PCFObject).filter(PCFObject.id == pcf_id).with_for_update().first()
         if pcf:
+            was_validated = pcf.validation_status == "validated"
             pcf.validation_status = "validated"
             if notes:
                 pcf.validation_notes = notes
+            if not was_validated:
+                PCFObjectService._update_monthly_rollup(db, pcf.id, validated_delta=1)
             db.commit()
+            table_versions.bump("pcf_objects")
             db.refresh(pcf)
         return pcf
     
     @staticmethod
     def reject(db: Session, pcf_id: int, reason: str) -> Optional[PCFObject]:
         """Rejette un objet PCF"""
-        pcf = db.query(PCFObject).filter(PCFObject.id == pcf_id).first()
+        pcf = db.query(PCFObject).filter(PCFObject.id == pcf_id).with_for_update().first()
         if pcf:
+            was_validated = pcf.validation_status == "validated"
             pcf.validation_status = "rejected"
             pcf.validation_notes = reason
+            if was_validated:
+                PCFObjectService._update_monthly_rollup(db, pcf.id, validated_delta=-1)
             db.commit()
+            table_versions.bump("pcf_objects")
             db.refresh(pcf)
         return pcf
     
+    @staticmethod
+    def rebuild_monthly_rollup(db: Session) -> None:
+        """Reconstruit entièrement pcf_monthly_rollup depuis pcf_objects"""
+        db.execute(text("SELECT rebuild_pcf_monthly_rollup()"))
+        db.commit()
+        table_versions.bump("pcf_monthly_rollup")
+    
     @staticmethod
     def get_total_emissions(db: Session, campaign_id: Optional[int] = None) -> float:
         """Calcule les émissions totales"""
@@ -445,3 +803,38 @@ class DashboardService:
                 )
             }
         }
+
+
+class DashboardSnapshotService:
+    """Service pour le snapshot des compteurs du dashboard (table dashboard_snapshot)"""
+    
+    @staticmethod
+    def read(db: Session) -> Optional[Dict[str, Dict[str, float]]]:
+        """
+        Lit tous les compteurs, regroupés par scope puis bucket (None si vide,
+        ou si la table n'existe pas : migration 003 non appliquée)
+        """
+        try:
+            # Savepoint : une table absente n'interrompt pas la transaction de l'appelant
+            with db.begin_nested():
+                rows = db.query(
+                    DashboardSnapshot.scope, DashboardSnapshot.bucket, DashboardSnapshot.value
+                ).all()
+        except ProgrammingError as e:
+            if not isinstance(e.orig, UndefinedTable):
+                raise
+            return None
+        if not rows:
+            return None
+        
+        counters: Dict[str, Dict[str, float]] = {}
+        for scope, bucket, value in rows:
+            counters.setdefault(scope, {})[bucket] = float(value)
+        return counters
+    
+    @staticmethod
+    def rebuild(db: Session) -> None:
+        """Reconstruit entièrement le snapshot à partir des tables sources"""
+        db.execute(text("SELECT rebuild_dashboard_snapshot()"))
+        db.commit()
+        table_versions.bump("dashboard_snapshot")
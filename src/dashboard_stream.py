@@ -0,0 +1,160 @@
+"""
+AX5-SECT Dashboard Stream
+Diffusion des changements PostgreSQL (LISTEN/NOTIFY) vers les clients SSE
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+import psycopg2
+import psycopg2.extensions
+
+from .cache import table_versions
+from .database import get_database_url
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "dashboard_changes"
+
+
+class DashboardBroadcaster:
+    """
+    Un seul listener PostgreSQL par worker, quel que soit le nombre de clients.
+
+    Un thread dédié exécute LISTEN sur une connexion hors pool, regroupe les
+    notifications reçues dans une courte fenêtre, invalide le cache local
+    (versions de tables) puis distribue chaque lot aux files asyncio des
+    clients abonnés.
+    """
+
+    def __init__(
+        self,
+        batch_window: float = 0.25,
+        queue_size: int = 100,
+        reconnect_delay: float = 5.0,
+    ):
+        self.batch_window = batch_window
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Démarre le thread listener (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="dashboard-listener", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Arrête le thread listener"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Abonnements
+    # ------------------------------------------------------------------
+
+    def subscribe(self) -> asyncio.Queue:
+        """Abonne le client courant ; à appeler depuis la boucle asyncio"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        self.start()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = {(loop, q) for loop, q in self._subscribers if q is not queue}
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, message: Dict[str, Any]) -> None:
+        """Exécuté dans la boucle du client : un client trop lent reçoit un resync"""
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"type": "resync"})
+
+    def _broadcast(self, changes: List[Dict[str, Any]]) -> None:
+        table_versions.bump(*{change["table"] for change in changes})
+
+        message = {"type": "changes", "changes": changes}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, message)
+            except RuntimeError:
+                # Boucle fermée : le client est parti
+                self.unsubscribe(queue)
+
+    # ------------------------------------------------------------------
+    # Listener
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(get_database_url())
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                logger.info("Dashboard listener connecté (canal %s)", CHANNEL)
+                self._listen(conn)
+            except Exception as e:
+                logger.error(f"Dashboard listener error: {e}")
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _listen(self, conn) -> None:
+        while not self._stop.is_set():
+            if select.select([conn], [], [], 1.0) == ([], [], []):
+                continue
+
+            # Fenêtre de regroupement : un import massif produit un seul lot
+            deadline = time.monotonic() + self.batch_window
+            changes: List[Dict[str, Any]] = []
+            while True:
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        changes.append(json.loads(notify.payload))
+                    except ValueError:
+                        logger.warning("Notification illisible ignorée : %s", notify.payload)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or select.select([conn], [], [], remaining) == ([], [], []):
+                    break
+
+            if changes:
+                self._broadcast(changes)
+
+
+broadcaster = DashboardBroadcaster()
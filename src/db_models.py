@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, Numeric, 
-    DateTime, ForeignKey, Enum, ARRAY, JSON
+    Date, DateTime, ForeignKey, Enum, ARRAY, JSON, UniqueConstraint
 )
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
@@ -180,6 +180,34 @@ class SupplierHubMetadata(Base):
     supplier = relationship("Supplier", back_populates="hub_metadata")
 
 
+class SupplierPriorityScore(Base):
+    """Scores de priorisation calculés (src/prioritization.py, migration 012)"""
+    __tablename__ = "supplier_priority_scores"
+    
+    # Table dérivée : pas de clé étrangère, jointure explicite sur suppliers
+    supplier_id = Column(Integer, primary_key=True)
+    score = Column(Numeric(5, 2), nullable=False)
+    suggested_priority = Column(String(1))  # A, B, C
+    updated_at = Column(DateTime, server_default=func.now())
+
+
+class SupplierMergeCandidate(Base):
+    """Doublons fournisseurs potentiels (src/dedup.py, migration 013)"""
+    __tablename__ = "supplier_merge_candidates"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    supplier_id_a = Column(Integer, ForeignKey("suppliers.id"), nullable=False)  # a < b
+    supplier_id_b = Column(Integer, ForeignKey("suppliers.id"), nullable=False)
+    score = Column(Numeric(4, 3), nullable=False)
+    name_similarity = Column(Numeric(4, 3), nullable=False)
+    blocking_key = Column(Text)
+    status = Column(String(20), default="pending")  # pending, merged, rejected
+    reviewed_by = Column(Text)
+    reviewed_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
 # ============================================================================
 # CAMPAIGNS
 # ============================================================================
@@ -209,6 +237,8 @@ class Campaign(Base):
 class CampaignSupplierStatus(Base):
     """Statut des fournisseurs dans une campagne"""
     __tablename__ = "campaign_supplier_status"
+    # Cible de ON CONFLICT pour l'inscription en masse (CampaignService.add_suppliers)
+    __table_args__ = (UniqueConstraint("campaign_id", "supplier_id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
@@ -268,6 +298,7 @@ class PCFObject(Base):
     uncertainty = Column(Text)
     validation_status = Column(String(20), default="pending")
     validation_notes = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relations
@@ -275,6 +306,21 @@ class PCFObject(Base):
     campaign = relationship("Campaign", back_populates="pcf_objects")
 
 
+class PCFMonthlyRollup(Base):
+    """Agrégats mensuels des émissions PCF (voir migrations/005)"""
+    __tablename__ = "pcf_monthly_rollup"
+    
+    month = Column(Date, primary_key=True)
+    campaign_id = Column(Integer, primary_key=True, default=0)
+    supply_chain_level = Column(Text, primary_key=True, default="unknown")
+    region = Column(Text, primary_key=True, default="Unknown")
+    pcf_count = Column(Integer, nullable=False, default=0)
+    validated_count = Column(Integer, nullable=False, default=0)
+    collected_kgco2e = Column(Numeric(16, 4), nullable=False, default=0)
+    validated_kgco2e = Column(Numeric(16, 4), nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
 # ============================================================================
 # TASKS & EVENTS
 # ============================================================================
@@ -285,8 +331,12 @@ class Task(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     type = Column(Text)
-    status = Column(String(20), default="pending")
+    status = Column(String(20), default="pending")  # pending, in_progress, done, failed
     payload = Column(JSON)
+    scheduled_at = Column(DateTime)
+    executed_at = Column(DateTime)
+    result = Column(JSON)
+    error = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -303,6 +353,20 @@ class Event(Base):
     created_at = Column(DateTime, server_default=func.now())
 
 
+# ============================================================================
+# DASHBOARD
+# ============================================================================
+
+class DashboardSnapshot(Base):
+    """Compteurs du dashboard maintenus par triggers (voir migrations/003)"""
+    __tablename__ = "dashboard_snapshot"
+    
+    scope = Column(String(50), primary_key=True)
+    bucket = Column(String(50), primary_key=True)
+    value = Column(Numeric(20, 4), nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now())
+
+
 # ============================================================================
 # KNOWLEDGE BASE (RAG)
 # ============================================================================
@@ -0,0 +1,378 @@
+"""
+AX5-SECT Dedup
+Détection des doublons fournisseurs : clés de blocage, similarité des noms,
+comparaisons réparties sur un pool de processus
+"""
+
+import io
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from itertools import repeat
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from .cache import table_versions
+from .db_models import Supplier
+from .typeahead import words
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "supplier_dedup_staging"
+
+# Formes juridiques ignorées dans la comparaison des noms
+LEGAL_SUFFIXES = frozenset({
+    "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "inc", "kg", "limited",
+    "llc", "ltd", "nv", "plc", "sa", "sarl", "sas", "se", "spa", "srl",
+})
+
+# Longueur du préfixe de nom utilisé comme clé de blocage
+PREFIX_LENGTH = 4
+
+# Au-delà, un bloc n'est plus comparé paire à paire : chaque fournisseur
+# n'est comparé qu'à ses WINDOW voisins dans chaque ordre de parcours du bloc
+MAX_BLOCK_SIZE = 200
+WINDOW = 20
+
+# Score minimal d'une paire candidate (0 à 1)
+DEFAULT_MIN_SCORE = 0.85
+
+# Poids du score : similarité des noms + bonus pays / groupe identiques
+NAME_WEIGHT = 0.8
+SAME_COUNTRY_BONUS = 0.1
+SAME_GROUP_BONUS = 0.1
+
+# Comparaisons par tâche envoyée au pool
+TASK_COMPARISONS = 200_000
+
+# (id, nom normalisé, nom aux mots triés, pays, groupe normalisé)
+Record = Tuple[int, str, str, Optional[str], Optional[str]]
+
+# (id_a, id_b, score, similarité des noms, clé de blocage)
+Candidate = Tuple[int, int, float, float, str]
+
+
+@dataclass
+class DedupResult:
+    """Compteurs d'une exécution du job"""
+    suppliers: int = 0
+    blocks: int = 0
+    comparisons: int = 0
+    candidates: int = 0
+    inserted: int = 0
+    updated: int = 0
+    removed: int = 0
+    workers: int = 1
+    load_ms: float = 0.0
+    compare_ms: float = 0.0
+    write_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "suppliers": self.suppliers,
+            "blocks": self.blocks,
+            "comparisons": self.comparisons,
+            "candidates": self.candidates,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "removed": self.removed,
+            "workers": self.workers,
+            "timings_ms": {
+                "load": round(self.load_ms, 1),
+                "compare": round(self.compare_ms, 1),
+                "write": round(self.write_ms, 1),
+            },
+        }
+
+
+# ============================================================================
+# NORMALISATION ET BLOCAGE
+# ============================================================================
+
+def name_key(value: Optional[str]) -> str:
+    """'Valeo S.A.' -> 'valeo' : mots normalisés sans forme juridique"""
+    # Abréviations à points (S.A., S.p.A.) : un seul mot
+    tokens = words((value or "").replace(".", ""))
+    return " ".join([token for token in tokens if token not in LEGAL_SUFFIXES] or tokens)
+
+
+def to_record(supplier_id: int, name: str, country_code: Optional[str], parent_group: Optional[str]) -> Record:
+    key = name_key(name)
+    return (
+        supplier_id,
+        key,
+        " ".join(sorted(key.split())),
+        (country_code or "").upper() or None,
+        name_key(parent_group) or None,
+    )
+
+
+def blocking_keys(record: Record) -> List[str]:
+    """
+    Blocs d'un fournisseur : même pays et même début de nom (mots dans
+    l'ordre ou triés), même pays et même fin de nom (faute de frappe dans
+    le préfixe), ou même groupe parent
+    """
+    _, key, sorted_key, country, group = record
+    compact = key.replace(" ", "")
+    country = country or "-"
+    keys = {
+        f"name:{country}:{prefix}"
+        for prefix in (compact[:PREFIX_LENGTH], sorted_key.replace(" ", "")[:PREFIX_LENGTH]) if prefix
+    }
+    if compact:
+        keys.add(f"end:{country}:{compact[-PREFIX_LENGTH:]}")
+    if group:
+        keys.add(f"group:{group}")
+    return sorted(keys)
+
+
+# Ordres de parcours des grands blocs (fenêtre glissante) par type de clé :
+# les voisins dans chaque ordre sont ceux qui partagent le plus de caractères
+_BLOCK_ORDERS = {
+    "name": (lambda r: r[1], lambda r: r[2]),
+    "end": (lambda r: r[1][::-1],),
+    "group": (lambda r: r[1],),
+}
+
+
+def build_blocks(records: List[Record]) -> List[Tuple[str, List[Record]]]:
+    """
+    Blocs d'au moins deux fournisseurs. Un grand bloc est produit une fois
+    par ordre de parcours de son type de clé.
+    """
+    blocks: Dict[str, List[Record]] = defaultdict(list)
+    for record in records:
+        for key in blocking_keys(record):
+            blocks[key].append(record)
+
+    ordered = []
+    for key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        orders = _BLOCK_ORDERS[key.split(":", 1)[0]]
+        if len(members) <= MAX_BLOCK_SIZE:
+            orders = orders[:1]
+        ordered.extend((key, sorted(members, key=order)) for order in orders)
+    return ordered
+
+
+def _block_window(size: int) -> int:
+    return size if size <= MAX_BLOCK_SIZE else WINDOW
+
+
+def _block_comparisons(size: int) -> int:
+    window = _block_window(size)
+    return sum(min(window, size - i - 1) for i in range(size))
+
+
+# ============================================================================
+# SCORE
+# ============================================================================
+
+def score_pair(
+    a: Record, b: Record, min_score: float, matcher: Optional[SequenceMatcher] = None
+) -> Optional[Tuple[float, float]]:
+    """
+    (score, similarité des noms) si la paire atteint min_score, sinon None.
+
+    Bornes supérieures d'abord (longueurs, puis caractères communs) : la
+    plupart des paires sont écartées sans calcul complet. matcher, s'il est
+    fourni, a déjà le nom de a comme seconde séquence (index réutilisé).
+    """
+    bonus = 0.0
+    if a[3] and a[3] == b[3]:
+        bonus += SAME_COUNTRY_BONUS
+    if a[4] and a[4] == b[4]:
+        bonus += SAME_GROUP_BONUS
+    needed = (min_score - bonus) / NAME_WEIGHT
+    if needed > 1.0:
+        return None
+
+    length_a, length_b = len(a[1]), len(b[1])
+    if 2.0 * min(length_a, length_b) / ((length_a + length_b) or 1) < needed:
+        return None
+
+    if matcher is None:
+        matcher = SequenceMatcher(None, b[1], a[1], autojunk=False)
+    else:
+        matcher.set_seq1(b[1])
+    if matcher.quick_ratio() < needed:
+        return None
+    similarity = matcher.ratio()
+    # Mots dans un autre ordre : 'valeo thermal' / 'thermal valeo'
+    if similarity < needed and (a[2] != a[1] or b[2] != b[1]):
+        similarity = max(similarity, SequenceMatcher(None, a[2], b[2], autojunk=False).ratio())
+    if similarity < needed:
+        return None
+    return round(min(NAME_WEIGHT * similarity + bonus, 1.0), 3), round(similarity, 3)
+
+
+def _score_blocks(blocks: List[Tuple[str, List[Record]]], min_score: float) -> Tuple[int, List[Candidate]]:
+    """
+    Tâche du pool : compare les paires de chaque bloc. Le nom de référence
+    reste la seconde séquence du SequenceMatcher pendant tout son parcours.
+    """
+    comparisons = 0
+    found = []
+    matcher = SequenceMatcher(None, autojunk=False)
+    for key, members in blocks:
+        window = _block_window(len(members))
+        for i, a in enumerate(members):
+            neighbours = members[i + 1:i + window + 1]
+            if not neighbours:
+                continue
+            comparisons += len(neighbours)
+            matcher.set_seq2(a[1])
+            for b in neighbours:
+                scored = score_pair(a, b, min_score, matcher)
+                if scored:
+                    low, high = sorted((a[0], b[0]))
+                    found.append((low, high, scored[0], scored[1], key))
+    return comparisons, found
+
+
+def _tasks(blocks: List[Tuple[str, List[Record]]]) -> Iterator[List[Tuple[str, List[Record]]]]:
+    """Regroupe les blocs en tâches d'environ TASK_COMPARISONS comparaisons"""
+    task, weight = [], 0
+    for block in sorted(blocks, key=lambda b: len(b[1]), reverse=True):
+        task.append(block)
+        weight += _block_comparisons(len(block[1]))
+        if weight >= TASK_COMPARISONS:
+            yield task
+            task, weight = [], 0
+    if task:
+        yield task
+
+
+def find_candidates(
+    records: List[Record], min_score: float = DEFAULT_MIN_SCORE, workers: int = 1
+) -> Tuple[int, int, List[Candidate]]:
+    """
+    Compare les fournisseurs bloc par bloc (en parallèle si workers > 1).
+    Retourne (blocs, comparaisons, candidats) ; une paire présente dans
+    plusieurs blocs est gardée une fois, avec son meilleur score.
+    """
+    blocks = build_blocks(records)
+    tasks = list(_tasks(blocks))
+    block_count = len({key for key, _ in blocks})
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_blocks, tasks, repeat(min_score)))
+    else:
+        results = [_score_blocks(task, min_score) for task in tasks]
+
+    comparisons = 0
+    best: Dict[Tuple[int, int], Candidate] = {}
+    for task_comparisons, found in results:
+        comparisons += task_comparisons
+        for candidate in found:
+            pair = candidate[:2]
+            if pair not in best or candidate[2] > best[pair][2]:
+                best[pair] = candidate
+    return block_count, comparisons, list(best.values())
+
+
+# ============================================================================
+# ÉCRITURE
+# ============================================================================
+
+_CANDIDATES_UPSERT = f"""
+WITH upserted AS (
+  INSERT INTO supplier_merge_candidates
+      (supplier_id_a, supplier_id_b, score, name_similarity, blocking_key)
+  SELECT st.supplier_id_a, st.supplier_id_b, st.score, st.name_similarity, st.blocking_key
+  FROM {STAGING_TABLE} st
+  JOIN suppliers sa ON sa.id = st.supplier_id_a
+  JOIN suppliers sb ON sb.id = st.supplier_id_b
+  ON CONFLICT (supplier_id_a, supplier_id_b) DO UPDATE SET
+      score = EXCLUDED.score,
+      name_similarity = EXCLUDED.name_similarity,
+      blocking_key = EXCLUDED.blocking_key,
+      updated_at = NOW()
+  WHERE supplier_merge_candidates.status = 'pending'
+    AND (supplier_merge_candidates.score, supplier_merge_candidates.name_similarity)
+        IS DISTINCT FROM (EXCLUDED.score, EXCLUDED.name_similarity)
+  RETURNING (xmax = 0) AS inserted
+)
+SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+       COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+# Paires en attente qui ne sont plus détectées (fournisseurs corrigés)
+_STALE_DELETE = f"""
+DELETE FROM supplier_merge_candidates c
+WHERE c.status = 'pending'
+  AND NOT EXISTS (
+    SELECT 1 FROM {STAGING_TABLE} st
+    WHERE st.supplier_id_a = c.supplier_id_a AND st.supplier_id_b = c.supplier_id_b
+  )
+"""
+
+
+def _write_candidates(db: Session, candidates: List[Candidate], result: DedupResult) -> None:
+    db.execute(text(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+            supplier_id_a INTEGER, supplier_id_b INTEGER,
+            score NUMERIC(4,3), name_similarity NUMERIC(4,3), blocking_key TEXT
+        ) ON COMMIT DROP
+    """))
+
+    buffer = io.StringIO()
+    # Clés de blocage : lettres, chiffres, espaces et ':' uniquement (voir words)
+    buffer.writelines("\t".join(map(str, candidate)) + "\n" for candidate in candidates)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {STAGING_TABLE} FROM STDIN WITH (FORMAT text)", buffer)
+    finally:
+        cursor.close()
+
+    counts = db.execute(text(_CANDIDATES_UPSERT)).one()
+    result.inserted = counts.inserted
+    result.updated = counts.updated
+    result.removed = db.execute(text(_STALE_DELETE)).rowcount
+
+
+def run_dedup(db: Session, min_score: float = DEFAULT_MIN_SCORE, workers: Optional[int] = None) -> DedupResult:
+    """
+    Job complet : lecture des fournisseurs, comparaison par blocs, puis
+    mise à jour de supplier_merge_candidates (migration 013) en une transaction.
+    """
+    result = DedupResult(workers=workers or os.cpu_count() or 1)
+
+    started = time.perf_counter()
+    rows = db.execute(
+        select(Supplier.id, Supplier.name, Supplier.country_code, Supplier.parent_group)
+        .execution_options(yield_per=10000)
+    )
+    records = [to_record(*row) for row in rows]
+    loaded = time.perf_counter()
+
+    result.suppliers = len(records)
+    result.blocks, result.comparisons, candidates = find_candidates(records, min_score, result.workers)
+    result.candidates = len(candidates)
+    compared = time.perf_counter()
+
+    _write_candidates(db, candidates, result)
+    db.commit()
+    if result.inserted or result.updated or result.removed:
+        table_versions.bump("supplier_merge_candidates")
+    written = time.perf_counter()
+
+    result.load_ms = (loaded - started) * 1000
+    result.compare_ms = (compared - loaded) * 1000
+    result.write_ms = (written - compared) * 1000
+    logger.info(
+        "Dedup : %s fournisseurs, %s comparaisons, %s candidats",
+        result.suppliers, result.comparisons, result.candidates
+    )
+    return result
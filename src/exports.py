@@ -0,0 +1,126 @@
+"""
+AX5-SECT Exports
+Export en flux (NDJSON / CSV) via curseurs côté serveur
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import column, literal_column, select, table
+from sqlalchemy.sql import Select
+
+from .database import get_db_session
+
+# Lignes lues par aller-retour du curseur serveur (et par bloc envoyé)
+EXPORT_BATCH_SIZE = 2000
+
+# Séparateur des listes dans une cellule CSV (identique à l'import)
+LIST_SEPARATOR = "|"
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Vue matérialisée fournisseurs + profils IMDS / PCF + métadonnées Hub
+# (migration 011), rafraîchie en arrière-plan par supplier_view
+supplier_full = table(
+    "v_supplier_full",
+    column("id"),
+    column("external_id"),
+    column("country_code"),
+    column("supplier_type"),
+    column("supply_chain_level"),
+    column("pcf_maturity"),
+    column("priority"),
+    column("regulatory_risk"),
+    column("climate_risk"),
+)
+
+
+def supplier_full_filters(
+    priority: Optional[str] = None,
+    pcf_maturity: Optional[str] = None,
+    regulatory_risk_min: Optional[float] = None,
+    regulatory_risk_max: Optional[float] = None,
+    climate_risk_min: Optional[float] = None,
+    climate_risk_max: Optional[float] = None,
+) -> List[Any]:
+    """
+    Conditions sur les colonnes de profil de la vue, sans jointure.
+    Les risques NUMERIC(5,2) sont comparés numériquement, bornes incluses.
+    """
+    conditions = []
+    if priority:
+        conditions.append(supplier_full.c.priority == priority)
+    if pcf_maturity:
+        conditions.append(supplier_full.c.pcf_maturity == pcf_maturity)
+    if regulatory_risk_min is not None:
+        conditions.append(supplier_full.c.regulatory_risk >= regulatory_risk_min)
+    if regulatory_risk_max is not None:
+        conditions.append(supplier_full.c.regulatory_risk <= regulatory_risk_max)
+    if climate_risk_min is not None:
+        conditions.append(supplier_full.c.climate_risk >= climate_risk_min)
+    if climate_risk_max is not None:
+        conditions.append(supplier_full.c.climate_risk <= climate_risk_max)
+    return conditions
+
+
+def supplier_full_query() -> Select:
+    """Toutes les colonnes de v_supplier_full, dans l'ordre des identifiants"""
+    return select(literal_column("*")).select_from(supplier_full).order_by(supplier_full.c.id)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return LIST_SEPARATOR.join(str(item) for item in value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_query(statement: Select, fmt: str) -> Iterator[str]:
+    """
+    Exécute la requête sur un curseur côté serveur et produit l'export
+    par blocs de EXPORT_BATCH_SIZE lignes : mémoire constante, premiers
+    octets envoyés dès le premier bloc.
+
+    La session est ouverte dans le générateur : elle vit aussi longtemps
+    que la réponse, indépendamment des dépendances de la requête.
+    """
+    with get_db_session() as db:
+        result = db.connection(
+            execution_options={"stream_results": True, "yield_per": EXPORT_BATCH_SIZE}
+        ).execute(statement)
+
+        keys = list(result.keys())
+        header_sent = False
+
+        for rows in result.partitions():
+            buffer = io.StringIO()
+            if fmt == "csv":
+                writer = csv.writer(buffer)
+                if not header_sent:
+                    writer.writerow(keys)
+                    header_sent = True
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(keys, row)), default=_json_default, ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+
+        if fmt == "csv" and not header_sent:
+            yield ",".join(keys) + "\r\n"
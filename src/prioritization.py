@@ -0,0 +1,328 @@
+"""
+AX5-SECT Prioritization
+Scores de priorisation des fournisseurs calculés en une passe vectorisée (NumPy)
+"""
+
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .cache import table_versions
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "supplier_priority_staging"
+CHANGES_TABLE = "supplier_priority_changes"
+
+# Facteurs de priorité, chacun ramené entre 0 et 1 (1 = fournisseur à
+# traiter en premier), et poids par défaut. Les poids peuvent être
+# surchargés par PRIORITY_WEIGHTS ou à chaque calcul.
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "late_submission": 0.20,    # 1 - imds_profiles.on_time_submission_rate
+    "oem_rejection": 0.15,      # imds_profiles.oem_rejection_rate
+    "submission_leadtime": 0.10,  # imds_profiles.avg_submission_leadtime_days
+    "pcf_maturity_gap": 0.20,   # pcf_profiles.pcf_maturity (beginner = 1)
+    "data_quality_gap": 0.10,   # 1 - pcf_profiles.data_quality_score / 100
+    "regulatory_risk": 0.15,    # supplier_hub_metadata.regulatory_risk / 100
+    "climate_risk": 0.10,       # supplier_hub_metadata.climate_risk / 100
+}
+
+# Délai moyen de soumission IMDS au-delà duquel le facteur vaut 1
+LEADTIME_REFERENCE_DAYS = 60.0
+
+# Classes suggérées : A au-dessus du 80e centile des scores, B au-dessus du 50e
+PRIORITY_QUANTILES = (("A", 0.80), ("B", 0.50))
+
+# Au-delà de cette part de scores modifiés, le job CLI (swap=True) charge
+# une nouvelle table, indexée après chargement, puis l'échange par
+# renommage. L'API met toujours à jour ligne à ligne, sans DDL : les
+# lectures de /suppliers/ranking ne sont jamais bloquées par un calcul.
+REBUILD_FRACTION = 0.3
+RANK_INDEX = "idx_supplier_priority_scores_rank"
+SWAP_TABLE = "supplier_priority_scores_new"
+
+# Risques : NUMERIC 0-100 dans database/schema.sql, libellé dans db_models
+_RISK_LABELS = "WHEN 'low' THEN 25 WHEN 'medium' THEN 50 WHEN 'high' THEN 75"
+
+_RISK_COLUMNS = ("regulatory_risk", "climate_risk")
+
+# Une ligne par fournisseur, colonnes dans l'ordre de DEFAULT_WEIGHTS
+# (valeurs brutes ; la normalisation est faite dans NumPy)
+_FACTORS_QUERY = """
+    SELECT
+        s.id,
+        ip.on_time_submission_rate,
+        ip.oem_rejection_rate,
+        ip.avg_submission_leadtime_days,
+        CASE pp.pcf_maturity WHEN 'beginner' THEN 0 WHEN 'intermediate' THEN 1 WHEN 'advanced' THEN 2 END,
+        pp.data_quality_score,
+        {regulatory_risk},
+        {climate_risk}
+    FROM suppliers s
+    LEFT JOIN imds_profiles ip ON ip.supplier_id = s.id
+    LEFT JOIN pcf_profiles pp ON pp.supplier_id = s.id
+    LEFT JOIN supplier_hub_metadata hm ON hm.supplier_id = s.id
+"""
+
+# Différence entre les scores calculés et la table : nouveaux scores,
+# scores modifiés et scores de fournisseurs supprimés (score NULL)
+_CHANGES_DDL = f"""
+    CREATE TEMP TABLE {CHANGES_TABLE} ON COMMIT DROP AS
+    SELECT
+        COALESCE(st.supplier_id, p.supplier_id) AS supplier_id,
+        st.score,
+        st.suggested_priority,
+        p.supplier_id IS NULL AS is_new
+    FROM {STAGING_TABLE} st
+    FULL JOIN supplier_priority_scores p ON p.supplier_id = st.supplier_id
+    WHERE (p.score, p.suggested_priority) IS DISTINCT FROM (st.score, st.suggested_priority)
+"""
+
+_INCREMENTAL_WRITE = [
+    f"""
+    UPDATE supplier_priority_scores p
+    SET score = c.score, suggested_priority = c.suggested_priority, updated_at = NOW()
+    FROM {CHANGES_TABLE} c
+    WHERE c.supplier_id = p.supplier_id AND c.score IS NOT NULL AND NOT c.is_new
+    """,
+    f"""
+    INSERT INTO supplier_priority_scores (supplier_id, score, suggested_priority)
+    SELECT supplier_id, score, suggested_priority FROM {CHANGES_TABLE} WHERE is_new
+    """,
+    f"""
+    DELETE FROM supplier_priority_scores p
+    USING {CHANGES_TABLE} c
+    WHERE c.supplier_id = p.supplier_id AND c.score IS NULL
+    """,
+]
+
+# Nouvelle table chargée puis indexée, sans verrou sur la table lue par l'API
+_SWAP_BUILD = [
+    f"DROP TABLE IF EXISTS {SWAP_TABLE}",
+    f"CREATE TABLE {SWAP_TABLE} (LIKE supplier_priority_scores INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+    f"""
+    INSERT INTO {SWAP_TABLE} (supplier_id, score, suggested_priority)
+    SELECT supplier_id, score, suggested_priority FROM {STAGING_TABLE}
+    """,
+    f"ALTER TABLE {SWAP_TABLE} ADD CONSTRAINT {SWAP_TABLE}_pkey PRIMARY KEY (supplier_id)",
+    f"CREATE INDEX {RANK_INDEX}_new ON {SWAP_TABLE}(score DESC, supplier_id DESC)",
+    f"""
+    CREATE TRIGGER trigger_write_version_supplier_priority_scores
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {SWAP_TABLE}
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_write_version()
+    """,
+]
+
+# Échange : seul verrou exclusif sur supplier_priority_scores, tenu jusqu'au
+# commit (quelques millisecondes) ; la version d'écriture est incrémentée
+# explicitement, aucune instruction ne déclenchant le trigger
+_SWAP_RENAME = [
+    "DROP TABLE supplier_priority_scores",
+    f"ALTER TABLE {SWAP_TABLE} RENAME TO supplier_priority_scores",
+    f"ALTER TABLE supplier_priority_scores RENAME CONSTRAINT {SWAP_TABLE}_pkey TO supplier_priority_scores_pkey",
+    f"ALTER INDEX {RANK_INDEX}_new RENAME TO {RANK_INDEX}",
+    """
+    UPDATE table_write_versions SET version = version + 1, updated_at = NOW()
+    WHERE table_name = 'supplier_priority_scores'
+    """,
+]
+
+
+def _risk_expression(db: Session, column: str) -> str:
+    """
+    Risque 0-100 selon le type réel de la colonne (les deux schémas coexistent) ;
+    en colonne texte, un libellé autre que low / medium / high est inconnu.
+    """
+    data_type = db.execute(text("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'supplier_hub_metadata' AND column_name = :column
+    """), {"column": column}).scalar()
+    if data_type == "numeric":
+        return f"hm.{column}"
+    return f"CASE hm.{column} {_RISK_LABELS} END"
+
+
+@dataclass
+class PrioritizationResult:
+    """Résumé d'un calcul de scores"""
+    suppliers: int = 0
+    updated: int = 0
+    weights: Dict[str, float] = field(default_factory=dict)
+    thresholds: Dict[str, float] = field(default_factory=dict)
+    load_ms: float = 0.0
+    compute_ms: float = 0.0
+    write_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "suppliers": self.suppliers,
+            "updated": self.updated,
+            "weights": self.weights,
+            "thresholds": self.thresholds,
+            "timings_ms": {
+                "load": round(self.load_ms, 1),
+                "compute": round(self.compute_ms, 1),
+                "write": round(self.write_ms, 1),
+            },
+        }
+
+
+def resolve_weights(overrides: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Poids par défaut, puis PRIORITY_WEIGHTS, puis surcharges de l'appel"""
+    weights = dict(DEFAULT_WEIGHTS)
+    for source in (settings.priority_weights, overrides or {}):
+        for name, value in source.items():
+            if name not in DEFAULT_WEIGHTS:
+                raise ValueError(f"Facteur de priorité inconnu : {name}")
+            if value < 0:
+                raise ValueError(f"Poids négatif pour {name}")
+            weights[name] = float(value)
+    if not any(weights.values()):
+        raise ValueError("Au moins un poids doit être strictement positif")
+    return weights
+
+
+def load_factors(db: Session) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lit les colonnes brutes de tous les fournisseurs par COPY (texte) et les
+    charge en une matrice float64 ; les valeurs absentes deviennent NaN.
+    Retourne (identifiants, matrice n x len(DEFAULT_WEIGHTS)).
+    """
+    query = _FACTORS_QUERY.format(**{column: _risk_expression(db, column) for column in _RISK_COLUMNS})
+
+    buffer = io.StringIO()
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT text, NULL 'nan')", buffer)
+    finally:
+        cursor.close()
+
+    if not buffer.tell():
+        return np.empty(0, dtype=np.int64), np.empty((0, len(DEFAULT_WEIGHTS)))
+
+    buffer.seek(0)
+    data = np.loadtxt(buffer, delimiter="\t", dtype=np.float64, ndmin=2)
+    return data[:, 0].astype(np.int64), data[:, 1:]
+
+
+def score_factors(raw: np.ndarray, weights: Dict[str, float]) -> np.ndarray:
+    """
+    Normalise chaque colonne entre 0 et 1 puis calcule la moyenne pondérée
+    par fournisseur (0 à 100). Un facteur inconnu est exclu de la moyenne
+    et les poids restants sont renormalisés ; sans aucune donnée, 50.
+    """
+    factors = np.empty_like(raw)
+    factors[:, 0] = 1.0 - raw[:, 0]
+    factors[:, 1] = raw[:, 1]
+    factors[:, 2] = raw[:, 2] / LEADTIME_REFERENCE_DAYS
+    factors[:, 3] = 1.0 - raw[:, 3] / 2.0
+    factors[:, 4] = 1.0 - raw[:, 4] / 100.0
+    factors[:, 5] = raw[:, 5] / 100.0
+    factors[:, 6] = raw[:, 6] / 100.0
+    np.clip(factors, 0.0, 1.0, out=factors)
+
+    w = np.array([weights[name] for name in DEFAULT_WEIGHTS], dtype=np.float64)
+    known = ~np.isnan(factors)
+    weighted = np.where(known, factors, 0.0) @ w
+    total = known @ w
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.where(total > 0, weighted / total, 0.5) * 100.0
+    return np.round(scores, 2)
+
+
+def suggest_priorities(scores: np.ndarray) -> Tuple[np.ndarray, Dict[str, float]]:
+    """Classe A / B / C de chaque score selon les centiles de PRIORITY_QUANTILES"""
+    classes = np.full(scores.shape, "C", dtype="<U1")
+    thresholds = {}
+    if not scores.size:
+        return classes, thresholds
+    # Du plus bas au plus haut seuil : la classe la plus haute l'emporte
+    for label, quantile in reversed(PRIORITY_QUANTILES):
+        threshold = float(np.quantile(scores, quantile))
+        classes[scores >= threshold] = label
+        thresholds[label] = round(threshold, 2)
+    return classes, thresholds
+
+
+def _write_scores(
+    db: Session, ids: np.ndarray, scores: np.ndarray, classes: np.ndarray, swap: bool = False
+) -> int:
+    """
+    COPY des scores dans une table temporaire, différence avec la table en
+    une jointure, puis écriture des seules lignes modifiées (UPDATE / INSERT /
+    DELETE). Avec swap, si elles dépassent REBUILD_FRACTION, la table est
+    remplacée par une copie chargée à part. Retourne le nombre de scores
+    modifiés ou supprimés.
+    """
+    db.execute(text(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+            supplier_id INTEGER, score NUMERIC(5,2), suggested_priority CHAR(1)
+        ) ON COMMIT DROP
+    """))
+
+    buffer = io.StringIO()
+    buffer.writelines(
+        f"{supplier_id}\t{score:.2f}\t{label}\n"
+        for supplier_id, score, label in zip(ids.tolist(), scores.tolist(), classes.tolist())
+    )
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {STAGING_TABLE} FROM STDIN WITH (FORMAT text)", buffer)
+    finally:
+        cursor.close()
+    db.execute(text(f"ANALYZE {STAGING_TABLE}"))
+
+    changed = db.execute(text(_CHANGES_DDL)).rowcount
+    if not changed:
+        return 0
+
+    rebuild = swap and changed > REBUILD_FRACTION * ids.size
+    statements = _SWAP_BUILD + _SWAP_RENAME if rebuild else _INCREMENTAL_WRITE
+    for statement in statements:
+        db.execute(text(statement))
+    return changed
+
+
+def compute_priority_scores(
+    db: Session, weights: Optional[Dict[str, float]] = None, swap: bool = False
+) -> PrioritizationResult:
+    """
+    Recalcule le score de priorité de tous les fournisseurs et l'enregistre
+    dans supplier_priority_scores (migration 012), en une transaction.
+    swap : rechargement massif par échange de table (job CLI uniquement).
+    """
+    result = PrioritizationResult(weights=resolve_weights(weights))
+
+    started = time.perf_counter()
+    ids, raw = load_factors(db)
+    loaded = time.perf_counter()
+
+    scores = score_factors(raw, result.weights)
+    classes, result.thresholds = suggest_priorities(scores)
+    computed = time.perf_counter()
+
+    result.suppliers = int(ids.size)
+    result.updated = _write_scores(db, ids, scores, classes, swap)
+    db.commit()
+    written = time.perf_counter()
+
+    if result.updated:
+        table_versions.bump("supplier_priority_scores")
+
+    result.load_ms = (loaded - started) * 1000
+    result.compute_ms = (computed - loaded) * 1000
+    result.write_ms = (written - computed) * 1000
+    logger.info(
+        "Scores de priorité : %s fournisseurs, %s modifiés", result.suppliers, result.updated
+    )
+    return result
@@ -0,0 +1,327 @@
+"""
+AX5-SECT Reminders
+Relances fournisseurs : planification ensembliste dans tasks, prise des
+tâches par les workers (FOR UPDATE SKIP LOCKED), compteurs mis à jour en masse
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .cache import table_versions
+from .config import settings
+from .database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+TASK_TYPE = "reminder"
+
+# Statuts fournisseur sans réponse, donc à relancer
+OPEN_STATUSES = ["not_started", "in_progress", "overdue"]
+
+# Lignes de campaign_supplier_status parcourues par requête de planification
+SCHEDULE_BATCH_SIZE = 5000
+
+# Un seul planificateur à la fois, tous workers confondus (verrou consultatif
+# de transaction, pris pour chaque lot)
+SCHEDULER_LOCK = "reminder_scheduler"
+
+# Relance prise par un worker :
+# {task_id, campaign_id, supplier_id, reminder (numéro), claimed_at}
+Reminder = Dict[str, Any]
+
+# Expéditeur : envoie les relances (dans la transaction de clôture) et
+# retourne les erreurs par task_id, vide si tout a été envoyé
+Sender = Callable[[Session, List[Reminder]], Dict[int, str]]
+
+
+@dataclass
+class ReminderResult:
+    """Compteurs d'un cycle de relances"""
+    enqueued: int = 0
+    claimed: int = 0
+    sent: int = 0
+    failed: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "claimed": self.claimed,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
+
+
+# ============================================================================
+# PLANIFICATION
+# ============================================================================
+
+# Fournisseurs dus (campagne active, sans réponse, sous le nombre maximal de
+# relances, dernier contact plus ancien que l'intervalle), sans relance
+# ouverte ni échec récent. Parcours par clé sur css.id, un lot par requête.
+_SCHEDULE = """
+    WITH due AS (
+        SELECT css.id, css.campaign_id, css.supplier_id, COALESCE(css.reminders_sent, 0) + 1 AS reminder
+        FROM campaign_supplier_status css
+        JOIN campaigns c ON c.id = css.campaign_id AND c.status = 'active'
+        WHERE css.id > :after
+          AND css.status = ANY(CAST(:statuses AS TEXT[]))
+          AND COALESCE(css.reminders_sent, 0) < :max_count
+          AND (css.last_contact_at IS NULL
+               OR css.last_contact_at <= NOW() - make_interval(days => :interval_days))
+        ORDER BY css.id
+        LIMIT :batch_size
+    ), inserted AS (
+        INSERT INTO tasks (type, status, payload, scheduled_at)
+        SELECT :task_type, 'pending',
+               jsonb_build_object('campaign_id', due.campaign_id, 'supplier_id', due.supplier_id,
+                                  'reminder', due.reminder),
+               NOW()
+        FROM due
+        WHERE NOT EXISTS (
+            SELECT 1 FROM tasks t
+            WHERE t.type = :task_type
+              AND (t.payload->>'campaign_id')::INTEGER = due.campaign_id
+              AND (t.payload->>'supplier_id')::INTEGER = due.supplier_id
+              AND t.status = 'failed'
+              AND t.updated_at > NOW() - make_interval(days => :interval_days)
+        )
+        ON CONFLICT (((payload->>'campaign_id')::INTEGER), ((payload->>'supplier_id')::INTEGER))
+            WHERE type = 'reminder' AND status IN ('pending', 'in_progress')
+        DO NOTHING
+        RETURNING 1
+    )
+    SELECT (SELECT max(id) FROM due) AS last_id, (SELECT count(*) FROM inserted) AS enqueued
+"""
+
+
+def schedule_reminders(db: Session) -> int:
+    """
+    Crée une tâche reminder (pending) par fournisseur dû, par lots de
+    SCHEDULE_BATCH_SIZE (une transaction par lot). L'index unique partiel de
+    la migration 017 garantit une seule relance ouverte par fournisseur et
+    campagne. Chaque lot prend le verrou consultatif dans sa transaction
+    (libéré au commit, quelle que soit la connexion du pool) ; si un autre
+    planificateur le détient, la planification s'arrête là.
+    """
+    enqueued = 0
+    after = 0
+    try:
+        while True:
+            if not db.execute(
+                text("SELECT pg_try_advisory_xact_lock(hashtext(:name))"), {"name": SCHEDULER_LOCK}
+            ).scalar():
+                db.rollback()
+                break
+            row = db.execute(text(_SCHEDULE), {
+                "after": after,
+                "statuses": OPEN_STATUSES,
+                "max_count": settings.reminder_max_count,
+                "interval_days": settings.reminder_interval_days,
+                "batch_size": SCHEDULE_BATCH_SIZE,
+                "task_type": TASK_TYPE,
+            }).one()
+            db.commit()
+            if row.last_id is None:
+                break
+            enqueued += row.enqueued
+            after = row.last_id
+    except Exception:
+        db.rollback()
+        raise
+    return enqueued
+
+
+# ============================================================================
+# PRISE ET CLÔTURE DES TÂCHES
+# ============================================================================
+
+# Tâches dues, ou en cours dont le bail a expiré (worker arrêté en cours de
+# lot). SKIP LOCKED : chaque worker prend des lignes différentes sans attendre.
+_CLAIM = """
+    WITH claimable AS (
+        SELECT id FROM tasks
+        WHERE type = :task_type
+          AND ((status = 'pending' AND scheduled_at <= NOW())
+               OR (status = 'in_progress' AND updated_at < NOW() - make_interval(secs => :lease_seconds)))
+        ORDER BY scheduled_at, id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE tasks t SET status = 'in_progress', updated_at = NOW()
+    FROM claimable
+    WHERE t.id = claimable.id
+    RETURNING t.id, t.payload, t.updated_at
+"""
+
+# Tâches encore détenues par ce worker (bail non repris entre-temps),
+# verrouillées jusqu'à la fin de la clôture
+_LOCK_OWNED = """
+    SELECT t.id FROM tasks t
+    JOIN unnest(CAST(:ids AS INTEGER[]), CAST(:claimed_at AS TIMESTAMP[])) AS c(id, claimed_at)
+      ON t.id = c.id
+    WHERE t.status = 'in_progress' AND t.updated_at = c.claimed_at
+    FOR UPDATE OF t
+"""
+
+_MARK_DONE = """
+    UPDATE tasks SET status = 'done', executed_at = NOW(), updated_at = NOW()
+    WHERE id = ANY(CAST(:ids AS INTEGER[]))
+"""
+
+_MARK_FAILED = """
+    UPDATE tasks t SET status = 'failed', error = f.error, executed_at = NOW(), updated_at = NOW()
+    FROM unnest(CAST(:ids AS INTEGER[]), CAST(:errors AS TEXT[])) AS f(id, error)
+    WHERE t.id = f.id
+"""
+
+_COUNT_SENT = """
+    UPDATE campaign_supplier_status css
+    SET reminders_sent = COALESCE(css.reminders_sent, 0) + 1, last_contact_at = NOW(), updated_at = NOW()
+    FROM unnest(CAST(:campaign_ids AS INTEGER[]), CAST(:supplier_ids AS INTEGER[])) AS r(campaign_id, supplier_id)
+    WHERE css.campaign_id = r.campaign_id AND css.supplier_id = r.supplier_id
+"""
+
+
+def claim_reminders(db: Session, batch_size: int) -> List[Reminder]:
+    """Prend jusqu'à batch_size relances (passées in_progress et validées)"""
+    rows = db.execute(text(_CLAIM), {
+        "task_type": TASK_TYPE,
+        "lease_seconds": settings.reminder_lease_seconds,
+        "batch_size": batch_size,
+    }).all()
+    db.commit()
+    return [
+        {
+            "task_id": row.id,
+            "campaign_id": int(row.payload["campaign_id"]),
+            "supplier_id": int(row.payload["supplier_id"]),
+            "reminder": int(row.payload.get("reminder", 1)),
+            "claimed_at": row.updated_at,
+        }
+        for row in rows
+    ]
+
+
+def record_reminder_events(db: Session, reminders: List[Reminder]) -> Dict[int, str]:
+    """
+    Expéditeur par défaut : une ligne REMINDER_SENT par relance dans events
+    (journal lu par l'intégration Hub / e-mail), en une requête
+    """
+    db.execute(text("""
+        INSERT INTO events (event_type, supplier_id, campaign_id, user_id, data)
+        SELECT 'REMINDER_SENT', r.supplier_id, r.campaign_id, 'reminder-worker',
+               jsonb_build_object('task_id', r.task_id, 'reminder', r.reminder)
+        FROM unnest(
+            CAST(:task_ids AS INTEGER[]), CAST(:campaign_ids AS INTEGER[]),
+            CAST(:supplier_ids AS INTEGER[]), CAST(:numbers AS INTEGER[])
+        ) AS r(task_id, campaign_id, supplier_id, reminder)
+    """), {
+        "task_ids": [r["task_id"] for r in reminders],
+        "campaign_ids": [r["campaign_id"] for r in reminders],
+        "supplier_ids": [r["supplier_id"] for r in reminders],
+        "numbers": [r["reminder"] for r in reminders],
+    })
+    return {}
+
+
+def complete_reminders(db: Session, reminders: List[Reminder], send: Sender) -> ReminderResult:
+    """
+    Envoie et clôture un lot en une transaction : verrouillage des tâches
+    encore détenues, envoi, tâches done / failed et compteurs reminders_sent /
+    last_contact_at mis à jour en masse. Une tâche reprise par un autre
+    worker (bail expiré) n'est pas envoyée une seconde fois.
+    """
+    result = ReminderResult(claimed=len(reminders))
+    owned = set(db.execute(text(_LOCK_OWNED), {
+        "ids": [r["task_id"] for r in reminders],
+        "claimed_at": [r["claimed_at"] for r in reminders],
+    }).scalars())
+    reminders = [r for r in reminders if r["task_id"] in owned]
+    if not reminders:
+        db.commit()
+        return result
+
+    errors = send(db, reminders)
+    sent = [r for r in reminders if r["task_id"] not in errors]
+    failed = [r for r in reminders if r["task_id"] in errors]
+
+    if sent:
+        db.execute(text(_MARK_DONE), {"ids": [r["task_id"] for r in sent]})
+        db.execute(text(_COUNT_SENT), {
+            "campaign_ids": [r["campaign_id"] for r in sent],
+            "supplier_ids": [r["supplier_id"] for r in sent],
+        })
+    if failed:
+        db.execute(text(_MARK_FAILED), {
+            "ids": [r["task_id"] for r in failed],
+            "errors": [errors[r["task_id"]] for r in failed],
+        })
+    db.commit()
+
+    if sent:
+        table_versions.bump("campaign_supplier_status", "events")
+    result.sent = len(sent)
+    result.failed = len(failed)
+    return result
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def run_reminders(send: Optional[Sender] = None, batch_size: Optional[int] = None) -> ReminderResult:
+    """
+    Un cycle complet : planification, puis prise et clôture des lots
+    jusqu'à épuisement des tâches dues. Plusieurs processus peuvent
+    exécuter ce cycle en parallèle.
+    """
+    send = send or record_reminder_events
+    batch_size = batch_size or settings.reminder_batch_size
+    result = ReminderResult()
+
+    with get_db_session() as db:
+        result.enqueued = schedule_reminders(db)
+
+    while True:
+        with get_db_session() as db:
+            reminders = claim_reminders(db, batch_size)
+            if not reminders:
+                break
+            batch = complete_reminders(db, reminders, send)
+        result.claimed += batch.claimed
+        result.sent += batch.sent
+        result.failed += batch.failed
+
+    return result
+
+
+class ReminderWorker:
+    """
+    Boucle de relances : un cycle toutes les poll_seconds secondes, jusqu'à
+    stop(). Lancée par python main.py reminder-worker (un processus par
+    worker) ; les tâches dues sont réparties entre les workers par SKIP LOCKED.
+    """
+
+    def __init__(self, poll_seconds: float, send: Optional[Sender] = None, batch_size: Optional[int] = None):
+        self.poll_seconds = poll_seconds
+        self.send = send
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                result = run_reminders(self.send, self.batch_size)
+                if result.enqueued or result.claimed:
+                    logger.info("Relances : %s", result.to_dict())
+            except Exception as e:
+                logger.error(f"Reminder worker error: {e}")
+            self._stop.wait(self.poll_seconds)
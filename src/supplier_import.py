@@ -0,0 +1,410 @@
+"""
+AX5-SECT Supplier Import
+Import massif de fournisseurs (CSV / NDJSON) : COPY vers une table de staging
+puis fusion par upsert sur external_id
+"""
+
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from .cache import table_versions
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "supplier_import_staging"
+
+IMPORT_TABLES = ("suppliers", "supplier_contacts", "imds_profiles", "pcf_profiles", "supplier_hub_metadata")
+
+# Champ d'import -> (table cible, colonne). Le type de chaque colonne de
+# staging est copié de la colonne cible : COPY valide les valeurs comme
+# le ferait un INSERT direct.
+IMPORT_FIELDS: Dict[str, Tuple[str, str]] = {
+    "external_id": ("suppliers", "external_id"),
+    "name": ("suppliers", "name"),
+    "parent_group": ("suppliers", "parent_group"),
+    "country_code": ("suppliers", "country_code"),
+    "region": ("suppliers", "region"),
+    "supplier_type": ("suppliers", "supplier_type"),
+    "supply_chain_level": ("suppliers", "supply_chain_level"),
+    "main_part_families": ("suppliers", "main_part_families"),
+    "contact_full_name": ("supplier_contacts", "full_name"),
+    "contact_role": ("supplier_contacts", "role"),
+    "contact_email": ("supplier_contacts", "email"),
+    "contact_phone": ("supplier_contacts", "phone"),
+    "contact_is_primary": ("supplier_contacts", "is_primary"),
+    "imds_id": ("imds_profiles", "imds_id"),
+    "imds_oems_served": ("imds_profiles", "oems_served"),
+    "imds_on_time_submission_rate": ("imds_profiles", "on_time_submission_rate"),
+    "imds_oem_rejection_rate": ("imds_profiles", "oem_rejection_rate"),
+    "imds_support_level": ("imds_profiles", "support_level"),
+    "pcf_maturity": ("pcf_profiles", "pcf_maturity"),
+    "pcf_tools_used": ("pcf_profiles", "tools_used"),
+    "pcf_count": ("pcf_profiles", "pcf_count"),
+    "pcf_scopes_covered": ("pcf_profiles", "scopes_covered"),
+    "pcf_frameworks": ("pcf_profiles", "frameworks"),
+    "pcf_data_quality_score": ("pcf_profiles", "data_quality_score"),
+    "hub_priority": ("supplier_hub_metadata", "priority"),
+    "hub_regulatory_risk": ("supplier_hub_metadata", "regulatory_risk"),
+    "hub_climate_risk": ("supplier_hub_metadata", "climate_risk"),
+    "hub_program_status": ("supplier_hub_metadata", "program_status"),
+}
+
+LIST_FIELDS = {"main_part_families", "imds_oems_served", "pcf_tools_used", "pcf_scopes_covered", "pcf_frameworks"}
+
+# Séparateur des listes dans une cellule CSV : 'chassis|interior'
+LIST_SEPARATOR = "|"
+
+# Objets imbriqués acceptés en NDJSON -> préfixe des champs à plat
+NESTED_PREFIXES = {
+    "contact": "contact_",
+    "imds_profile": "imds_",
+    "pcf_profile": "pcf_",
+    "hub_metadata": "hub_",
+}
+
+# Valeurs par défaut à la création d'un profil (colonnes NOT NULL côté API)
+INSERT_DEFAULTS = {("pcf_profiles", "pcf_count"): "0"}
+
+PROFILE_TABLES = ("imds_profiles", "pcf_profiles", "supplier_hub_metadata")
+
+MAX_REPORTED_ERRORS = 1000
+
+
+# ============================================================================
+# RÉSULTAT
+# ============================================================================
+
+@dataclass
+class ImportResult:
+    """Compteurs d'import et erreurs par ligne (liste bornée)"""
+    processed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, line: int, external_id: Optional[str], message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "external_id": external_id, "error": message})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+# ============================================================================
+# LECTURE DES ENREGISTREMENTS
+# ============================================================================
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Produit (numéro de ligne, enregistrement à plat, erreur) sans charger le fichier"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"JSON invalide : {e}"
+            continue
+        if not isinstance(value, dict):
+            yield line_number, None, "Objet JSON attendu"
+            continue
+        yield line_number, _flatten(value), None
+
+
+def _flatten(value: dict) -> dict:
+    record = {}
+    for key, item in value.items():
+        prefix = NESTED_PREFIXES.get(key)
+        if prefix and isinstance(item, dict):
+            for nested_key, nested_item in item.items():
+                name = nested_key if nested_key in IMPORT_FIELDS else prefix + nested_key
+                record[name] = nested_item
+        else:
+            record[key] = item
+    return record
+
+
+def _pg_array(values: List[Any]) -> str:
+    quoted = []
+    for value in values:
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        quoted.append(f'"{escaped}"')
+    return "{" + ",".join(quoted) + "}"
+
+
+def _prepare(record: dict) -> Tuple[Optional[str], List[Optional[str]]]:
+    """Valeurs de staging d'un enregistrement ; lève ValueError si invalide"""
+    values: Dict[str, Optional[str]] = {}
+    for name in IMPORT_FIELDS:
+        value = record.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "" or value == []:
+            values[name] = None
+        elif name in LIST_FIELDS:
+            if isinstance(value, str):
+                value = [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+            if not isinstance(value, list):
+                raise ValueError(f"{name} : liste attendue")
+            values[name] = _pg_array(value) if value else None
+        elif isinstance(value, (dict, list)):
+            raise ValueError(f"{name} : valeur scalaire attendue")
+        elif isinstance(value, bool):
+            values[name] = "true" if value else "false"
+        else:
+            values[name] = str(value)
+
+    if not values["external_id"]:
+        raise ValueError("external_id manquant")
+    if not values["name"]:
+        raise ValueError("name manquant")
+    contact_fields = [name for name in values if name.startswith("contact_") and values[name]]
+    if contact_fields and not values["contact_full_name"]:
+        raise ValueError("contact_full_name manquant")
+
+    return values["external_id"], [values[name] for name in IMPORT_FIELDS]
+
+
+# ============================================================================
+# SQL DE FUSION
+# ============================================================================
+
+def _fields_of(table: str) -> List[Tuple[str, str]]:
+    return [(name, column) for name, (target, column) in IMPORT_FIELDS.items() if target == table]
+
+
+def _staging_ddl() -> str:
+    aliases = {"suppliers": "s", "supplier_contacts": "c", "imds_profiles": "i",
+               "pcf_profiles": "p", "supplier_hub_metadata": "h"}
+    columns = ",\n  ".join(
+        f"{aliases[table]}.{column} AS {name}" for name, (table, column) in IMPORT_FIELDS.items()
+    )
+    sources = ", ".join(f"{table} {alias}" for table, alias in aliases.items())
+    return f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ON COMMIT DROP AS
+SELECT 0::INTEGER AS line,
+  {columns}
+FROM {sources}
+WITH NO DATA
+"""
+
+
+def _suppliers_upsert() -> str:
+    fields = _fields_of("suppliers")
+    columns = ", ".join(column for _, column in fields)
+    selected = ", ".join(name for name, _ in fields)
+    updates = ",\n      ".join(
+        f"{column} = EXCLUDED.{column}" if column in ("external_id", "name")
+        else f"{column} = COALESCE(EXCLUDED.{column}, suppliers.{column})"
+        for _, column in fields
+    )
+    return f"""
+WITH upserted AS (
+  INSERT INTO suppliers ({columns})
+  SELECT {selected} FROM {STAGING_TABLE}
+  ON CONFLICT (external_id) DO UPDATE SET
+      {updates},
+      updated_at = NOW()
+  RETURNING (xmax = 0) AS inserted
+)
+SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+       COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+
+def _profile_merge(table: str) -> List[str]:
+    """
+    Profil un-à-un (UNIQUE supplier_id) : mise à jour des champs fournis,
+    puis création des profils manquants avec les valeurs par défaut
+    """
+    fields = _fields_of(table)
+    any_present = " OR ".join(f"st.{name} IS NOT NULL" for name, _ in fields)
+    updates = ",\n    ".join(f"{column} = COALESCE(st.{name}, t.{column})" for name, column in fields)
+    columns = ", ".join(column for _, column in fields)
+    selected = ", ".join(
+        f"COALESCE(st.{name}, {INSERT_DEFAULTS[(table, column)]})" if (table, column) in INSERT_DEFAULTS
+        else f"st.{name}"
+        for name, column in fields
+    )
+    return [
+        f"""
+UPDATE {table} t SET
+    {updates},
+    updated_at = NOW()
+FROM {STAGING_TABLE} st
+JOIN suppliers s ON s.external_id = st.external_id
+WHERE t.supplier_id = s.id AND ({any_present})
+""",
+        f"""
+INSERT INTO {table} (supplier_id, {columns})
+SELECT s.id, {selected}
+FROM {STAGING_TABLE} st
+JOIN suppliers s ON s.external_id = st.external_id
+WHERE {any_present}
+ON CONFLICT (supplier_id) DO NOTHING
+""",
+    ]
+
+
+# Un contact est identifié par son email s'il est fourni, sinon par son nom
+_CONTACT_MATCH = """
+CASE WHEN st.contact_email IS NOT NULL
+     THEN lower(c.email) = lower(st.contact_email)
+     ELSE c.full_name = st.contact_full_name END
+"""
+
+_CONTACT_MERGE = [
+    f"""
+UPDATE supplier_contacts c SET
+    full_name = st.contact_full_name,
+    role = COALESCE(st.contact_role, c.role),
+    email = COALESCE(st.contact_email, c.email),
+    phone = COALESCE(st.contact_phone, c.phone),
+    is_primary = COALESCE(st.contact_is_primary, c.is_primary)
+FROM {STAGING_TABLE} st
+JOIN suppliers s ON s.external_id = st.external_id
+WHERE c.supplier_id = s.id AND st.contact_full_name IS NOT NULL AND {_CONTACT_MATCH}
+""",
+    f"""
+INSERT INTO supplier_contacts (supplier_id, full_name, role, email, phone, is_primary)
+SELECT s.id, st.contact_full_name, st.contact_role, st.contact_email, st.contact_phone,
+       COALESCE(st.contact_is_primary, FALSE)
+FROM {STAGING_TABLE} st
+JOIN suppliers s ON s.external_id = st.external_id
+WHERE st.contact_full_name IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM supplier_contacts c WHERE c.supplier_id = s.id AND {_CONTACT_MATCH})
+""",
+]
+
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+class SupplierImporter:
+    """
+    Import par lots de taille fixe : la mémoire ne dépend pas de la taille du fichier.
+
+    Chaque lot est copié (COPY) dans une table temporaire typée comme les
+    tables cibles et créée dans la transaction du lot, dédoublonné sur
+    external_id (la dernière ligne l'emporte), puis fusionné dans suppliers, supplier_contacts et les profils, et commité.
+    Un lot en erreur est scindé en deux sous-lots (savepoints) jusqu'à isoler
+    les lignes fautives, qui sont reportées avec le message PostgreSQL.
+    """
+
+    def __init__(self, db: Session, batch_size: int = 5000):
+        self.db = db
+        self.batch_size = batch_size
+        self.result = ImportResult()
+        self._merge_statements = [_suppliers_upsert()] + _CONTACT_MERGE + [
+            statement for table in PROFILE_TABLES for statement in _profile_merge(table)
+        ]
+
+    def run(self, stream: TextIO, fmt: str) -> ImportResult:
+        batch: List[Tuple[int, Optional[str], List[Optional[str]]]] = []
+
+        for line, record, error in iter_records(stream, fmt):
+            self.result.processed += 1
+            if error is None:
+                try:
+                    external_id, values = _prepare(record)
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                self.result.add_error(line, (record or {}).get("external_id"), error)
+                continue
+
+            batch.append((line, external_id, values))
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+
+        if batch:
+            self._flush(batch)
+
+        table_versions.bump(*IMPORT_TABLES)
+        return self.result
+
+    def _flush(self, batch: List[Tuple[int, Optional[str], List[Optional[str]]]]) -> None:
+        self._merge(batch)
+        self.db.commit()
+
+    def _merge(self, rows: List[Tuple[int, Optional[str], List[Optional[str]]]]) -> None:
+        try:
+            with self.db.begin_nested():
+                self._copy_and_merge(rows)
+        except DBAPIError as e:
+            if len(rows) == 1:
+                line, external_id, _ = rows[0]
+                self.result.add_error(line, external_id, str(e.orig).strip().split("\n")[0])
+                return
+            middle = len(rows) // 2
+            self._merge(rows[:middle])
+            self._merge(rows[middle:])
+
+    def _copy_and_merge(self, rows: List[Tuple[int, Optional[str], List[Optional[str]]]]) -> None:
+        # Table temporaire créée dans la transaction du lot (ON COMMIT DROP) :
+        # après chaque commit, la session peut reprendre une autre connexion du pool
+        self.db.execute(text(_staging_ddl()))
+        self.db.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for line, _, values in rows:
+            writer.writerow([line] + values)
+        buffer.seek(0)
+
+        columns = ", ".join(["line"] + list(IMPORT_FIELDS))
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        except psycopg2.Error as e:
+            raise DBAPIError(f"COPY {STAGING_TABLE}", None, e)
+        finally:
+            cursor.close()
+
+        duplicates = self.db.execute(text(f"""
+            DELETE FROM {STAGING_TABLE} a USING {STAGING_TABLE} b
+            WHERE a.external_id = b.external_id AND a.line < b.line
+        """)).rowcount
+
+        counts = self.db.execute(text(self._merge_statements[0])).one()
+        for statement in self._merge_statements[1:]:
+            self.db.execute(text(statement))
+
+        self.result.duplicates += duplicates
+        self.result.inserted += counts.inserted
+        self.result.updated += counts.updated
+
+
+def import_suppliers(db: Session, stream: TextIO, fmt: str, batch_size: int = 5000) -> ImportResult:
+    """Importe un flux CSV ou NDJSON de fournisseurs"""
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError(f"Format non supporté : {fmt}")
+    return SupplierImporter(db, batch_size=batch_size).run(stream, fmt)
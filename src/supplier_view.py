@@ -0,0 +1,69 @@
+"""
+AX5-SECT Supplier View
+Rafraîchissement de la vue matérialisée v_supplier_full (migration 011)
+"""
+
+import logging
+import threading
+
+from sqlalchemy import text
+
+from .cache import table_versions
+from .config import settings
+from .database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_supplier_view(force: bool = False) -> bool:
+    """
+    Rafraîchit v_supplier_full (CONCURRENTLY : les lectures ne sont pas bloquées).
+    Sans force, ne fait rien si les tables sources n'ont pas changé depuis le
+    dernier rafraîchissement ou si un autre worker rafraîchit déjà.
+    """
+    with get_db_session() as db:
+        refreshed = db.execute(
+            text("SELECT refresh_v_supplier_full(:force)"), {"force": force}
+        ).scalar()
+    if refreshed:
+        table_versions.bump("v_supplier_full")
+    return bool(refreshed)
+
+
+class SupplierViewRefresher:
+    """
+    Thread de fond : vérifie toutes les interval secondes si les tables
+    sources ont été modifiées et rafraîchit la vue le cas échéant. Les écritures
+    de profils sont donc visibles dans la vue après au plus un intervalle.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="supplier-view-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                if refresh_supplier_view():
+                    logger.info("v_supplier_full rafraîchie")
+            except Exception as e:
+                logger.error(f"Supplier view refresh error: {e}")
+
+
+supplier_view_refresher = SupplierViewRefresher(
+    interval_seconds=settings.supplier_view_refresh_seconds
+)
@@ -0,0 +1,339 @@
+"""
+AX5-SECT Typeahead
+Index en mémoire des noms de fournisseurs et de campagnes (recherche par préfixe)
+"""
+
+import bisect
+import logging
+import threading
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from .cache import fetch_write_versions
+from .config import settings
+from .database import get_db_session
+from .db_models import Campaign, Supplier
+
+logger = logging.getLogger(__name__)
+
+# Longueur maximale d'un token indexé : borne la mémoire sans nuire aux préfixes
+MAX_TOKEN_LENGTH = 32
+
+# Recouvrement du filigrane updated_at : rattrape les transactions longues
+# commitées après une lecture (now() = début de transaction)
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# Nombre maximal de tokens examinés par passe de recherche (requêtes de
+# plusieurs mots dont le premier préfixe très courant) ; les entrées sont
+# parcourues dans l'ordre du classement, la borne ne fait que tronquer la fin
+MAX_SCANNED = 50000
+
+# Au-delà, les tokens sont fusionnés par un tri plutôt qu'insérés un à un
+BULK_THRESHOLD = 64
+
+
+def normalize(value: str) -> str:
+    """Minuscules sans accents : 'Équipementier' -> 'equipementier'"""
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def words(value: str) -> List[str]:
+    """Mots normalisés d'une chaîne"""
+    return "".join(c if c.isalnum() else " " for c in normalize(value)).split()
+
+
+def tokenize(*values: Optional[str]) -> List[str]:
+    """Tokens des champs indexés (dédupliqués, tronqués)"""
+    tokens = set()
+    for value in values:
+        if not value:
+            continue
+        value_words = words(value)
+        tokens.update(word[:MAX_TOKEN_LENGTH] for word in value_words)
+        # Identifiants du type 'SUP-001' : aussi indexés d'un seul tenant
+        compact = "".join(value_words)
+        if compact:
+            tokens.add(compact[:MAX_TOKEN_LENGTH])
+    return sorted(tokens)
+
+
+@dataclass
+class TypeaheadEntry:
+    kind: str
+    id: int
+    label: str
+    detail: Optional[str]
+    tokens: Tuple[str, ...]
+    sort_label: str
+
+
+# Listes triées de (clé, id) par type d'entrée puis par longueur de libellé
+Buckets = Dict[str, Dict[int, List[Tuple[str, int]]]]
+
+
+def _add_items(buckets: Dict[int, List[Tuple[str, int]]], items: Dict[int, List[Tuple[str, int]]]) -> None:
+    for length, values in items.items():
+        bucket = buckets.setdefault(length, [])
+        if len(values) > BULK_THRESHOLD:
+            bucket.extend(values)
+            bucket.sort()
+        else:
+            for value in values:
+                bisect.insort(bucket, value)
+
+
+def _remove_items(buckets: Dict[int, List[Tuple[str, int]]], items: Dict[int, List[Tuple[str, int]]]) -> None:
+    for length, values in items.items():
+        bucket = buckets.get(length, [])
+        if len(values) > BULK_THRESHOLD:
+            dropped = set(values)
+            bucket = [value for value in bucket if value not in dropped]
+        else:
+            for value in values:
+                position = bisect.bisect_left(bucket, value)
+                if position < len(bucket) and bucket[position] == value:
+                    del bucket[position]
+        if bucket:
+            buckets[length] = bucket
+        else:
+            buckets.pop(length, None)
+
+
+class TypeaheadIndex:
+    """
+    Listes triées de (token, id) et de (libellé normalisé, id), une par type
+    d'entrée et par longueur de libellé, interrogées par bisect : une
+    recherche parcourt les candidats dans l'ordre du classement et s'arrête
+    dès que la limite est atteinte.
+
+    Construit au démarrage, puis rafraîchi par un thread de fond : à chaque
+    cycle, les versions d'écriture (migration 007) indiquent si suppliers ou
+    campaigns ont changé ; seules les lignes modifiées depuis le filigrane
+    updated_at sont relues, et les identifiants supprimés sont retirés.
+    """
+
+    SOURCES = {
+        "supplier": (Supplier, "suppliers"),
+        "campaign": (Campaign, "campaigns"),
+    }
+
+    def __init__(self, refresh_seconds: float, max_entries: int):
+        self.refresh_seconds = refresh_seconds
+        self.max_entries = max_entries
+        self._tokens: Buckets = {kind: {} for kind in self.SOURCES}
+        self._labels: Buckets = {kind: {} for kind in self.SOURCES}
+        self._entries: Dict[Tuple[str, int], TypeaheadEntry] = {}
+        self._versions: Dict[str, int] = {}
+        self._watermarks: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.ready = False
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Construit l'index puis le rafraîchit en arrière-plan (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="typeahead-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Typeahead refresh error: {e}")
+            self._stop.wait(self.refresh_seconds)
+
+    # ------------------------------------------------------------------
+    # Rafraîchissement
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _entry(kind: str, row) -> TypeaheadEntry:
+        if kind == "supplier":
+            detail = " · ".join(v for v in (row.external_id, row.parent_group) if v) or None
+            return TypeaheadEntry(
+                kind, row.id, row.name, detail,
+                tuple(tokenize(row.name, row.external_id, row.parent_group)), normalize(row.name)
+            )
+        return TypeaheadEntry(
+            kind, row.id, row.name, row.status, tuple(tokenize(row.name)), normalize(row.name)
+        )
+
+    @staticmethod
+    def _columns(kind: str):
+        if kind == "supplier":
+            return (Supplier.id, Supplier.name, Supplier.external_id, Supplier.parent_group, Supplier.updated_at)
+        return (Campaign.id, Campaign.name, Campaign.status, Campaign.updated_at)
+
+    def refresh(self) -> None:
+        """Un cycle : ne relit que les sources dont la version a changé"""
+        with get_db_session() as db:
+            tables = [table for _, table in self.SOURCES.values()]
+            versions = dict(zip(tables, fetch_write_versions(db, *tables)))
+
+            for kind, (model, table) in self.SOURCES.items():
+                if self.ready and versions[table] == self._versions.get(table):
+                    continue
+
+                query = select(*self._columns(kind)).order_by(model.updated_at.asc().nulls_first(), model.id)
+                watermark = self._watermarks.get(kind)
+                if watermark is not None:
+                    query = query.where(model.updated_at >= watermark - WATERMARK_OVERLAP)
+                rows = db.execute(query).all()
+                live_ids = set(db.execute(select(model.id)).scalars())
+
+                applied = self._apply(kind, [self._entry(kind, row) for row in rows], live_ids)
+
+                # Filigrane avancé jusqu'à la dernière ligne indexée seulement ;
+                # index plein : la version n'est pas retenue, le cycle suivant relit
+                timestamps = [row.updated_at for row in rows[:applied] if row.updated_at is not None]
+                if timestamps:
+                    self._watermarks[kind] = max(timestamps + ([watermark] if watermark else []))
+                if applied == len(rows):
+                    self._versions[table] = versions[table]
+
+        if not self.ready:
+            logger.info("Index typeahead construit : %s entrées", len(self._entries))
+        self.ready = True
+
+    @staticmethod
+    def _items(entries: Sequence[TypeaheadEntry]) -> Tuple[Dict[int, list], Dict[int, list]]:
+        """(token, id) et (libellé normalisé, id) des entrées, par longueur de libellé"""
+        tokens: Dict[int, list] = {}
+        labels: Dict[int, list] = {}
+        for entry in entries:
+            length = len(entry.label)
+            tokens.setdefault(length, []).extend((token, entry.id) for token in entry.tokens)
+            labels.setdefault(length, []).append((entry.sort_label, entry.id))
+        return tokens, labels
+
+    def _apply(self, kind: str, entries: Sequence[TypeaheadEntry], live_ids: set) -> int:
+        """Applique les entrées relues ; retourne le nombre d'entrées traitées (index plein)"""
+        with self._lock:
+            removed = [
+                self._entries.pop(key)
+                for key in [key for key in self._entries if key[0] == kind and key[1] not in live_ids]
+            ]
+            added = []
+            applied = 0
+            for entry in entries:
+                key = (entry.kind, entry.id)
+                previous = self._entries.get(key)
+                if previous is not None and (previous.tokens, previous.label) == (entry.tokens, entry.label):
+                    self._entries[key] = entry
+                    applied += 1
+                    continue
+                if previous is not None:
+                    removed.append(previous)
+                elif len(self._entries) >= self.max_entries:
+                    logger.warning("Index typeahead plein (%s entrées)", self.max_entries)
+                    break
+                self._entries[key] = entry
+                added.append(entry)
+                applied += 1
+
+            removed_tokens, removed_labels = self._items(removed)
+            _remove_items(self._tokens[kind], removed_tokens)
+            _remove_items(self._labels[kind], removed_labels)
+            added_tokens, added_labels = self._items(added)
+            _add_items(self._tokens[kind], added_tokens)
+            _add_items(self._labels[kind], added_labels)
+            return applied
+
+    # ------------------------------------------------------------------
+    # Recherche
+    # ------------------------------------------------------------------
+
+    def _ranked(
+        self, index: Buckets, prefix: str, kinds: Sequence[str], limit: int,
+        accept: Callable[[TypeaheadEntry], bool]
+    ) -> List[TypeaheadEntry]:
+        """
+        Entrées acceptées dont la clé commence par prefix, par libellé le plus
+        court puis alphabétique ; une longueur est toujours lue en entier
+        """
+        found: List[TypeaheadEntry] = []
+        scanned = 0
+        for length in sorted({length for kind in kinds for length in index[kind]}):
+            level = {}
+            for kind in kinds:
+                bucket = index[kind].get(length)
+                if not bucket:
+                    continue
+                start = bisect.bisect_left(bucket, (prefix,))
+                end = bisect.bisect_left(bucket, (prefix + "\uffff",))
+                for position in range(start, end):
+                    key = (kind, bucket[position][1])
+                    if key not in level:
+                        entry = self._entries[key]
+                        if accept(entry):
+                            level[key] = entry
+                scanned += end - start
+            found.extend(sorted(level.values(), key=lambda e: e.label))
+            if len(found) >= limit or scanned >= MAX_SCANNED:
+                break
+        return found[:limit]
+
+    def search(self, query: str, limit: int = 10, kinds: Optional[Sequence[str]] = None) -> List[dict]:
+        """
+        Entrées dont chaque mot de la requête préfixe un de leurs tokens.
+        Classement : libellé commençant par la requête, puis libellé le plus court.
+        """
+        query_words = sorted({word[:MAX_TOKEN_LENGTH] for word in words(query)})
+        if not query_words:
+            return []
+        normalized_query = normalize(query.strip())
+        kinds = [kind for kind in self.SOURCES if not kinds or kind in kinds]
+        # Le mot le plus long a la plage de tokens la plus étroite
+        anchor = max(query_words, key=len)
+        others = [word for word in query_words if word != anchor]
+
+        def matches(entry: TypeaheadEntry, required: Sequence[str]) -> bool:
+            return all(any(t.startswith(word) for t in entry.tokens) for word in required)
+
+        with self._lock:
+            # Libellés commençant par la requête, puis les autres entrées par token
+            ranked = self._ranked(self._labels, normalized_query, kinds, limit, lambda e: matches(e, query_words))
+            if len(ranked) < limit:
+                ranked += self._ranked(
+                    self._tokens, anchor, kinds, limit - len(ranked),
+                    lambda e: not e.sort_label.startswith(normalized_query) and matches(e, others)
+                )
+
+        return [
+            {"type": e.kind, "id": e.id, "label": e.label, "detail": e.detail}
+            for e in ranked
+        ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "entries": len(self._entries),
+                "tokens": sum(len(bucket) for buckets in self._tokens.values() for bucket in buckets.values()),
+                "max_entries": self.max_entries,
+            }
+
+
+typeahead_index = TypeaheadIndex(
+    refresh_seconds=settings.typeahead_refresh_seconds,
+    max_entries=settings.typeahead_max_entries,
+)
@@ -0,0 +1,123 @@
+"""
+Fixtures de test AX5-SECT
+
+Les tests tournent sur une base PostgreSQL réelle (schéma et migrations
+appliqués), désignée par TEST_DATABASE_URL ; ils sont ignorés sinon.
+"""
+
+import os
+from datetime import date
+from typing import List, Optional, Sequence
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+os.environ.setdefault("POSTGRES_PASSWORD", "test")
+
+from src import database  # noqa: E402
+from src.cache import dashboard_cache  # noqa: E402
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+# Préfixe des noms de campagnes créées par les tests (nettoyage)
+CAMPAIGN_PREFIX = "pytest-campaign-"
+
+
+class QueryCounter:
+    """Compte les requêtes SQL envoyées par le moteur (before_cursor_execute)"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements = []
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Moteur de test, avec le même pool que la production (plusieurs connexions)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL non défini")
+    engine = create_engine(TEST_DATABASE_URL, poolclass=QueuePool, pool_size=5, max_overflow=10)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except OperationalError as e:
+        pytest.skip(f"Base de test injoignable : {e}")
+
+    previous = database._engine, database._SessionLocal
+    database._engine, database._SessionLocal = engine, None
+    yield engine
+    database._engine, database._SessionLocal = previous
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = database.get_session_factory()()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def client(engine):
+    """Client HTTP de l'API (sans le lifespan : ni graphe ni tâches de fond)"""
+    from fastapi.testclient import TestClient
+    from src.api import app
+
+    dashboard_cache.clear()
+    return TestClient(app)
+
+
+@pytest.fixture
+def query_counter(engine):
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def make_campaigns(engine):
+    """
+    Crée des campagnes de test, chacune avec des fournisseurs inscrits
+    (statuts variés), supprimées en fin de test
+    """
+    def make(
+        count: int, status: str = "active", suppliers: int = 3,
+        end_dates: Optional[Sequence[Optional[date]]] = None
+    ) -> List[int]:
+        end_dates = list(end_dates or [None] * count)
+        with engine.begin() as conn:
+            ids = conn.execute(text("""
+                INSERT INTO campaigns (name, type, status, end_date)
+                SELECT :prefix || n, 'PCF', :status, (CAST(:end_dates AS DATE[]))[n]
+                FROM generate_series(1, :count) AS n
+                ORDER BY n
+                RETURNING id
+            """), {"prefix": CAMPAIGN_PREFIX, "status": status, "count": count, "end_dates": end_dates}).scalars().all()
+            conn.execute(text("""
+                INSERT INTO campaign_supplier_status (campaign_id, supplier_id, status)
+                SELECT c.id, s.id, (ARRAY['not_started', 'submitted', 'validated'])[1 + s.n % 3]
+                FROM unnest(CAST(:ids AS INTEGER[])) AS c(id)
+                CROSS JOIN (
+                    SELECT id, row_number() OVER (ORDER BY id) AS n FROM suppliers ORDER BY id LIMIT :suppliers
+                ) AS s
+            """), {"ids": ids, "suppliers": suppliers})
+        return sorted(ids)
+
+    yield make
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM campaigns WHERE name LIKE :prefix"), {"prefix": CAMPAIGN_PREFIX + "%"})
@@ -0,0 +1,138 @@
+"""GET /campaigns : statistiques en une requête, tri et pagination par clé"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+END_DATES = [
+    date(2026, 3, 31), None, date(2026, 1, 31), date(2026, 3, 31),
+    None, date(2026, 1, 31), date(2026, 6, 30),
+]
+
+
+def _pages(client, **params):
+    """Toutes les pages en pagination par clé ; retourne les éléments et le nombre de pages"""
+    items, cursor, pages = [], None, 0
+    while True:
+        query = {**params, "paginate": "cursor", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/campaigns", params=query)
+        assert response.status_code == 200
+        body = response.json()
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+def test_list_query_count_does_not_grow_with_campaigns(client, make_campaigns, query_counter):
+    make_campaigns(2, status="completed")
+    query_counter.reset()
+    first = client.get("/campaigns", params={"status": "completed", "limit": 500})
+    queries = query_counter.count
+
+    make_campaigns(30, status="completed")
+    query_counter.reset()
+    second = client.get("/campaigns", params={"status": "completed", "limit": 500})
+
+    assert len(second.json()) == len(first.json()) + 30
+    assert query_counter.count == queries
+
+
+def test_list_returns_supplier_stats(client, make_campaigns):
+    campaign_id, = make_campaigns(1, suppliers=3)
+
+    items = {item["id"]: item for item in client.get("/campaigns", params={"limit": 500}).json()}
+
+    # Statuts not_started, submitted, validated (voir make_campaigns)
+    assert items[campaign_id]["suppliers_total"] == 3
+    assert items[campaign_id]["suppliers_responded"] == 2
+    assert items[campaign_id]["suppliers_validated"] == 1
+    assert items[campaign_id]["progress"] == 66.7
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pages_follow_end_date_with_nulls_last(client, make_campaigns, order):
+    ids = make_campaigns(len(END_DATES), status="completed", end_dates=END_DATES)
+    by_id = dict(zip(ids, END_DATES))
+    dated = sorted((i for i in ids if by_id[i]), key=lambda i: (by_id[i], i), reverse=order == "desc")
+    undated = sorted((i for i in ids if by_id[i] is None), reverse=order == "desc")
+
+    items, pages = _pages(client, status="completed", sort="end_date", order=order, limit=2)
+
+    seen = [item["id"] for item in items]
+    assert len(seen) == len(set(seen))
+    assert [i for i in seen if i in by_id] == dated + undated
+    assert pages > 1
+
+
+def test_cursor_pages_by_name(client, make_campaigns):
+    ids = make_campaigns(5, status="completed")
+
+    items, _ = _pages(client, status="completed", sort="name", order="asc", limit=2)
+
+    ours = [item for item in items if item["id"] in ids]
+    assert [item["name"] for item in ours] == sorted(item["name"] for item in ours)
+    assert len(ours) == 5
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/campaigns", params={"paginate": "cursor", "cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def risk_suppliers(engine):
+    """Fournisseurs de test (pays ZZ) avec risques réglementaire / climat numériques"""
+    with engine.begin() as conn:
+        ids = conn.execute(text("""
+            INSERT INTO suppliers (external_id, name, country_code)
+            SELECT 'pytest-risk-' || n, 'Pytest Risk ' || n, 'ZZ' FROM generate_series(1, 3) AS n
+            RETURNING id
+        """)).scalars().all()
+        conn.execute(text("""
+            INSERT INTO supplier_hub_metadata (supplier_id, regulatory_risk, climate_risk)
+            SELECT id, (ARRAY[10, 50, 80])[n], (ARRAY[5.5, 20, 90])[n]
+            FROM unnest(CAST(:ids AS INTEGER[])) WITH ORDINALITY AS s(id, n)
+        """), {"ids": sorted(ids)})
+    yield sorted(ids)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM suppliers WHERE external_id LIKE 'pytest-risk-%'"))
+
+
+@pytest.mark.parametrize("criteria, matched", [
+    ({"regulatory_risk_min": 10, "regulatory_risk_max": 50}, 2),
+    ({"regulatory_risk_min": 50.01}, 1),
+    ({"climate_risk_max": 5.5}, 1),
+    ({"regulatory_risk_min": 10, "climate_risk_min": 20}, 2),
+])
+def test_targeting_compares_risks_numerically(client, make_campaigns, risk_suppliers, criteria, matched):
+    campaign_id, = make_campaigns(1, status="draft", suppliers=0)
+
+    response = client.post(f"/campaigns/{campaign_id}/targeting", json={
+        "country_codes": ["ZZ"], "dry_run": True, **criteria
+    })
+
+    assert response.status_code == 200
+    assert response.json()["matched"] == matched
+
+
+def test_targeting_enrolls_matching_suppliers(client, make_campaigns, risk_suppliers):
+    campaign_id, = make_campaigns(1, status="draft", suppliers=0)
+    criteria = {"country_codes": ["ZZ"], "regulatory_risk_max": 50}
+
+    first = client.post(f"/campaigns/{campaign_id}/targeting", json=criteria).json()
+    second = client.post(f"/campaigns/{campaign_id}/targeting", json=criteria).json()
+
+    assert (first["added"], first["skipped"]) == (2, 0)
+    assert (second["added"], second["skipped"]) == (0, 2)
+
+
+def test_targeting_rejects_risk_labels(client, make_campaigns):
+    campaign_id, = make_campaigns(1, status="draft", suppliers=0)
+
+    response = client.post(f"/campaigns/{campaign_id}/targeting", json={"regulatory_risk_min": "high"})
+
+    assert response.status_code == 422
@@ -0,0 +1,132 @@
+"""Endpoints dashboard : nombre de requêtes SQL par appel, fil d'activité"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from src.api_dashboard import _stats_statement, get_dashboard_stats
+from src.cache import dashboard_cache
+from src.crud import DashboardSnapshotService, PCFObjectService
+
+
+def test_overview_query_count_does_not_grow_with_campaigns(client, make_campaigns, query_counter):
+    make_campaigns(2)
+    query_counter.reset()
+    first = client.get("/dashboard/overview")
+    queries = query_counter.count
+
+    make_campaigns(20)
+    query_counter.reset()
+    second = client.get("/dashboard/overview")
+
+    assert first.status_code == second.status_code == 200
+    assert len(second.json()["active_campaigns"]) == len(first.json()["active_campaigns"]) + 20
+    assert query_counter.count == queries
+
+
+def test_stats_without_snapshot_is_one_aggregate_statement(client, query_counter, monkeypatch):
+    # Snapshot non initialisé : repli sur la requête agrégée unique
+    monkeypatch.setattr(DashboardSnapshotService, "read", staticmethod(lambda db: None))
+
+    response = client.get("/dashboard/stats")
+
+    assert response.status_code == 200
+    queries = [s for s in query_counter.statements if "table_write_versions" not in s]
+    assert len(queries) == 1
+
+
+ACTIVITY_TIMESTAMP = datetime(2100, 1, 1)
+
+
+@pytest.fixture
+def activity_events(engine):
+    """Événements de test au même horodatage, en tête du fil d'activité"""
+    with engine.begin() as conn:
+        ids = conn.execute(text("""
+            INSERT INTO events (event_type, user_id, created_at)
+            SELECT 'PYTEST_ACTIVITY', 'pytest', :timestamp FROM generate_series(1, 5)
+            RETURNING id
+        """), {"timestamp": ACTIVITY_TIMESTAMP}).scalars().all()
+    yield ids
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM events WHERE event_type = 'PYTEST_ACTIVITY'"))
+
+
+def test_activity_is_one_union_all_query(client, query_counter):
+    response = client.get("/dashboard/activity", params={"limit": 20})
+
+    assert response.status_code == 200
+    feed_queries = [s for s in query_counter.statements if "table_write_versions" not in s]
+    assert len(feed_queries) == 1
+    assert "UNION ALL" in feed_queries[0]
+
+
+def test_activity_cursor_pages_across_equal_timestamps(client, engine, make_campaigns, activity_events):
+    campaign_id, = make_campaigns(1, suppliers=3)
+    with engine.begin() as conn:
+        status_ids = conn.execute(text("""
+            UPDATE campaign_supplier_status SET updated_at = :timestamp
+            WHERE campaign_id = :campaign_id
+            RETURNING id
+        """), {"timestamp": ACTIVITY_TIMESTAMP, "campaign_id": campaign_id}).scalars().all()
+    # Même horodatage : statuts de campagne avant événements, puis id décroissant
+    expected = (
+        [("campaign_status", i) for i in sorted(status_ids, reverse=True)]
+        + [("event", i) for i in sorted(activity_events, reverse=True)]
+    )
+
+    seen, cursor = [], None
+    while len(seen) < len(expected):
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/dashboard/activity", params=params).json()
+        seen.extend((item["type"], item["id"]) for item in body["items"])
+        cursor = body["next_cursor"]
+
+    assert seen[:len(expected)] == expected
+
+
+def test_rollup_rebuild_changes_trend_etag(client, db):
+    etag = client.get("/dashboard/emissions/trend").headers["ETag"]
+
+    PCFObjectService.rebuild_monthly_rollup(db)
+    response = client.get("/dashboard/emissions/trend", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_rollup_rebuild_changes_bundle_etag(client, db):
+    etag = client.get("/dashboard/bundle").headers["ETag"]
+
+    PCFObjectService.rebuild_monthly_rollup(db)
+    response = client.get("/dashboard/bundle", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_snapshot_rebuild_refreshes_stats(client, engine, db):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE dashboard_snapshot SET value = value + 1000 WHERE scope = 'suppliers' AND bucket = 'tier1'"))
+    skewed = client.get("/dashboard/stats")
+
+    DashboardSnapshotService.rebuild(db)
+    response = client.get("/dashboard/stats", headers={"If-None-Match": skewed.headers["ETag"]})
+
+    assert response.status_code == 200
+    total = db.execute(text("SELECT count(*) FROM suppliers")).scalar()
+    assert response.json()["suppliers"]["total"] == total
+
+
+def test_stats_fall_back_when_snapshot_table_is_missing(db):
+    expected = dict(db.execute(_stats_statement()).one()._mapping)
+    # DDL transactionnelle : annulée par le rollback de la fixture db
+    db.execute(text("ALTER TABLE dashboard_snapshot RENAME TO dashboard_snapshot_missing"))
+    dashboard_cache.clear()
+
+    assert DashboardSnapshotService.read(db) is None
+    stats = get_dashboard_stats(db)
+
+    assert stats["suppliers"]["total"] == expected["suppliers_total"]
+    assert stats["campaigns"]["total"] == expected["campaigns_total"]
@@ -0,0 +1,36 @@
+"""GET /dashboard/bundle : sections en parallèle et connexions du pool"""
+
+import threading
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def checked_out(engine):
+    """Nombre maximal de connexions du pool prises en même temps"""
+    lock = threading.Lock()
+    state = {"current": 0, "max": 0}
+
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        with lock:
+            state["current"] += 1
+            state["max"] = max(state["max"], state["current"])
+
+    def checkin(dbapi_connection, connection_record):
+        with lock:
+            state["current"] -= 1
+
+    event.listen(engine, "checkout", checkout)
+    event.listen(engine, "checkin", checkin)
+    yield state
+    event.remove(engine, "checkout", checkout)
+    event.remove(engine, "checkin", checkin)
+
+
+def test_bundle_uses_at_most_four_connections(client, checked_out):
+    response = client.get("/dashboard/bundle")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"stats", "overview", "kpis", "activity", "emissions_trend"}
+    assert checked_out["max"] <= 4
@@ -0,0 +1,38 @@
+"""Cache des routes dashboard et ETag (cached_route, etag_guard)"""
+
+import pytest
+from sqlalchemy import text
+
+PREFIX = "pytest-cache-"
+
+
+@pytest.fixture
+def cleanup(engine):
+    yield
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM suppliers WHERE external_id LIKE :prefix"), {"prefix": PREFIX + "%"})
+
+
+def test_write_from_another_process_refreshes_cached_body(client, engine, cleanup):
+    first = client.get("/dashboard/stats")
+    assert client.get("/dashboard/stats").json() == first.json()
+
+    # Écriture hors de ce processus : aucun bump() local, seules les versions
+    # d'écriture de la base changent
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO suppliers (external_id, name) VALUES (:external_id, 'Pytest Cache')"),
+            {"external_id": PREFIX + "1"},
+        )
+
+    second = client.get("/dashboard/stats")
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.json()["suppliers"]["total"] == first.json()["suppliers"]["total"] + 1
+
+
+def test_matching_etag_returns_304(client):
+    etag = client.get("/dashboard/stats").headers["ETag"]
+
+    response = client.get("/dashboard/stats", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
@@ -0,0 +1,90 @@
+"""Détection des doublons fournisseurs (run_dedup)"""
+
+import pytest
+from sqlalchemy import text
+
+from src.dedup import find_candidates, name_key, run_dedup, score_pair, to_record
+
+PREFIX = "pytest-dedup-"
+
+# (nom, pays) : 1 et 2 sont un doublon évident, 3 et 4 n'ont rien en commun
+SUPPLIERS = [
+    ("Valeo Thermal Systems GmbH", "DE"),
+    ("Valeo Thermal Systems", "DE"),
+    ("Brembo Brake Components", "IT"),
+    ("Autoliv Safety Restraints", "SE"),
+]
+
+
+@pytest.fixture
+def dedup_suppliers(engine):
+    with engine.begin() as conn:
+        ids = conn.execute(text("""
+            INSERT INTO suppliers (external_id, name, country_code)
+            SELECT :prefix || n, (CAST(:names AS TEXT[]))[n], (CAST(:countries AS TEXT[]))[n]
+            FROM generate_series(1, :count) AS n
+            ORDER BY n
+            RETURNING id
+        """), {
+            "prefix": PREFIX,
+            "names": [name for name, _ in SUPPLIERS],
+            "countries": [country for _, country in SUPPLIERS],
+            "count": len(SUPPLIERS),
+        }).scalars().all()
+    yield sorted(ids)
+    # ON DELETE CASCADE : retire aussi les paires des fournisseurs de test
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM suppliers WHERE external_id LIKE :prefix"), {"prefix": PREFIX + "%"})
+
+
+def _candidates(db, ids):
+    rows = db.execute(text("""
+        SELECT supplier_id_a, supplier_id_b, status FROM supplier_merge_candidates
+        WHERE supplier_id_a = ANY(:ids) OR supplier_id_b = ANY(:ids)
+    """), {"ids": ids}).all()
+    return {(a, b): status for a, b, status in rows}
+
+
+def test_name_key_drops_legal_suffixes():
+    assert name_key("Valeo S.A.") == "valeo"
+    assert name_key("Brembo S.p.A.") == "brembo"
+    assert name_key("GmbH") == "gmbh"
+
+
+def test_score_pair_tolerates_reordered_words():
+    a = to_record(1, "Valeo Thermal", "FR", None)
+    b = to_record(2, "Thermal Valeo SAS", "FR", None)
+
+    assert score_pair(a, b, 0.85) is not None
+    assert score_pair(a, to_record(3, "Brembo", "FR", None), 0.85) is None
+
+
+def test_find_candidates_keeps_each_pair_once():
+    records = [to_record(i, name, country, None) for i, (name, country) in enumerate(SUPPLIERS, 1)]
+
+    _, comparisons, candidates = find_candidates(records)
+
+    assert [candidate[:2] for candidate in candidates] == [(1, 2)]
+    assert comparisons >= 1
+
+
+def test_run_dedup_finds_duplicate_and_removes_stale_candidates(db, dedup_suppliers):
+    valeo, valeo_short, brembo, autoliv = dedup_suppliers
+    # Paire en attente devenue obsolète, et paire déjà rejetée par un relecteur
+    db.execute(text("""
+        INSERT INTO supplier_merge_candidates (supplier_id_a, supplier_id_b, score, name_similarity, status)
+        VALUES (:brembo, :autoliv, 0.9, 0.9, 'pending'), (:valeo, :brembo, 0.9, 0.9, 'rejected')
+    """), {"valeo": valeo, "brembo": brembo, "autoliv": autoliv})
+    db.commit()
+
+    result = run_dedup(db, workers=1)
+
+    assert result.removed >= 1
+    assert _candidates(db, dedup_suppliers) == {
+        (valeo, valeo_short): "pending",
+        (valeo, brembo): "rejected",
+    }
+
+    again = run_dedup(db, workers=1)
+
+    assert (again.inserted, again.updated, again.removed) == (0, 0, 0)
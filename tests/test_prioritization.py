@@ -0,0 +1,124 @@
+"""Scores de priorisation (compute_priority_scores)"""
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src import prioritization
+from src.prioritization import (
+    DEFAULT_WEIGHTS, RANK_INDEX, _write_scores, compute_priority_scores, load_factors,
+    resolve_weights, score_factors, suggest_priorities
+)
+
+DDL = ("TRUNCATE", "DROP", "CREATE INDEX", "ALTER", "CREATE TABLE")
+
+
+def _scores(db):
+    return dict(db.execute(text("SELECT supplier_id, score FROM supplier_priority_scores")).all())
+
+
+def _computed(db):
+    ids, raw = load_factors(db)
+    scores = score_factors(raw, resolve_weights())
+    classes, _ = suggest_priorities(scores)
+    return ids, scores, classes
+
+
+def test_score_factors_weighted_mean_skips_unknown_factors():
+    raw = np.full((2, len(DEFAULT_WEIGHTS)), np.nan)
+    raw[0] = [1.0, 0.0, 0.0, 2.0, 100.0, 0.0, 0.0]   # fournisseur exemplaire
+    raw[1, 5] = 80.0                                  # seul le risque réglementaire est connu
+
+    scores = score_factors(raw, DEFAULT_WEIGHTS)
+
+    assert scores.tolist() == [0.0, 80.0]
+
+
+def test_score_factors_without_data_is_neutral():
+    raw = np.full((1, len(DEFAULT_WEIGHTS)), np.nan)
+
+    assert score_factors(raw, DEFAULT_WEIGHTS).tolist() == [50.0]
+
+
+def test_suggest_priorities_by_quantile():
+    classes, thresholds = suggest_priorities(np.arange(10, dtype=np.float64))
+
+    assert "".join(classes) == "CCCCCBBBAA"
+    assert thresholds == {"B": 4.5, "A": 7.2}
+
+
+@pytest.mark.parametrize("overrides", [{"unknown": 1.0}, {"oem_rejection": -1.0}, dict.fromkeys(DEFAULT_WEIGHTS, 0.0)])
+def test_resolve_weights_rejects_invalid_overrides(overrides):
+    with pytest.raises(ValueError):
+        resolve_weights(overrides)
+
+
+def test_compute_scores_every_supplier_then_is_idempotent(db):
+    first = compute_priority_scores(db)
+    second = compute_priority_scores(db)
+
+    suppliers = db.execute(text("SELECT count(*) FROM suppliers")).scalar()
+    assert first.suppliers == second.suppliers == suppliers
+    assert len(_scores(db)) == suppliers
+    assert second.updated == 0
+
+
+def test_compute_updates_only_changed_scores(db, query_counter):
+    compute_priority_scores(db)
+    supplier_id = db.execute(text("SELECT min(supplier_id) FROM supplier_priority_scores")).scalar()
+    db.execute(text("UPDATE supplier_priority_scores SET score = 0 WHERE supplier_id = :id"), {"id": supplier_id})
+    db.execute(text("DELETE FROM supplier_priority_scores WHERE supplier_id <> :id"), {"id": supplier_id})
+    db.commit()
+    query_counter.reset()
+
+    result = compute_priority_scores(db)
+
+    assert result.updated == result.suppliers
+    assert not [s for s in query_counter.statements if s.lstrip().upper().startswith(DDL)]
+    assert _scores(db)[supplier_id] > 0
+
+
+def test_bulk_write_does_not_block_ranking_readers(engine, db):
+    ids, scores, classes = _computed(db)
+    db.execute(text("DELETE FROM supplier_priority_scores"))
+
+    changed = _write_scores(db, ids, scores, classes)
+    try:
+        with engine.connect() as reader:
+            reader.execute(text("SET lock_timeout = '200ms'"))
+            reader.execute(text("SELECT count(*) FROM supplier_priority_scores")).scalar()
+    except OperationalError as e:
+        pytest.fail(f"Lecture bloquée par l'écriture des scores : {e}")
+    finally:
+        db.rollback()
+
+    assert changed == ids.size
+
+
+def test_cli_swap_replaces_table_with_index_and_trigger(engine, db, monkeypatch):
+    monkeypatch.setattr(prioritization, "REBUILD_FRACTION", 0.0)
+    db.execute(text("UPDATE supplier_priority_scores SET score = 0"))
+    db.commit()
+    version = db.execute(text(
+        "SELECT version FROM table_write_versions WHERE table_name = 'supplier_priority_scores'"
+    )).scalar()
+
+    result = compute_priority_scores(db, swap=True)
+
+    assert result.updated == result.suppliers
+    assert len(_scores(db)) == result.suppliers
+    assert db.execute(text("""
+        SELECT count(*) FROM pg_indexes
+        WHERE tablename = 'supplier_priority_scores' AND indexname IN (:rank, 'supplier_priority_scores_pkey')
+    """), {"rank": RANK_INDEX}).scalar() == 2
+    assert db.execute(text(
+        "SELECT version FROM table_write_versions WHERE table_name = 'supplier_priority_scores'"
+    )).scalar() > version
+
+    # Le trigger de version suit la nouvelle table
+    db.execute(text("UPDATE supplier_priority_scores SET score = score"))
+    db.commit()
+    assert db.execute(text(
+        "SELECT version FROM table_write_versions WHERE table_name = 'supplier_priority_scores'"
+    )).scalar() > version + 1
@@ -0,0 +1,59 @@
+"""Planification des relances (schedule_reminders)"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from src import reminders
+from src.reminders import SCHEDULER_LOCK, TASK_TYPE, schedule_reminders
+
+LOCK = "SELECT pg_try_advisory_lock(hashtext(:name))"
+UNLOCK = "SELECT pg_advisory_unlock(hashtext(:name))"
+
+
+@pytest.fixture
+def new_tasks(engine):
+    """Supprime les relances créées par le test"""
+    with engine.connect() as conn:
+        last_id = conn.execute(text("SELECT COALESCE(max(id), 0) FROM tasks")).scalar()
+    yield
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM tasks WHERE id > :last_id AND type = :type"),
+                     {"last_id": last_id, "type": TASK_TYPE})
+
+
+def _lock_is_free(engine) -> bool:
+    with engine.connect() as conn:
+        acquired = conn.execute(text(LOCK), {"name": SCHEDULER_LOCK}).scalar()
+        if acquired:
+            conn.execute(text(UNLOCK), {"name": SCHEDULER_LOCK})
+        return acquired
+
+
+def test_schedule_in_several_batches_is_idempotent(engine, db, new_tasks, monkeypatch):
+    monkeypatch.setattr(reminders, "SCHEDULE_BATCH_SIZE", 2)
+
+    first = schedule_reminders(db)
+
+    assert first > 0
+    assert schedule_reminders(db) == 0
+    assert _lock_is_free(engine)
+
+
+def test_schedule_stops_while_another_scheduler_holds_the_lock(engine, db, new_tasks):
+    with engine.connect() as conn:
+        assert conn.execute(text(LOCK), {"name": SCHEDULER_LOCK}).scalar()
+        try:
+            assert schedule_reminders(db) == 0
+        finally:
+            conn.execute(text(UNLOCK), {"name": SCHEDULER_LOCK})
+
+
+def test_schedule_error_is_raised_and_releases_the_lock(engine, db, monkeypatch):
+    monkeypatch.setattr(reminders, "_SCHEDULE", "SELECT * FROM missing_reminder_source")
+
+    with pytest.raises(ProgrammingError, match="missing_reminder_source"):
+        schedule_reminders(db)
+
+    assert _lock_is_free(engine)
+    assert db.execute(text("SELECT 1")).scalar() == 1
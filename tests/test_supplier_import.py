@@ -0,0 +1,66 @@
+"""Import massif de fournisseurs (POST /suppliers/import)"""
+
+import json
+
+import pytest
+from sqlalchemy import text
+
+PREFIX = "pytest-import-"
+
+
+@pytest.fixture
+def cleanup(engine):
+    yield
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM suppliers WHERE external_id LIKE :prefix"), {"prefix": PREFIX + "%"})
+
+
+def _warm_pool(engine, size: int) -> None:
+    """Ouvre plusieurs connexions en même temps pour que le pool en garde plusieurs au repos"""
+    connections = [engine.connect() for _ in range(size)]
+    for conn in connections:
+        conn.close()
+
+
+def test_import_several_batches_through_pool(client, engine, cleanup):
+    _warm_pool(engine, 4)
+    records = [
+        {
+            "external_id": f"{PREFIX}{i}",
+            "name": f"Pytest Import {i}",
+            "country_code": "FR",
+            "contact_full_name": f"Contact {i}",
+        }
+        for i in range(7)
+    ]
+    body = "\n".join(json.dumps(record) for record in records)
+
+    response = client.post("/suppliers/import?format=ndjson&batch_size=2", content=body)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["errors"] == []
+    assert result["failed"] == 0
+    assert result["inserted"] == 7
+
+    with engine.connect() as conn:
+        contacts = conn.execute(text("""
+            SELECT count(*) FROM supplier_contacts c JOIN suppliers s ON s.id = c.supplier_id
+            WHERE s.external_id LIKE :prefix
+        """), {"prefix": PREFIX + "%"}).scalar()
+    assert contacts == 7
+
+
+def test_import_reports_failing_row_and_keeps_batch(client, cleanup):
+    records = [
+        {"external_id": f"{PREFIX}ok-{i}", "name": f"Pytest Import OK {i}"} for i in range(3)
+    ]
+    records.insert(1, {"external_id": f"{PREFIX}bad", "name": "Pytest Import KO", "country_code": "FRANCE"})
+    body = "\n".join(json.dumps(record) for record in records)
+
+    response = client.post("/suppliers/import?format=ndjson&batch_size=4", content=body)
+
+    result = response.json()
+    assert result["inserted"] == 3
+    assert result["failed"] == 1
+    assert result["errors"][0]["external_id"] == f"{PREFIX}bad"
@@ -0,0 +1,161 @@
+"""GET /suppliers : recherche, pagination par clé, statistiques"""
+
+import json
+
+import pytest
+from sqlalchemy import text
+
+PREFIX = "pytest-sup-"
+
+NAMES = [
+    "Pytest Schaeffler Technologies", "Pytest Brembo", "Pytest Brembo", "Pytest Brembo",
+    "Pytest Continental", "Pytest Mahle", "Pytest Brembo", "Pytest Autoliv",
+]
+
+
+@pytest.fixture
+def suppliers(engine):
+    with engine.begin() as conn:
+        ids = conn.execute(text("""
+            INSERT INTO suppliers (external_id, name, supply_chain_level, region)
+            SELECT :prefix || n, (CAST(:names AS TEXT[]))[n], 'tier1', 'Europe'
+            FROM generate_series(1, :count) AS n
+            RETURNING id
+        """), {"prefix": PREFIX, "names": NAMES, "count": len(NAMES)}).scalars().all()
+    yield sorted(ids)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM suppliers WHERE external_id LIKE :prefix"), {"prefix": PREFIX + "%"})
+
+
+@pytest.fixture
+def trigram_search(engine):
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is None:
+            pytest.skip("Extension pg_trgm absente (migration 009)")
+
+
+def test_cursor_pages_split_equal_names_by_id(client, suppliers):
+    pages, items, cursor = 0, [], None
+    while True:
+        params = {"search": PREFIX, "paginate": "cursor", "limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/suppliers", params=params).json()
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    keys = [(item["name"], item["id"]) for item in items]
+    assert keys == sorted(keys)
+    assert sorted(item["id"] for item in items) == suppliers
+    assert pages == 3
+
+
+def test_offset_and_cursor_pages_agree(client, suppliers):
+    offset = client.get("/suppliers", params={"search": PREFIX, "skip": 3, "limit": 3}).json()
+    first = client.get("/suppliers", params={"search": PREFIX, "paginate": "cursor", "limit": 3}).json()
+    second = client.get("/suppliers", params={
+        "search": PREFIX, "paginate": "cursor", "limit": 3, "cursor": first["next_cursor"]
+    }).json()
+
+    assert [item["id"] for item in offset] == [item["id"] for item in second["items"]]
+
+
+def test_fuzzy_search_tolerates_typos(client, suppliers, trigram_search):
+    response = client.get("/suppliers", params={"search": "schaefler", "search_mode": "fuzzy"})
+
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == "Pytest Schaeffler Technologies"
+
+
+def test_fuzzy_search_rejects_cursor_pagination(client):
+    response = client.get("/suppliers", params={"search": "brembo", "search_mode": "fuzzy", "paginate": "cursor"})
+
+    assert response.status_code == 400
+
+
+def test_stats_use_two_grouped_queries(client, suppliers, query_counter):
+    response = client.get("/suppliers/stats")
+
+    assert response.status_code == 200
+    assert response.json()["by_level"]["tier1"] >= len(NAMES)
+    queries = [s for s in query_counter.statements if "table_write_versions" not in s]
+    assert len(queries) == 2
+    assert all("GROUP BY" in s for s in queries)
+
+
+def test_bulk_update_rejects_null_name(client, suppliers):
+    response = client.patch("/suppliers", json={"items": [{"id": suppliers[0], "changes": {"name": None}}]})
+
+    assert response.status_code == 422
+
+
+def test_bulk_update_clears_optional_fields(client, suppliers):
+    changes = {"region": None, "name": "Pytest Renamed"}
+    response = client.patch("/suppliers", json={
+        "items": [{"id": supplier_id, "changes": changes} for supplier_id in suppliers[:2]]
+    })
+
+    assert response.status_code == 200
+    updated = client.get("/suppliers", params={"search": PREFIX, "limit": 500}).json()
+    renamed = {item["id"]: item for item in updated if item["id"] in suppliers[:2]}
+    assert all(item["name"] == "Pytest Renamed" and item["region"] is None for item in renamed.values())
+
+
+@pytest.mark.parametrize("changes", [{"regulatory_risk": "high"}, {"climate_risk": "low"}, {"climate_risk": 120}])
+def test_bulk_update_rejects_invalid_risk(client, suppliers, changes):
+    items = client.patch("/suppliers", json={"items": [{"id": suppliers[0], "changes": changes}]})
+    filtered = client.patch("/suppliers", json={"filter": {"ids": suppliers[:2]}, "changes": changes})
+
+    assert items.status_code == filtered.status_code == 422
+
+
+def test_bulk_update_writes_numeric_risks(client, engine, suppliers):
+    response = client.patch("/suppliers", json={
+        "filter": {"ids": suppliers[:2]}, "changes": {"regulatory_risk": 42.5, "climate_risk": 10}
+    })
+
+    assert response.status_code == 200
+    with engine.connect() as conn:
+        risks = conn.execute(text("""
+            SELECT DISTINCT regulatory_risk, climate_risk FROM supplier_hub_metadata
+            WHERE supplier_id = ANY(:ids)
+        """), {"ids": suppliers[:2]}).all()
+    assert [(float(regulatory), float(climate)) for regulatory, climate in risks] == [(42.5, 10.0)]
+
+
+@pytest.fixture
+def risk_view(engine, suppliers):
+    """Risques numériques sur les fournisseurs de test, vue v_supplier_full rafraîchie"""
+    from src.supplier_view import refresh_supplier_view
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO supplier_hub_metadata (supplier_id, regulatory_risk, climate_risk)
+            SELECT id, 10 * n, 100 - 10 * n
+            FROM unnest(CAST(:ids AS INTEGER[])) WITH ORDINALITY AS s(id, n)
+        """), {"ids": suppliers})
+    refresh_supplier_view(force=True)
+    yield suppliers
+    refresh_supplier_view(force=True)
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({"regulatory_risk_min": 10, "regulatory_risk_max": 30}, [0, 1, 2]),
+    ({"regulatory_risk_min": 75.5}, [7]),
+    ({"climate_risk_max": 20, "regulatory_risk_min": 80}, [7]),
+])
+def test_list_and_export_filter_risks_numerically(client, risk_view, params, expected):
+    ids = [risk_view[i] for i in expected]
+
+    listed = client.get("/suppliers", params={"search": PREFIX, "limit": 500, **params}).json()
+    export = client.get("/suppliers/export", params=params)
+
+    assert sorted(item["id"] for item in listed) == ids
+    exported = [json.loads(line)["id"] for line in export.text.splitlines()]
+    assert sorted(i for i in exported if i in risk_view) == ids
+
+
+def test_risk_filters_reject_labels(client):
+    assert client.get("/suppliers", params={"regulatory_risk_min": "high"}).status_code == 422
+    assert client.get("/suppliers/export", params={"climate_risk_max": 120}).status_code == 422
@@ -0,0 +1,76 @@
+"""Index typeahead en mémoire (recherche par préfixe)"""
+
+from sqlalchemy import func, select
+
+from src.db_models import Campaign, Supplier
+from src.typeahead import TypeaheadEntry, TypeaheadIndex, normalize, tokenize
+
+
+def _supplier(entity_id: int, name: str) -> TypeaheadEntry:
+    return TypeaheadEntry("supplier", entity_id, name, None, tuple(tokenize(name)), normalize(name))
+
+
+def _campaign(entity_id: int, name: str) -> TypeaheadEntry:
+    return TypeaheadEntry("campaign", entity_id, name, "active", tuple(tokenize(name)), normalize(name))
+
+
+def _index(*entries: TypeaheadEntry) -> TypeaheadIndex:
+    index = TypeaheadIndex(refresh_seconds=60, max_entries=100000)
+    for kind in TypeaheadIndex.SOURCES:
+        kind_entries = [entry for entry in entries if entry.kind == kind]
+        index._apply(kind, kind_entries, {entry.id for entry in kind_entries})
+    return index
+
+
+def test_kind_filter_applies_before_candidate_bound():
+    suppliers = [_supplier(i, f"Camshaft Works {i:04d}") for i in range(2000)]
+    index = _index(*suppliers, _campaign(1, "Carbon PCF 2026"))
+
+    items = index.search("ca", kinds=["campaign"])
+
+    assert [(item["type"], item["id"]) for item in items] == [("campaign", 1)]
+
+
+def test_best_ranked_entries_are_not_cut_by_scan_order():
+    # Tokens 'caa…' trient avant 'cab' : les entrées les mieux classées
+    # arrivent en fin de plage de tokens
+    noise = [_supplier(i, f"Caa{i:04d} Industrial Components Group") for i in range(2000)]
+    index = _index(*noise, _supplier(5000, "Cab"), _supplier(5001, "Cabot"))
+
+    items = index.search("ca", limit=2)
+
+    assert [item["label"] for item in items] == ["Cab", "Cabot"]
+
+
+def test_label_prefix_ranks_first_then_shortest_label():
+    index = _index(
+        _supplier(1, "Acme Carbon Steel"),
+        _supplier(2, "Carbon Parts International"),
+        _supplier(3, "Carbon AG"),
+    )
+
+    items = index.search("carbon")
+
+    assert [item["id"] for item in items] == [3, 2, 1]
+
+
+def test_renamed_and_deleted_entries_leave_the_index():
+    index = _index(_supplier(1, "Bosch Rexroth"), _supplier(2, "Brembo"))
+
+    index._apply("supplier", [_supplier(1, "Rexroth")], {1})
+
+    assert index.search("bo") == []
+    assert [item["label"] for item in index.search("rex")] == ["Rexroth"]
+
+
+def test_full_index_does_not_skip_unindexed_rows(engine, db):
+    total = db.execute(select(func.count(Supplier.id))).scalar() + db.execute(select(func.count(Campaign.id))).scalar()
+    index = TypeaheadIndex(refresh_seconds=60, max_entries=total - 1)
+
+    index.refresh()
+    assert index.stats()["entries"] == total - 1
+
+    # Place libérée : le cycle suivant indexe la ligne restante, même sans écriture
+    index.max_entries = total
+    index.refresh()
+    assert index.stats()["entries"] == total